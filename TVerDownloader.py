@@ -1,19 +1,30 @@
 import sys, os
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--ytdlp-worker"]:
+    # 상주 yt-dlp 작업자로 띄워진 경우(src/ytdlp_worker.py). Qt를 읽기 전에 갈라진다.
+    # 아래 import를 모두 거치면 작업자 하나 세우는 데 창 하나 띄우는 만큼 든다.
+    from src.ytdlp_worker import main as ytdlp_worker_main
+    sys.exit(ytdlp_worker_main())
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--headless"]:
+    # 창 없이 돌리는 경우(src/headless.py). 위젯·글꼴·테마를 하나도 만들지 않는다.
+    from src.headless import main as headless_main
+    sys.exit(headless_main(sys.argv[2:]))
+
 from html import escape
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QMessageBox, QSystemTrayIcon, QFileDialog, QWidget,
-                             QAbstractSpinBox, QLineEdit, QMenu, QTextEdit, QComboBox)
+                             QAbstractSpinBox, QLineEdit, QMenu, QTextEdit, QComboBox, QDialog)
 from PyQt6.QtCore import Qt, QEvent, QObject, QTimer, QLocale, QTranslator, QLibraryInfo
 from PyQt6.QtGui import QCursor, QGuiApplication, QFontDatabase, QFont, QKeySequence, QShortcut
 from PyQt6.QtNetwork import QLocalServer, QLocalSocket
 
 from src import autostart, self_update, shortcuts
 from src.utils import (load_config, save_config, handle_exception,
-                       retired_option_notes,
-                       localized_app_name, get_resource_path,
-                       canonicalize_config_fragments)
+                       retired_option_notes, SOCKET_NAME,
+                       localized_app_name, get_resource_path)
 from src.qss import build_qss, palette, UI_FONT_FALLBACKS
 from src.icons import is_monochrome_white, tint_icon
 from src.message import confirm
@@ -30,15 +41,16 @@ from src.updater import maybe_show_update
 from src.threads.setup_thread import SetupThread
 from src.ui.main_window_ui import MainWindowUI
 from src.series_parser import SeriesParser
+from src.favorites_poller import FavoritesPoller
 from src.download_manager import DownloadManager
+from src.control_server import ControlServer
+from src.task_queue import PRIORITY_USER
 from src.controllers.download_list import DownloadListController
 from src.controllers.library import LibraryController
 from src.tray_controller import TrayController
 from src.input_sources import InputSources
 from versioninfo import APP_VERSION
 
-SOCKET_NAME = "TVerDownloader_IPC_Socket"
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -51,7 +63,12 @@ class MainWindow(QMainWindow):
         self.queue_store = QueueStore(); self._queue_file_ok = self.queue_store.load()
         self.ui = MainWindowUI(self); self.ui.setup_ui(); self.tray_icon = QSystemTrayIcon(self); self.ui.setup_tray(APP_VERSION)
         self.series_parser = SeriesParser(ytdlp_path="", config=self.config)
+        self.fav_poller = FavoritesPoller(self.fav_store, self.series_parser, self)
+        self._series_dialogs: Dict[Tuple[str, str], Optional[SeriesSelectionDialog]] = {}
+        self._series_dialog_queue: List[Tuple[str, str]] = []; self._series_dialog_shown: Optional[Tuple[str, str]] = None
+        self._series_dialog_labels: Dict[Tuple[str, str], str] = {}
         self.download_manager = DownloadManager(self.config, self.history_store, self.queue_store)
+        self.control_server = ControlServer(self.download_manager, self.history_store, self)
         self.download_list = DownloadListController(self)
         self.library = LibraryController(self)
         self.tray = TrayController(self)
@@ -68,6 +85,8 @@ class MainWindow(QMainWindow):
         self.append_log("프로그램 시작. 환경 설정을 시작합니다...")
         for note in retired_option_notes(self.config):
             self.append_log(note)
+        self._apply_control_api()
+        self._apply_fav_polling()
         self.setup_thread = SetupThread(self); self.setup_thread.log.connect(self.append_log)
         self.setup_thread.finished.connect(self._on_setup_finished); self.setup_thread.start()
 
@@ -86,13 +105,37 @@ class MainWindow(QMainWindow):
             self.series_parser.update_config(self.config)
             self.input_sources.apply_clipboard_watch(self.config.get("clipboard_watch", False))
             self.apply_shortcuts()
+            self._apply_control_api()
+            self._apply_fav_polling()
             parallel = self.config["max_concurrent_downloads"]
-            fragments = canonicalize_config_fragments(self.config)
-            self.append_log(f"설정이 저장되었습니다. 동시 다운로드 개수 {parallel}개"
-                            f" / 조각 수 {fragments}개")
+            self.append_log(f"설정이 저장되었습니다. 동시 다운로드 개수 {parallel}개")
             self.library.refresh_history_list()
             self.library.refresh_fav_list()
 
+    def _apply_fav_polling(self):
+        """설정의 간격으로 즐겨찾기 정기 확인(fav_poller)을 켜고 끈다.
+
+        켜 두면 켤 때 확인도 전부를 한꺼번에 넣지 않고 정기 확인의 첫 차례로
+        돈다. 그 자리에서 수백 개를 밀어 넣으면 정기 확인으로 나눠 돌리는 의미가 없다.
+        """
+        self.fav_poller.set_ready_check(
+            lambda: self.env_ready and os.path.isdir(self.config.get("download_folder") or ""))
+        self.fav_poller.set_interval_hours(self.config.get("favorites_poll_hours", 0))
+
+    def _apply_control_api(self):
+        """설정의 포트로 로컬 HTTP 창구(control_server)를 켜고 끈다.
+
+        포트가 바뀌었을 때만 로그를 남긴다. 설정을 저장할 때마다 부르는데,
+        그때마다 '켰습니다'가 찍히면 읽을 것만 늘어난다.
+        """
+        port = int(self.config.get("control_api_port", 0) or 0)
+        was = self.control_server.is_listening()
+        if not self.control_server.listen(port):
+            self.append_log(f"[오류] 제어 API를 {port}번 포트에서 열지 못했습니다: "
+                            f"{self.control_server.error_text()}")
+        elif port and not was:
+            self.append_log(f"[알림] 제어 API를 http://127.0.0.1:{port} 에서 엽니다.")
+
     def apply_theme(self, theme: str, persist: bool = True):
         """QSS와 아이콘 색을 한 번에 새 테마로 맞춘다."""
         self.config["theme"] = theme
@@ -104,7 +147,7 @@ class MainWindow(QMainWindow):
         if tinter is not None:
             tinter.set_color(palette(theme)["text"])
         self.ui.apply_theme(theme)
-        for list_widget in (self.ui.download_list, self.ui.history_list, self.ui.fav_list):
+        for list_widget in (self.ui.download_list, self.ui.fav_list):
             for i in range(list_widget.count()):
                 widget = list_widget.itemWidget(list_widget.item(i))
                 if hasattr(widget, "apply_theme"):
@@ -228,7 +271,8 @@ class MainWindow(QMainWindow):
         self.ui.cancel_selected_button.clicked.connect(self.download_list.cancel_selected)
         self.ui.download_list.itemSelectionChanged.connect(self.download_list.sync_cancel_button)
         self.ui.download_list.customContextMenuRequested.connect(self.download_list.show_context_menu)
-        for list_widget in (self.ui.download_list, self.ui.history_list, self.ui.fav_list):
+        self.ui.download_list.model().rowsMoved.connect(self.download_list.on_rows_moved)
+        for list_widget in (self.ui.download_list, self.ui.fav_list):
             list_widget.itemSelectionChanged.connect(
                 lambda lw=list_widget: self.download_list.sync_selection_styles(lw))
         self.ui.history_list.customContextMenuRequested.connect(self.library.show_history_menu)
@@ -237,14 +281,18 @@ class MainWindow(QMainWindow):
         self.ui.history_sort_combo.currentIndexChanged.connect(self.library.refresh_history_list)
         self.ui.fav_add_btn.clicked.connect(self.library.add_favorite); self.ui.fav_del_btn.clicked.connect(self.library.remove_selected_favorite)
         self.ui.fav_chk_btn.clicked.connect(self.library.check_all_favorites); self.ui.fav_list.customContextMenuRequested.connect(self.library.show_fav_menu)
+        self.fav_poller.due.connect(self.library.poll_favorites)
         self.download_manager.log.connect(self.append_log); self.download_manager.item_added.connect(self.download_list.add_item_widget)
         self.download_manager.heading.connect(self.append_heading)
         self.download_manager.progress_updated.connect(self.download_list.update_item_widget); self.download_manager.task_finished.connect(self._on_task_finished)
         self.download_manager.queue_changed.connect(self.tray.on_queue_changed)
         self.download_manager.queue_changed.connect(lambda *_: self._sync_queue_start_button())
+        self.download_manager.progress_batch.connect(self.download_list.update_item_widgets)
         self.download_manager.progress_updated.connect(lambda *_: self.tray.refresh_status())
+        self.download_manager.progress_batch.connect(lambda *_: self.tray.refresh_status())
         self.download_manager.all_tasks_completed.connect(self.tray.notify_all_finished)
         self.series_parser.log.connect(lambda ctx, msg: self.append_log(msg)); self.series_parser.finished.connect(self._on_series_parsed)
+        self.series_parser.progress.connect(self._on_series_progress)
         self.tray_icon.activated.connect(self.tray.on_activated)
 
     def set_always_on_top(self, on: bool, init: bool = False):
@@ -346,7 +394,8 @@ class MainWindow(QMainWindow):
         if new_folder: self.config["download_folder"] = new_folder; save_config(self.config); self.download_manager.update_config(self.config); self.append_log(f"다운로드 폴더가 '{new_folder}'(으)로 설정되었습니다."); return True
         return False
 
-    def _request_add_task(self, url: str, title: str = "", thumbnail: str = "") -> bool:
+    def _request_add_task(self, url: str, title: str = "", thumbnail: str = "",
+                          priority: int = PRIORITY_USER) -> bool:
         """대기열에 넣기 전에 이미 받은 것인지 물어본다.
 
         제목·표지 그림을 아는 자리(시리즈 선택, 즐겨찾기 확인)는 함께 넘긴다.
@@ -358,7 +407,7 @@ class MainWindow(QMainWindow):
                             f"이미 다운로드한 항목입니다:\n\n{self.history_store.get_title(url)}\n\n다시 다운로드할까요?",
                             icon_name="download", theme=self.config.get("theme", "light"))
             if not again: self.append_log(f"[알림] 중복 다운로드 취소: {url}"); return False
-        return self.download_manager.add_task(url, title=title, thumbnail=thumbnail)
+        return self.download_manager.add_task(url, title=title, thumbnail=thumbnail, priority=priority)
 
     def _on_setup_finished(self, ok: bool, ytdlp_path: str, ffmpeg_path: str):
         if not ok: self.append_log("[오류] 초기 준비 실패: yt-dlp/ffmpeg를 준비하지 못했습니다."); QMessageBox.critical(self, "오류", "초기 준비에 실패했습니다. 로그를 확인하세요."); return
@@ -371,7 +420,10 @@ class MainWindow(QMainWindow):
         if self.config.get("auto_update_check", True):
             QTimer.singleShot(1000, self._check_for_update)
         if self.config.get("auto_check_favorites_on_start", True):
-            QTimer.singleShot(2500, self.library.check_all_favorites)
+            if self.fav_poller.is_active():
+                QTimer.singleShot(2500, self.fav_poller.start_now)
+            else:
+                QTimer.singleShot(2500, self.library.check_all_favorites)
 
     def _restore_queue(self):
         """지난 실행에서 끝내지 못한 대기열을 목록에 되살린다.
@@ -385,13 +437,9 @@ class MainWindow(QMainWindow):
         """
         if not self._queue_file_ok:
             self.append_log("[알림] 대기열 파일이 손상되어 읽지 못했습니다. 빈 대기열로 시작합니다.")
-        entries = self.queue_store.entries()
-        if not entries:
-            return
-        restored = sum(1 for entry in entries
-                       if self.download_manager.restore_task(entry.get("url", ""),
-                                                             title=entry.get("title", ""),
-                                                             thumbnail=entry.get("thumbnail", "")))
+        restored, swept = self.download_manager.restore_saved_queue()
+        if swept:
+            self.append_log(f"[대기열] 더 이어받을 일이 없는 받다 만 파일 {swept}개를 정리했습니다.")
         if restored:
             self.append_log(f"[대기열] 지난 실행에서 남은 {restored}개를 되살렸습니다. "
                             "'대기열 시작'을 누르면 받기 시작합니다.")
@@ -423,21 +471,36 @@ class MainWindow(QMainWindow):
         maybe_show_update(self, APP_VERSION, self.append_log,
                           pending_downloads=self.download_manager.pending_count())
 
-    def _add_from_selection(self, episode_info: List[Dict[str, str]], label: str):
-        """에피소드 선택 창을 띄우고, 고른 것만 대기열에 넣는다.
+    def _add_from_selection(self, series_url: str, series_title: str,
+                            episode_info: List[Dict[str, str]], label: str):
+        """에피소드 선택 창을 차례에 세우고, 닫히면 고른 것만 대기열에 넣는다.
 
         분석이 제목과 표지 그림을 이미 들고 왔으므로 주소와 함께 넘긴다. 대기
         카드가 그 자리에서 채워지고, 미리 물어보러 갈 일도 그만큼 줄어든다.
+
+        사용자가 넣은 시리즈의 창과 같은 차례(_queue_series_dialog)에 선다.
+        exec()로 띄우면 다른 창이 떠 있는 동안 그 위에 겹치고, 닫힐 때까지 이
+        자리에 머문 채 다음 즐겨찾기 확인 결과를 중첩된 이벤트 루프에서 받는다.
+        같은 시리즈의 창이 아직 차례를 기다리고 있으면 새로 만들지 않고 거기에 붙인다.
         """
-        dialog = SeriesSelectionDialog(episode_info, self)
-        if not dialog.exec():
+        key = ("fav", series_url)
+        dialog = self._series_dialogs.get(key)
+        if dialog is not None:
+            dialog.add_episodes(episode_info)
+            return
+        self._series_dialog_labels[key] = label
+        self._queue_series_dialog(key, series_title, episode_info, loading=False)
+
+    def _add_selected(self, dialog: SeriesSelectionDialog, accepted: bool, label: str):
+        """닫힌 선택 창에서 고른 회차를 대기열에 넣는다."""
+        if not accepted:
             self.append_log(f"{label} 에피소드 추가를 취소했습니다.")
             return
         selected_urls = dialog.get_selected_urls()
         if not selected_urls:
             self.append_log(f"{label} 선택된 에피소드가 없어 추가하지 않았습니다.")
             return
-        known = {ep.get("url"): ep for ep in episode_info if ep.get("url")}
+        known = dialog.episodes()
         added_count = 0
         for url in selected_urls:
             episode = known.get(url) or {}
@@ -446,15 +509,88 @@ class MainWindow(QMainWindow):
                 added_count += 1
         self.append_log(f"{label} 선택한 {added_count}개 에피소드를 추가했습니다.")
 
+    def _on_series_progress(self, context: str, series_url: str, series_title: str,
+                            episode_info: List[Dict[str, str]]):
+        """분석 도중 찾은 회차로 선택 창을 먼저 띄우고, 이어 오는 것을 채운다.
+
+        사용자가 넣은 시리즈(single·bulk)만 그렇게 한다. 즐겨찾기 확인은 기록과
+        대조한 뒤에야 창을 띄울지 정할 수 있어 끝까지 기다린다.
+
+        창은 exec()가 아니라 open()으로 띄운다. exec()는 닫힐 때까지 이 자리에
+        머물러, 그동안 오는 회차와 finished가 중첩된 이벤트 루프 안에서 이 함수를
+        다시 부른다. 키에 None이 남아 있으면 창을 이미 닫은 것이라 나머지는 버린다.
+        """
+        if context not in ('single', 'bulk'):
+            return
+        key = (context, series_url)
+        if key in self._series_dialogs:
+            dialog = self._series_dialogs[key]
+            if dialog is not None:
+                dialog.add_episodes(episode_info)
+            return
+        self._queue_series_dialog(key, series_title, episode_info, loading=True)
+
+    def _queue_series_dialog(self, key: Tuple[str, str], series_title: str,
+                             episode_info: List[Dict[str, str]], loading: bool):
+        """시리즈 하나의 선택 창을 만들어 차례에 세운다. 한 번에 하나만 띄운다.
+
+        창은 만들자마자 회차를 받아 채우지만, 띄우는 것은 앞의 창이 닫힌 뒤다.
+        open()은 기다리지 않으므로 여러 시리즈를 한꺼번에 붙여 넣으면 창 N개가
+        한꺼번에 겹쳐 떴다. 예전에 exec()로 하나씩 띄우던 차례를 그대로 지킨다.
+        """
+        dialog = SeriesSelectionDialog(episode_info, self, loading=loading)
+        if series_title:
+            dialog.setWindowTitle(f"시리즈 에피소드 선택 — {series_title}")
+        self._series_dialogs[key] = dialog
+        dialog.finished.connect(
+            lambda result, k=key, d=dialog: self._on_streamed_selection_closed(k, d, result))
+        self._series_dialog_queue.append(key)
+        self._show_next_series_dialog()
+
+    def _show_next_series_dialog(self):
+        """떠 있는 선택 창이 없으면 차례를 기다리는 다음 창을 띄운다."""
+        if self._series_dialog_shown is not None:
+            return
+        while self._series_dialog_queue:
+            key = self._series_dialog_queue.pop(0)
+            dialog = self._series_dialogs.get(key)
+            if dialog is None:
+                continue
+            self._series_dialog_shown = key
+            dialog.open()
+            return
+
+    def _on_streamed_selection_closed(self, key: Tuple[str, str], dialog: SeriesSelectionDialog,
+                                      result: int):
+        if dialog.loading:
+            self._series_dialogs[key] = None
+        else:
+            self._series_dialogs.pop(key, None)
+        if self._series_dialog_shown == key:
+            self._series_dialog_shown = None
+        label = self._series_dialog_labels.pop(key, None) or f"[{key[0]}] 시리즈에서"
+        self._add_selected(dialog, result == QDialog.DialogCode.Accepted, label)
+        dialog.deleteLater()
+        self._show_next_series_dialog()
+
     def _on_series_parsed(self, context: str, series_url: str, series_title: str, episode_info: List[Dict[str, str]]):
         """분석이 끝난 시리즈를 요청 맥락에 맞게 처리한다.
 
         맥락을 갈라 보내기만 한다. 즐겨찾기 쪽 두 갈래는 목록을 다시 그리고
-        기록과 대조하는 일이라 library가 맡는다.
+        기록과 대조하는 일이라 library가 맡는다. 도중에 선택 창을 이미 띄웠으면
+        (_on_series_progress) 새로 띄우지 않고 그 창을 마무리한다.
         """
+        key = (context, series_url)
+        if key in self._series_dialogs:
+            dialog = self._series_dialogs[key]
+            if dialog is None:
+                self._series_dialogs.pop(key)
+            else:
+                dialog.finish_loading(episode_info)
+            return
         if context in ('single', 'bulk'):
             if not episode_info: self.append_log(f"[{context}] '{series_url}' 시리즈에서 에피소드를 찾지 못했습니다."); return
-            self._add_from_selection(episode_info, f"[{context}] 시리즈에서")
+            self._queue_series_dialog(key, series_title, episode_info, loading=False)
 
         elif context == 'fav-check':
             self.library.on_fav_check_parsed(series_url, series_title, episode_info)
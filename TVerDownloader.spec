@@ -36,7 +36,8 @@ a = Analysis(
         ("assets/fonts/JetBrainsMono-Regular.ttf", "assets/fonts"),
         ("assets/logo", "assets/logo"),
     ] + TRANSLATION_DATAS,
-    hiddenimports=[],
+    # 상주 작업자(src/ytdlp_worker.py)가 함수 안에서 읽어 들여 분석에 잡히지 않는다.
+    hiddenimports=["yt_dlp"],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,155 @@
+"""TVer에 한꺼번에 거는 연결 수를 앱 전체에서 나눠 쓰는 곳.
+
+예전에는 다운로드마다 설정의 조각 수(-N)를 그대로 붙이고, 상한
+(MAX_TOTAL_CONNECTIONS)은 설정 창에서 '동시 다운로드 수 × 조각 수'로만
+막았다. 그러면 **하나만 받을 때도 4개 연결로 묶여** 회선이 남고, 미리 묻기와
+시리즈 분석은 그 셈에 아예 들어가지 않았다.
+
+여기서는 상한 20개를 한 주머니로 두고 모두가 거기서 꺼내 쓴다.
+
+- 다운로드는 시작할 때 몫을 정해 받는다. 혼자면 주머니를 거의 다, 여럿이
+  함께 시작하면 나눠서. yt-dlp는 받는 도중에 -N을 바꿀 수 없어서, 몫을 다시
+  나누는 것은 **새로 시작하는 다운로드부터**다. 먼저 시작한 것이 끝나 돌려준
+  자리는 그다음에 시작하는 것이 가져간다.
+- 정보 조회(미리 묻기·시리즈 분석·즐겨찾기 확인)는 한 번에 하나씩 꺼내고
+  끝나면 돌려준다. 자리가 없으면 날 때까지 기다린다.
+
+**아직 시작하지 않은 다운로드 자리마다 한 칸씩 남겨 둔다.** 먼저 시작한 것이
+주머니를 다 가져가면 뒤에 넣은 주소는 앞의 것이 끝날 때까지 한 칸도 못 받는다.
+동시 다운로드를 5개로 둔 사람에게 그것은 한 개씩 받는 것과 같다. 그래서 혼자
+받을 때의 몫은 20이 아니라 '20 − 남겨 둔 칸'이다.
+
+**조회 몫도 조금 남겨 둔다**(QUERY_RESERVE). 다운로드가 주머니를 채운 동안
+시리즈 주소를 넣으면, 다운로드 하나가 끝날 때까지 분석이 시작도 못 한다.
+
+부르는 쪽은 UI 스레드(다운로드 몫)와 작업 스레드(조회)가 섞여 있어 자물쇠로 묶는다.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from src.utils import MAX_TOTAL_CONNECTIONS, DEFAULT_PARALLEL
+
+QUERY_RESERVE = 2
+"""다운로드 몫을 정할 때 조회용으로 비워 두는 칸 수.
+
+사용자가 넣은 시리즈 분석 하나와 미리 묻기 하나가 겹치는 정도다. 동시
+다운로드 수가 커서 이만큼 비울 수 없으면(20개 동시) 비우지 않는다 — 그
+사람은 주머니를 다운로드에 다 쓰겠다고 고른 것이다."""
+
+WAIT_INTERVAL = 0.2
+"""조회가 자리를 기다리며 그만두라는 요청을 살피는 간격(초)."""
+
+
+class ConnectionBudget:
+    """연결 주머니 하나. 다운로드 몫과 조회 자리를 함께 센다."""
+
+    def __init__(self, total: int = MAX_TOTAL_CONNECTIONS):
+        self.total = max(1, int(total))
+        self._cond = threading.Condition()
+        self._downloads: Dict[str, int] = {}
+        self._queries = 0
+        self._slots = DEFAULT_PARALLEL
+
+    def set_download_slots(self, slots: int):
+        """동시 다운로드 수(설정값). 시작하지 않은 자리마다 한 칸을 남기는 기준이다."""
+        with self._cond:
+            self._slots = max(1, min(self.total, int(slots)))
+            self._cond.notify_all()
+
+    def _used(self) -> int:
+        return sum(self._downloads.values()) + self._queries
+
+    def _unstarted_seats(self) -> int:
+        return max(0, self._slots - len(self._downloads))
+
+    def _query_reserve(self) -> int:
+        return min(QUERY_RESERVE, max(0, self.total - self._slots))
+
+    def grant_download(self, key: str, expected: int) -> int:
+        """다운로드 하나를 시작하며 몫을 정해 준다. 1 이상을 돌려준다.
+
+        expected는 이번에 함께 돌게 될 다운로드 수(이미 도는 것 포함)다. 대기열에
+        다섯이 서 있는데 몫을 '지금 도는 것'으로만 나누면, 같은 순간에 시작하는
+        첫 번째가 주머니를 다 가져가고 나머지 넷은 한 칸씩 받는다.
+
+        이번 묶음에 들지 않는 나머지 자리(설정값 − expected)는 한 칸씩만 떼어
+        두고 나눈다. 그 자리는 나중에 넣은 주소가 시작할 때 쓸 것이다.
+
+        **적어도 한 칸은 늘 있다.** 조회가 시작하지 않은 다운로드 자리를 건드리지
+        못하게 막아 두었기 때문이다(acquire_query). 그래서 여기서 1을 주어도
+        주머니를 넘지 않는다.
+        """
+        with self._cond:
+            self._downloads.pop(key, None)
+            later = max(0, self._slots - max(expected, len(self._downloads) + 1))
+            fair = (self.total - self._query_reserve() - later) // max(1, expected)
+            room = (self.total - self._used()
+                    - max(0, self._unstarted_seats() - 1) - self._query_reserve())
+            grant = max(1, min(fair, room))
+            self._downloads[key] = grant
+            return grant
+
+    def release_download(self, key: str):
+        with self._cond:
+            if self._downloads.pop(key, None) is not None:
+                self._cond.notify_all()
+
+    def acquire_query(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """조회 자리 하나를 꺼낸다. 날 때까지 기다린다. 그만두라고 하면 False.
+
+        시작하지 않은 다운로드 자리는 건드리지 않는다. 미리 묻기가 주머니를 채워
+        두면 정작 받으려던 것이 시작할 때 한 칸도 없다.
+        """
+        with self._cond:
+            while self._used() + 1 > self.total - self._unstarted_seats():
+                if should_stop and should_stop():
+                    return False
+                self._cond.wait(WAIT_INTERVAL)
+            self._queries += 1
+            return True
+
+    def release_query(self):
+        with self._cond:
+            self._queries = max(0, self._queries - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def query(self, should_stop: Optional[Callable[[], bool]] = None) -> Iterator[bool]:
+        """with 문으로 조회 자리를 빌린다. 받은 값이 False면 그만둔 것이다."""
+        acquired = self.acquire_query(should_stop)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release_query()
+
+    def free(self) -> int:
+        """지금 비어 있는 칸 수."""
+        with self._cond:
+            return max(0, self.total - self._used())
+
+    def in_use(self) -> int:
+        with self._cond:
+            return self._used()
+
+    def query_room(self) -> int:
+        """조회가 지금 기다리지 않고 꺼낼 수 있는 자리 수. acquire_query와 같은 셈이다."""
+        with self._cond:
+            return max(0, self.total - self._unstarted_seats() - self._used())
+
+    def downloading(self) -> int:
+        """몫을 받아 도는 다운로드 수."""
+        with self._cond:
+            return len(self._downloads)
+
+
+_shared = ConnectionBudget()
+
+
+def shared() -> ConnectionBudget:
+    """앱 전체가 함께 쓰는 연결 주머니."""
+    return _shared
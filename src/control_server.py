@@ -0,0 +1,326 @@
+"""다른 프로그램이 대기열을 다루는 창구. 이 PC 안(127.0.0.1)에서만 듣는 작은 HTTP.
+
+자동화 스크립트가 주소를 넣으려면 지금까지는 클립보드 감시
+(InputSources.on_clipboard_changed)를 거쳐야 했다. 한 번 복사에 주소 하나라,
+회차 수백 개를 넣으려면 수백 번 복사하고 그때마다 감시가 알아챌 때까지 기다려야
+했다. 여기서는 한 번의 요청으로 목록을 통째로 넣는다.
+
+    GET    /queue             대기열 (DownloadManager.queue_snapshot)
+    POST   /queue             {"urls": [...], "priority": "user"|"favorites", "redownload": false}
+    DELETE /queue             {"urls": [...]} — 아직 시작하지 않은 것만 뺀다
+    POST   /queue/start-held  되살려 세워 둔 대기열을 받기 시작한다
+    GET    /events            진행 상황을 server-sent events로 흘려보낸다
+
+**받는 일은 모두 DownloadManager에 그대로 맡긴다.** 여기서 하는 것은 요청을
+읽어 add_task·remove_task_from_queue·start_held_tasks를 부르고, 시그널을 SSE로
+옮기는 일뿐이다. 창에서 넣은 것과 똑같이 카드가 생기고 대기열 파일에 남는다.
+
+창과 다른 판단은 하나다. **이미 받은 주소는 묻지 않고 건너뛴다**(redownload로
+바꾼다). 창은 확인 창을 띄우지만, 요청마다 창이 뜨면 스크립트가 그 앞에서 멈춘다.
+시리즈 주소는 받지 않는다 — 찾은 회차 중 무엇을 받을지 고르는 창이 있어야 해서,
+회차 주소로 풀어서 넣어야 한다.
+
+**남이 부르지 못하게 세 겹으로 막는다.**
+
+- 127.0.0.1에만 묶는다. 같은 망의 다른 PC에서는 닿지 않는다.
+- Host 머리글이 localhost·127.0.0.1이 아니면 거절한다. 웹 페이지가 자기 도메인을
+  127.0.0.1로 풀리게 해 두고 부르는 수법(DNS rebinding)을 막는다.
+- Origin 머리글이 있으면(브라우저가 보낸 것) 거절하고, 넣고 빼는 요청은 본문이
+  JSON이어야 한다. 브라우저는 JSON 본문을 다른 사이트로 보내기 전에 먼저 묻는데
+  (CORS preflight), 여기서 허락하지 않으므로 웹 페이지가 몰래 넣을 수 없다.
+
+켜 두지 않으면 아무것도 듣지 않는다(`control_api_port`가 0). UI 스레드에서만 돈다.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from PyQt6.QtCore import QObject, QByteArray
+from PyQt6.QtNetwork import QHostAddress, QTcpServer, QTcpSocket
+
+from src.history_store import HistoryStore
+from src.task_queue import PRIORITY_FAVORITES, PRIORITY_USER
+from src.utils import is_media_url
+
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+"""요청 하나의 최대 크기. 주소 수만 개를 넣어도 1MB를 넘지 않는다."""
+
+SSE_BACKLOG_BYTES = 1024 * 1024
+"""SSE 구독자에게 못 보내고 쌓인 양이 이보다 많으면 끊는다.
+
+읽지 않는 구독자 하나 때문에 진행률이 메모리에 끝없이 쌓이면 앱 전체가
+느려진다. 끊긴 쪽은 다시 붙으면 된다."""
+
+ALLOWED_HOSTS = ("127.0.0.1", "localhost")
+
+PRIORITY_NAMES = {"user": PRIORITY_USER, "favorites": PRIORITY_FAVORITES}
+
+_REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            415: "Unsupported Media Type"}
+
+
+class _Request:
+    """읽어 낸 요청 하나."""
+
+    def __init__(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.body.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+
+def _parse_head(raw: bytes) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """요청 줄과 머리글. 읽을 수 없으면 None."""
+    try:
+        lines = raw.decode("iso-8859-1").split("\r\n")
+        method, target, _version = lines[0].split(" ", 2)
+    except (UnicodeDecodeError, ValueError):
+        return None
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), urlsplit(target).path.rstrip("/") or "/", headers
+
+
+def _host_allowed(host: str) -> bool:
+    name = host.rsplit(":", 1)[0] if not host.startswith("[") else host
+    return name.lower() in ALLOWED_HOSTS
+
+
+class ControlServer(QObject):
+    """대기열을 다루는 로컬 HTTP 창구. DownloadManager 하나에 붙는다."""
+
+    def __init__(self, download_manager, history_store: HistoryStore, parent=None):
+        super().__init__(parent)
+        self.manager = download_manager
+        self.history_store = history_store
+        self._server = QTcpServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: Dict[QTcpSocket, bytearray] = {}
+        self._subscribers: List[QTcpSocket] = []
+        download_manager.progress_updated.connect(
+            lambda url, payload: self._broadcast("progress", {**payload, "url": url}))
+        download_manager.progress_batch.connect(
+            lambda batch: [self._broadcast("progress", {**payload, "url": url})
+                           for url, payload in batch.items()])
+        download_manager.task_finished.connect(
+            lambda url, ok, path, meta: self._broadcast(
+                "finished", {"url": url, "ok": ok, "path": path, "title": meta.get("title", "")}))
+        download_manager.queue_changed.connect(
+            lambda queued, active, converting: self._broadcast(
+                "queue", {"queued": queued, "active": active, "converting": converting}))
+
+    # --- 켜고 끄기 ---
+
+    def listen(self, port: int) -> bool:
+        """port에서 듣기 시작한다. 0이면 끈다. 이미 같은 포트면 그대로 둔다."""
+        port = int(port or 0)
+        if self._server.isListening() and self._server.serverPort() == port:
+            return True
+        self.close()
+        if port <= 0:
+            return True
+        return self._server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), port)
+
+    def close(self):
+        for socket in list(self._buffers) + list(self._subscribers):
+            socket.disconnectFromHost()
+        self._buffers.clear()
+        self._subscribers.clear()
+        if self._server.isListening():
+            self._server.close()
+
+    def is_listening(self) -> bool:
+        return self._server.isListening()
+
+    def error_text(self) -> str:
+        return self._server.errorString()
+
+    # --- 연결 ---
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = bytearray()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._forget(s))
+
+    def _forget(self, socket: QTcpSocket):
+        self._buffers.pop(socket, None)
+        if socket in self._subscribers:
+            self._subscribers.remove(socket)
+        socket.deleteLater()
+
+    def _on_ready_read(self, socket: QTcpSocket):
+        """요청이 다 올 때까지 모았다가 한 번에 처리한다."""
+        buffer = self._buffers.get(socket)
+        if buffer is None:
+            socket.readAll()
+            return
+        buffer.extend(bytes(socket.readAll()))
+        if len(buffer) > MAX_REQUEST_BYTES:
+            self._reply(socket, 413, {"error": "요청이 너무 큽니다."})
+            return
+        head_end = buffer.find(b"\r\n\r\n")
+        if head_end < 0:
+            return
+        parsed = _parse_head(bytes(buffer[:head_end]))
+        if parsed is None:
+            self._reply(socket, 400, {"error": "요청을 읽지 못했습니다."})
+            return
+        method, path, headers = parsed
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            self._reply(socket, 400, {"error": "Content-Length가 잘못되었습니다."})
+            return
+        body = bytes(buffer[head_end + 4:])
+        if len(body) < length:
+            return
+        del self._buffers[socket]
+        self._dispatch(socket, _Request(method, path, headers, body[:length]))
+
+    def _reply(self, socket: QTcpSocket, status: int, data: Any):
+        """JSON으로 답하고 연결을 닫는다."""
+        self._buffers.pop(socket, None)
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Cache-Control: no-store\r\n"
+                "Connection: close\r\n\r\n").encode("ascii")
+        socket.write(QByteArray(head + body))
+        socket.disconnectFromHost()
+
+    # --- 요청 ---
+
+    def _dispatch(self, socket: QTcpSocket, request: _Request):
+        if not _host_allowed(request.headers.get("host", "")):
+            self._reply(socket, 403, {"error": "이 PC 안에서만 부를 수 있습니다."})
+            return
+        if "origin" in request.headers:
+            self._reply(socket, 403, {"error": "브라우저에서는 부를 수 없습니다."})
+            return
+        routes = {
+            ("GET", "/queue"): self._get_queue,
+            ("POST", "/queue"): self._post_queue,
+            ("DELETE", "/queue"): self._delete_queue,
+            ("POST", "/queue/start-held"): self._start_held,
+        }
+        if (request.method, request.path) == ("GET", "/events"):
+            self._subscribe(socket)
+            return
+        handler = routes.get((request.method, request.path))
+        if handler is None:
+            known = any(path == request.path for _, path in routes) or request.path == "/events"
+            self._reply(socket, 405 if known else 404, {"error": "없는 주소입니다."})
+            return
+        if request.method != "GET":
+            content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                self._reply(socket, 415, {"error": "본문은 application/json이어야 합니다."})
+                return
+        data = request.json() if request.method != "GET" else {}
+        if data is None:
+            self._reply(socket, 400, {"error": "본문이 JSON 객체가 아닙니다."})
+            return
+        status, result = handler(data)
+        self._reply(socket, status, result)
+
+    def _get_queue(self, _data: Dict[str, Any]) -> Tuple[int, Any]:
+        return 200, {"items": self.manager.queue_snapshot(),
+                     "held": self.manager.held_count()}
+
+    @staticmethod
+    def _urls(data: Dict[str, Any]) -> Optional[List[str]]:
+        urls = data.get("urls")
+        if isinstance(urls, str):
+            urls = [urls]
+        if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls):
+            return None
+        return [u.strip() for u in urls if u.strip()]
+
+    def _post_queue(self, data: Dict[str, Any]) -> Tuple[int, Any]:
+        """주소 목록을 넣는다. 넣은 것과 건너뛴 것(까닭과 함께)을 돌려준다.
+
+        하나씩 add_task를 부른다. 대기열은 바뀔 때마다 파일 전체를 다시 쓰지 않고
+        일지에 바뀐 줄만 덧붙이므로(queue_store), 수백 개여도 한 요청 안에서 끝난다.
+        """
+        urls = self._urls(data)
+        if urls is None:
+            return 400, {"error": "urls는 주소 목록이어야 합니다."}
+        priority = PRIORITY_NAMES.get(str(data.get("priority", "user")))
+        if priority is None:
+            return 400, {"error": "priority는 user 또는 favorites입니다."}
+        folder = self.manager.config.get("download_folder", "")
+        if not folder:
+            return 409, {"error": "다운로드 폴더가 설정되지 않았습니다."}
+        redownload = bool(data.get("redownload", False))
+        added: List[str] = []
+        skipped: List[Dict[str, str]] = []
+        for url in urls:
+            if not is_media_url(url):
+                skipped.append({"url": url, "reason": "not-a-url"})
+            elif "/series/" in url:
+                skipped.append({"url": url, "reason": "series"})
+            elif self.history_store.exists(url) and not redownload:
+                skipped.append({"url": url, "reason": "history"})
+            elif self.manager.add_task(url, priority=priority):
+                added.append(url)
+            else:
+                skipped.append({"url": url, "reason": "pending"})
+        return 200, {"added": added, "skipped": skipped}
+
+    def _delete_queue(self, data: Dict[str, Any]) -> Tuple[int, Any]:
+        urls = self._urls(data)
+        if urls is None:
+            return 400, {"error": "urls는 주소 목록이어야 합니다."}
+        removed = [url for url in urls if self.manager.remove_task_from_queue(url)]
+        return 200, {"removed": removed,
+                     "not_removed": [url for url in urls if url not in removed]}
+
+    def _start_held(self, _data: Dict[str, Any]) -> Tuple[int, Any]:
+        if self.manager.held_count() and not self.manager.config.get("download_folder", ""):
+            return 409, {"error": "다운로드 폴더가 설정되지 않았습니다."}
+        return 200, {"started": self.manager.start_held_tasks()}
+
+    # --- 흘려보내기 ---
+
+    def _subscribe(self, socket: QTcpSocket):
+        """SSE 구독을 연다. 연결이 끊길 때까지 사건을 흘려보낸다.
+
+        붙자마자 지금 대기열을 한 번 보낸다. 붙기 전의 일을 모르는 구독자가
+        첫 progress가 올 때까지 빈 화면을 들고 있지 않게 한다.
+        """
+        self._buffers.pop(socket, None)
+        socket.write(QByteArray(b"HTTP/1.1 200 OK\r\n"
+                                b"Content-Type: text/event-stream; charset=utf-8\r\n"
+                                b"Cache-Control: no-store\r\n"
+                                b"Connection: keep-alive\r\n\r\n"))
+        self._subscribers.append(socket)
+        self._send(socket, "snapshot", {"items": self.manager.queue_snapshot(),
+                                        "held": self.manager.held_count()})
+
+    def _send(self, socket: QTcpSocket, event: str, data: Dict[str, Any]):
+        if socket.bytesToWrite() > SSE_BACKLOG_BYTES:
+            socket.abort()
+            return
+        text = json.dumps(data, ensure_ascii=False, default=str)
+        socket.write(QByteArray(f"event: {event}\ndata: {text}\n\n".encode("utf-8")))
+
+    def _broadcast(self, event: str, data: Dict[str, Any]):
+        for socket in list(self._subscribers):
+            self._send(socket, event, data)
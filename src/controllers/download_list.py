@@ -19,6 +19,7 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 
+from PyQt6 import sip
 from PyQt6.QtWidgets import QListWidgetItem, QFileDialog, QWidget
 from PyQt6.QtGui import QCursor
 
@@ -31,6 +32,13 @@ class DownloadListController:
 
     def __init__(self, window):
         self.window = window
+        self._widgets: Dict[str, DownloadItemWidget] = {}
+        """url → 카드. 진행률이 올 때마다 목록을 처음부터 훑지 않으려고 둔다.
+
+        카드를 넣는 곳(add_item_widget)과 빼는 곳(remove_row)이 하나씩이라 둘만
+        맞추면 된다. 그래도 Qt가 먼저 지운 카드가 남아 있을 수 있어, 꺼낼 때
+        살아 있는지 한 번 더 본다.
+        """
 
     def add_item_widget(self, url: str):
         window = self.window
@@ -43,18 +51,24 @@ class DownloadListController:
         widget.open_folder_requested.connect(open_file_location)
         item.setSizeHint(widget.sizeHint())
         window.ui.download_list.insertItem(0, item); window.ui.download_list.setItemWidget(item, widget)
+        self._widgets[url] = widget
 
     def find_item_widget(self, url: str) -> Optional[QWidget]:
-        download_list = self.window.ui.download_list
-        for i in range(download_list.count()):
-            item = download_list.item(i); widget = download_list.itemWidget(item)
-            if hasattr(widget, 'url') and widget.url == url: return widget
-        return None
+        widget = self._widgets.get(url)
+        if widget is not None and sip.isdeleted(widget):
+            del self._widgets[url]
+            return None
+        return widget
 
     def update_item_widget(self, url: str, payload: Dict):
         widget = self.find_item_widget(url)
         if isinstance(widget, DownloadItemWidget): widget.update_progress(payload)
 
+    def update_item_widgets(self, batch: Dict[str, Dict]):
+        """묶여 온 진행률(progress_batch)을 카드마다 한 번씩 얹는다."""
+        for url, payload in batch.items():
+            self.update_item_widget(url, payload)
+
     def delete_selected(self):
         """선택한 카드를 목록에서 지운다. 진행 중인 것은 남긴다.
 
@@ -74,6 +88,36 @@ class DownloadListController:
             if window.download_manager.is_queued(url): window.download_manager.remove_task_from_queue(url)
             self.remove_row(row)
 
+    def on_rows_moved(self, _parent, start: int, end: int, _dest, row: int):
+        """카드를 끌어 옮긴 만큼 대기열 차례도 옮긴다.
+
+        카드는 새로 온 것을 맨 위에 꽂으므로 **화면의 위→아래가 대기열의
+        뒤→앞이다.** 옮긴 카드는 바로 아래에 있는 기다리는 카드 뒤에 서고, 아래에
+        기다리는 카드가 없으면 맨 앞에 선다. 여럿을 한꺼번에 옮겼으면 아래 것부터
+        차례로 세워, 옮긴 것끼리의 위아래도 그대로 따른다.
+
+        기다리는 중이 아닌 카드(받는 중·끝난 것)는 자리만 옮겨지고 대기열과는
+        상관이 없다. 다른 줄(세워 둔 것 ↔ 대기열)의 카드는 기준으로 삼지 않는다.
+        """
+        window = self.window
+        download_list = window.ui.download_list
+        manager = window.download_manager
+        count = end - start + 1
+        first = row if row < start else row - count
+        for moved in range(first + count - 1, first - 1, -1):
+            widget = download_list.itemWidget(download_list.item(moved))
+            if not isinstance(widget, DownloadItemWidget) or not manager.is_queued(widget.url):
+                continue
+            placed = False
+            for below in range(moved + 1, download_list.count()):
+                anchor = download_list.itemWidget(download_list.item(below))
+                if (isinstance(anchor, DownloadItemWidget) and manager.is_queued(anchor.url)
+                        and manager.move_after(widget.url, anchor.url)):
+                    placed = True
+                    break
+            if not placed:
+                manager.move_to_front(widget.url)
+
     def sync_selection_styles(self, list_widget):
         """목록 위젯 안의 항목들에게 자신의 선택 여부를 알린다."""
         for i in range(list_widget.count()):
@@ -95,6 +139,8 @@ class DownloadListController:
         widget = self.window.ui.download_list.itemWidget(item)
         if isinstance(widget, DownloadItemWidget):
             widget.cleanup()
+            if self._widgets.get(widget.url) is widget:
+                del self._widgets[widget.url]
         self.window.ui.download_list.takeItem(row)
 
     def cancel_selected(self):
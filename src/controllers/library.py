@@ -1,8 +1,9 @@
 """기록 탭과 즐겨찾기 탭을 맡는다.
 
 두 탭은 하는 일의 성격이 같다. **저장해 둔 것을 다시 그리고, 검색어로 거르고,
-우클릭으로 지운다.** 목록을 채우는 방식도 같아서, 항목을 숨기는 대신 매번
-비우고 새로 담는다(GridListWidget이 폭으로 열을 나누므로 즐겨찾기는 끝에
+우클릭으로 지운다.** 목록을 채우는 방식은 다르다. 기록은 수만 건까지 쌓이므로
+모델(history_view)의 질의만 바꾸고 보이는 줄만 그린다. 즐겨찾기는 300개가 끝이라
+카드 위젯을 매번 비우고 새로 담는다(GridListWidget이 폭으로 열을 나누므로 끝에
 relayout까지 부른다).
 
 **한 모듈에 둔 이유는 둘이 실제로 맞물려 있기 때문이다.** 즐겨찾기 신규 확인은
@@ -26,23 +27,22 @@ from PyQt6.QtWidgets import QListWidgetItem, QMessageBox
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QCursor, QGuiApplication
 
+from src.history_index import ORDER_DATE, ORDER_TITLE
 from src.message import confirm
-from src.widgets import (FavoriteItemWidget, HistoryItemWidget, RoundedMenu,
-                         clear_item_widgets)
+from src.task_queue import PRIORITY_FAVORITES
+from src.widgets import FavoriteItemWidget, RoundedMenu, clear_item_widgets
 
 
 class LibraryController:
     """기록·즐겨찾기 두 목록을 그리고 거르는 조작 묶음."""
 
-    HISTORY_MAX_DISPLAY = 100
-    """기록 탭에 한 번에 그리는 최대 개수. 나머지는 검색으로 찾는다.
-
-    수백 개를 한꺼번에 카드로 만들면 탭을 여는 순간 멈칫한다."""
-
-    MAX_FAVORITES = 20
+    MAX_FAVORITES = 300
     """즐겨찾기에 담을 수 있는 최대 시리즈 수.
 
-    전부 자동 확인 대상이라, 늘어나면 시작할 때 도는 분석도 그만큼 길어진다."""
+    전부 자동 확인 대상이라, 늘어나면 시작할 때 도는 분석도 그만큼 길어진다.
+    확인이 새 회차만 열고(SeriesIndexStore) 몇 개씩 함께 돌아(SeriesParser.MAX_PARALLEL)
+    시리즈 하나에 몇 초면 끝나, 수백 개도 몇 분 안에 돈다. 목록 창에 카드로
+    그리는 것이 그다음 한계라 그 앞에서 멈춘다."""
 
     FAV_AUTO_ADD_LIMIT = 2
     """말없이 대기열에 넣어도 되는 신규 회차 수.
@@ -52,50 +52,38 @@ class LibraryController:
 
     def __init__(self, window):
         self.window = window
+        window.ui.history_list.model().set_source(window.history_store.search)
 
     def refresh_history_list(self):
+        """검색어와 정렬로 기록 모델의 질의를 바꾼다. 개수 제한 없이 전부 담는다.
+
+        목록은 모델을 보여 줄 뿐이라 헐고 새로 만들 것이 없다. 보이는 줄만
+        델리게이트가 그린다(history_view).
+        """
         window = self.window
         search_term = window.ui.history_search_input.text().lower(); sort_index = window.ui.history_sort_combo.currentIndex()
-        all_entries = window.history_store.sorted_entries()
-        if search_term: entries_to_show = [(url, meta) for url, meta in all_entries if search_term in meta.get('title', '').lower() or search_term in url.lower()]
-        else: entries_to_show = all_entries
-        if sort_index == 1: entries_to_show.sort(key=lambda item: item[1].get('title', ''))
-
-        total_count = len(entries_to_show)
-        display_entries = entries_to_show[:self.HISTORY_MAX_DISPLAY]
-
+        order = ORDER_TITLE if sort_index == 1 else ORDER_DATE
         window.ui.history_empty.set_filtered(bool(search_term))
-        clear_item_widgets(window.ui.history_list)
-        for url, meta in display_entries:
-            item = QListWidgetItem(); item.setData(Qt.ItemDataRole.UserRole, url)
-            if meta.get("series_id") or meta.get("thumbnail_url"):
-                widget = HistoryItemWidget(url, meta, window.config.get("theme", "light")); item.setSizeHint(widget.sizeHint())
-                window.ui.history_list.addItem(item); window.ui.history_list.setItemWidget(item, widget)
-            else:
-                title = meta.get("title", "(제목 없음)"); date = meta.get("date", "")
-                item.setText(f"{title}  •  {date}\n{url}"); item.setSizeHint(QSize(0, 90)); window.ui.history_list.addItem(item)
-
-        if total_count > self.HISTORY_MAX_DISPLAY:
-            info_item = QListWidgetItem(f"... 외 {total_count - self.HISTORY_MAX_DISPLAY}개의 이전 기록이 있습니다. (검색하여 찾을 수 있습니다)")
-            info_item.setFlags(Qt.ItemFlag.NoItemFlags); info_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            window.ui.history_list.addItem(info_item)
+        window.ui.history_list.model().set_query(search_term, order)
 
     def show_history_menu(self, pos):
         window = self.window
-        item = window.ui.history_list.itemAt(pos)
-        if not item: return
-        url = item.data(Qt.ItemDataRole.UserRole); menu = RoundedMenu()
+        index = window.ui.history_list.indexAt(pos)
+        if not index.isValid(): return
+        url = index.data(Qt.ItemDataRole.UserRole); menu = RoundedMenu()
         menu.addAction("URL 복사", lambda: QGuiApplication.clipboard().setText(url)); menu.addAction("다시 다운로드", lambda: window._request_add_task(url))
         menu.addAction("기록에서 제거", lambda: self.remove_from_history(url)); menu.exec(QCursor.pos())
 
     def remove_from_history(self, url: str):
+        """그 줄만 모델에서 뺀다. 목록을 다시 받지 않아 보던 자리가 그대로 남는다."""
         window = self.window
-        window.history_store.remove(url); window.history_store.save(); self.refresh_history_list(); window.append_log(f"[알림] 기록에서 제거됨: {url}")
+        window.history_store.remove(url); window.history_store.save()
+        window.ui.history_list.model().remove_url(url); window.append_log(f"[알림] 기록에서 제거됨: {url}")
 
     def refresh_fav_list(self):
         """검색어에 걸리는 즐겨찾기만 다시 그린다.
 
-        기록 탭과 같은 방식이다. 항목을 숨기는 대신 목록을 새로 채운다.
+        항목을 숨기는 대신 목록을 새로 채운다.
         GridListWidget은 항목 폭으로 열을 나누므로, 다 채운 뒤 relayout()으로
         지금 폭에 맞는 크기를 다시 먹여야 열이 어긋나지 않는다.
         """
@@ -146,7 +134,7 @@ class LibraryController:
                    icon_name="nav_cache", color_key="danger",
                    theme=window.config.get("theme", "light")):
             for item in selected_items:
-                url = item.data(Qt.ItemDataRole.UserRole); window.fav_store.remove(url); window.append_log(f"[즐겨찾기] 삭제: {url}")
+                url = item.data(Qt.ItemDataRole.UserRole); window.fav_store.remove(url); window.series_parser.forget(url); window.append_log(f"[즐겨찾기] 삭제: {url}")
             self.refresh_fav_list()
 
     def check_all_favorites(self):
@@ -159,6 +147,16 @@ class LibraryController:
             return
         window.append_log(f"[즐겨찾기] 전체 확인 시작 ({len(urls)}개 시리즈)"); window.series_parser.parse('fav-check', urls); window.ui.tabs.setCurrentIndex(0)
 
+    def poll_favorites(self, urls: List[str]):
+        """정기 확인(FavoritesPoller)이 때가 됐다고 넘긴 시리즈를 확인한다.
+
+        check_all_favorites와 달리 다운로드 탭으로 넘기지 않는다. 사용자가 누른 것이
+        아니라, 보던 화면을 몇 분마다 빼앗으면 안 된다.
+        """
+        window = self.window
+        window.append_log(f"[즐겨찾기] 정기 확인 ({len(urls)}개 시리즈)")
+        window.series_parser.parse('fav-check', urls)
+
     def show_fav_menu(self, pos):
         window = self.window
         item = window.ui.fav_list.itemAt(pos)
@@ -170,7 +168,7 @@ class LibraryController:
 
     def remove_favorite(self, url: str):
         window = self.window
-        window.fav_store.remove(url); self.refresh_fav_list(); window.append_log(f"[즐겨찾기] 삭제: {url}")
+        window.fav_store.remove(url); window.series_parser.forget(url); self.refresh_fav_list(); window.append_log(f"[즐겨찾기] 삭제: {url}")
 
     def on_fav_check_parsed(self, series_url: str, series_title: str, episode_info: List[Dict[str, str]]):
         """확인이 끝난 즐겨찾기 시리즈에서 신규 회차를 가려낸다.
@@ -178,6 +176,10 @@ class LibraryController:
         신규가 FAV_AUTO_ADD_LIMIT 이하면 그냥 받고, 그보다 많으면 선택 창을 띄운다.
         회차가 수십 개인 시리즈를 확인 없이 대기열에 통째로 쏟아부으면 정작 지금
         받고 싶은 영상이 그 뒤에 밀린다.
+
+        저절로 넣는 것은 즐겨찾기 묶음(PRIORITY_FAVORITES)으로 넣어, 사용자가 직접
+        넣은 주소보다 뒤에 서게 한다. 선택 창에서 고른 것은 사용자가 직접 넣은
+        것과 같이 다룬다.
         """
         window = self.window
         window.fav_store.touch_last_check(series_url, series_title)
@@ -190,13 +192,14 @@ class LibraryController:
             added_count = 0
             for episode in new_episodes:
                 if window._request_add_task(episode['url'], title=episode.get('title', ''),
-                                            thumbnail=episode.get('thumbnail_url', '')):
+                                            thumbnail=episode.get('thumbnail_url', ''),
+                                            priority=PRIORITY_FAVORITES):
                     added_count += 1
             if added_count:
                 window.append_log(f"[즐겨찾기] '{label}'에서 신규 에피소드 {added_count}개를 추가했습니다.")
             return
         window.append_log(f"[즐겨찾기] '{label}'에서 신규 에피소드 {len(new_episodes)}개를 찾았습니다. 받을 항목을 선택하세요.")
-        window._add_from_selection(new_episodes, f"[즐겨찾기] '{label}'에서")
+        window._add_from_selection(series_url, series_title, new_episodes, f"[즐겨찾기] '{label}'에서")
 
     def on_fav_add_check_parsed(self, series_url: str, series_title: str):
         """즐겨찾기에 갓 담은 시리즈의 제목을 받아 적는다.
@@ -0,0 +1,98 @@
+"""변환(ffmpeg)을 차례대로 돌리는 줄. 코어 수에 맞춰 한꺼번에 돌릴 수를 정한다.
+
+예전에는 다운로드가 끝나는 자리에서 ConversionThread를 곧바로 띄웠고, 그
+수는 `max_concurrent_downloads` 셈에 들지 않았다. 다섯 편이 비슷하게 끝나면
+`libx264 -preset slow`가 다섯 개 함께 돌고, 하나하나가 코어를 전부 쓰려 한다.
+코어 8개에 인코더 스레드가 수십 개 서면 서로 캐시를 밀어내며 번갈아 멈춰서,
+차례로 돌렸을 때보다 다섯 편이 모두 끝나는 시각이 오히려 늦다. 그동안 창도
+굳는다.
+
+여기서는 변환을 **줄에 세우고**, 한꺼번에 도는 수(limit)와 하나가 쓸 스레드
+수(threads_per_job)를 코어 수로 정한다.
+
+- 차례는 먼저 줄에 선 것, 곧 먼저 다 받은 것이 앞이다. 오래 기다린 것이
+  먼저 끝나야 사용자가 보는 순서와 파일이 생기는 순서가 맞는다.
+- 한 변환에 CORES_PER_JOB개씩 코어를 준다고 보고 limit을 나눈다. x264는 스레드가
+  늘수록 효율이 떨어져서, 코어 16개를 변환 하나에 몰아주는 것보다 넷씩 넷에
+  나눠 주는 편이 다 끝나는 시각이 이르다.
+- 스레드 수는 ffmpeg에 `-threads`로 건다. 걸지 않으면 ffmpeg는 변환마다 코어 수
+  만큼 스레드를 세워, limit을 지켜도 결국 코어를 나눠 먹는다.
+
+다운로드와 변환은 **따로 센다.** 변환이 코어를 쓰는 동안에도 회선은 비어
+있어서, 변환 수를 다운로드 자리에서 빼면 받을 수 있는 것을 놓친다.
+
+UI 스레드에서만 쓴다. 일(job)은 부르는 쪽이 정한 인자 묶음으로, 여기서는 열어
+보지 않는다.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CORES_PER_JOB = 4
+"""변환 하나에 준다고 셈하는 코어 수.
+
+x264는 한 프레임 안을 나눠 쓰는 데 한계가 있어, 1080p에서 스레드를 넷 넘게
+주면 더 준 만큼 빨라지지 않는다. 같은 코어를 변환 둘에 나누면 둘이 따로
+제 속도를 낸다."""
+
+MAX_JOBS = 4
+"""코어가 아무리 많아도 한꺼번에 돌릴 변환 수의 상한.
+
+변환은 원본을 읽고 새 파일을 쓰는 일이라 디스크도 쓴다. 받는 폴더가 하드
+디스크면 넷만 넘어도 읽기·쓰기가 서로 헤드를 끌고 다닌다."""
+
+
+def _cpu_count() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+class ConversionScheduler:
+    """기다리는 변환의 줄. 도는 것은 부르는 쪽이 들고 있고, 수만 알려 준다."""
+
+    def __init__(self, cores: Optional[int] = None):
+        self._cores = max(1, int(cores)) if cores else _cpu_count()
+        self._waiting: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._waiting
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def __bool__(self) -> bool:
+        return bool(self._waiting)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._waiting))
+
+    def limit(self) -> int:
+        """한꺼번에 돌릴 변환 수. 코어가 적어도 하나는 돈다."""
+        return max(1, min(MAX_JOBS, self._cores // CORES_PER_JOB))
+
+    def threads_per_job(self) -> int:
+        """변환 하나가 쓸 스레드 수. 코어를 limit개로 고루 나눈 몫이다."""
+        return max(1, self._cores // self.limit())
+
+    def push(self, url: str, job: Dict[str, Any]) -> bool:
+        """줄 끝에 세운다. 이미 서 있으면 그대로 두고 False."""
+        if url in self._waiting:
+            return False
+        self._waiting[url] = job
+        return True
+
+    def remove(self, url: str) -> Optional[Dict[str, Any]]:
+        """줄에서 뺀다. 서 있던 일을 돌려준다. 없으면 None."""
+        return self._waiting.pop(url, None)
+
+    def clear(self):
+        self._waiting.clear()
+
+    def take_ready(self, running: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """지금 도는 수(running)를 보고 새로 띄울 것을 앞에서부터 꺼낸다."""
+        ready = []
+        while self._waiting and running + len(ready) < self.limit():
+            ready.append(self._waiting.popitem(last=False))
+        return ready
@@ -11,10 +11,9 @@ from PyQt6.QtWidgets import (
 )
 from src import shortcuts
 from src.icons import get_icon
-from src.message import confirm, notify
+from src.message import confirm
 from src.qss import palette, blend, FILENAME_PART_COLORS, FILENAME_PART_MUTED
-from src.utils import (save_config, PARALLEL_MAX, FRAGMENTS_MIN, FRAGMENTS_MAX,
-                       MAX_TOTAL_CONNECTIONS, canonicalize_config_fragments,
+from src.utils import (save_config, PARALLEL_MAX, MAX_TOTAL_CONNECTIONS,
                        canonicalize_config_codec, canonicalize_config_encoder)
 from src.widgets import THUMBNAIL_CACHE_DIR
 
@@ -187,25 +186,21 @@ class SettingsDialog(QDialog):
         self.concurrent_spinbox.setRange(1, PARALLEL_MAX)
         self.concurrent_spinbox.setValue(self.config.get("max_concurrent_downloads", 5))
         self.concurrent_spinbox.setMinimumSize(96, 36)
+        self.concurrent_spinbox.setToolTip(
+            "TVer 영상은 수백 개의 작은 조각으로 나뉘어 있어, 여러 조각을 한꺼번에 받을수록 빠릅니다.\n"
+            f"한꺼번에 거는 연결은 모두 합쳐 {MAX_TOTAL_CONNECTIONS}개까지이고, 받는 영상들이 이것을 나눠 씁니다.\n"
+            "하나만 받을 때는 그 영상이 연결을 거의 다 씁니다."
+        )
         dl_count_layout.addWidget(self.concurrent_spinbox); dl_count_layout.addStretch(1); layout.addWidget(dl_count_group)
-
-        frag_group = QWidget(); frag_layout = QHBoxLayout(frag_group); frag_layout.setContentsMargins(0, 0, 0, 0)
-        fragments_label = QLabel("한 영상에서 동시에 받을 조각 수:")
-        frag_layout.addWidget(fragments_label)
-        self.fragments_spinbox = QSpinBox(objectName="StepperSpinBox")
-        self.fragments_spinbox.setRange(FRAGMENTS_MIN, FRAGMENTS_MAX)
-        self.fragments_spinbox.setValue(canonicalize_config_fragments(self.config))
-        self.fragments_spinbox.setMinimumSize(96, 36)
-        self.fragments_spinbox.setToolTip(
-            "TVer 영상은 수백 개의 작은 조각으로 나뉘어 있습니다.\n"
-            "그것을 한 개씩 차례로 받으면 회선을 다 쓰지 못해 느립니다.\n"
-            "이 값을 올리면 여러 조각을 한꺼번에 받아 그만큼 빨라집니다.\n\n"
-            "위의 동시 다운로드 개수와 곱해집니다 — 둘 다 크게 올리면\n"
-            "연결이 너무 많아져 TVer이 접속을 막을 수 있습니다.\n"
-            "1로 두면 이 기능을 쓰지 않습니다."
+        self.adaptive_concurrency_checkbox = QCheckBox("받는 속도에 맞춰 동시 다운로드 수를 저절로 조절하기")
+        self.adaptive_concurrency_checkbox.setChecked(self.config.get("adaptive_concurrency", True))
+        self.adaptive_concurrency_checkbox.setToolTip(
+            "위 값을 넘지 않는 범위에서, 함께 받을수록 빨라지면 하나씩 늘리고\n"
+            "늘려도 빨라지지 않거나 연결이 끊기기 시작하면 하나씩 줄입니다.\n"
+            "VPN처럼 시간마다 회선 사정이 달라지는 경우에 도움이 됩니다.\n"
+            "꺼 두면 언제나 위 값만큼 함께 받습니다."
         )
-        frag_layout.addWidget(self.fragments_spinbox); frag_layout.addStretch(1); layout.addWidget(frag_group)
-        self._align_labels(parallel_label, fragments_label)
+        layout.addWidget(self.adaptive_concurrency_checkbox)
 
         close_group = QWidget(); close_layout = QVBoxLayout(close_group); close_layout.setContentsMargins(0, 0, 0, 0)
         close_layout.addWidget(QLabel("닫기 버튼(X)을 눌렀을 때:"))
@@ -243,7 +238,21 @@ class SettingsDialog(QDialog):
             "윈도우 시작과 함께 켜지도록 해 두었다면 꺼 두는 편이 낫습니다.\n"
             "꺼도 즐겨찾기 탭의 '갱신'으로 언제든 직접 확인할 수 있습니다."
         )
-        fav_layout.addWidget(self.fav_autocheck_checkbox); layout.addWidget(fav_group)
+        fav_layout.addWidget(self.fav_autocheck_checkbox)
+        poll_row = QHBoxLayout(); poll_row.addWidget(QLabel("켜 둔 동안 새 회차 확인 간격:"))
+        self.fav_poll_spinbox = QSpinBox(objectName="StepperSpinBox")
+        self.fav_poll_spinbox.setRange(0, 168); self.fav_poll_spinbox.setSuffix("시간")
+        self.fav_poll_spinbox.setSpecialValueText("끄기")
+        self.fav_poll_spinbox.setValue(int(self.config.get("favorites_poll_hours", 0) or 0))
+        self.fav_poll_spinbox.setMinimumSize(96, 36)
+        self.fav_poll_spinbox.setToolTip(
+            "프로그램을 켜 둔 동안, 이 간격 안에 즐겨찾기를 한 바퀴 돌도록 몇 분마다 조금씩 확인합니다.\n"
+            "켜 두면 프로그램을 켤 때 확인도 한꺼번에 하지 않고 이 방식으로 나눠 돕니다.\n"
+            "다운로드로 회선이 꽉 찼을 때는 잠시 쉬었다가 이어 갑니다.\n"
+            "새 회차를 찾으면 '갱신'을 눌렀을 때와 똑같이 대기열에 넣거나 고르는 창을 띄웁니다."
+        )
+        poll_row.addWidget(self.fav_poll_spinbox); poll_row.addStretch(1); fav_layout.addLayout(poll_row)
+        layout.addWidget(fav_group)
 
         update_group = QWidget(); update_layout = QVBoxLayout(update_group)
         update_layout.setContentsMargins(0, 0, 0, 0); update_layout.setSpacing(10)
@@ -260,7 +269,6 @@ class SettingsDialog(QDialog):
         update_layout.addWidget(self.auto_update_checkbox); layout.addWidget(update_group)
 
         layout.addStretch(1); self._add_page(tab, "일반", "settings")
-        self._general_page_row = self.nav.count() - 1
 
     SHORTCUT_EDIT_WIDTH = 190
     """조합 입력칸 폭. 'Ctrl+Shift+F12'까지 잘리지 않는다."""
@@ -604,50 +612,10 @@ class SettingsDialog(QDialog):
         is_conversion_selected = selected_button is not None and selected_button.property("config_value") != "none"
         self.delete_original_checkbox.setEnabled(is_conversion_selected)
 
-    @staticmethod
-    def _align_labels(*labels: QLabel):
-        """나란히 놓인 설명들의 폭을 맞춰 뒤의 입력칸이 한 줄로 서게 한다.
-
-        두 줄은 성격이 같은 값(동시 다운로드 수 · 조각 수)이라 함께 읽는다. 글자
-        길이가 달라 칸이 어긋나 있으면 짝이라는 것이 눈에 들어오지 않는다.
-
-        폭을 숫자로 박아 두지 않고 sizeHint에서 가져온다. 서체와 배율에 따라
-        글자 폭이 달라져, 박아 두면 어느 환경에서는 글이 잘린다.
-        """
-        widest = max(label.sizeHint().width() for label in labels)
-        for label in labels:
-            label.setMinimumWidth(widest)
-
     def _browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "다운로드 폴더 선택", self.folder_path_edit.text())
         if folder: self.folder_path_edit.setText(folder)
 
-    def _check_connection_total(self) -> bool:
-        """동시 다운로드 수와 조각 수의 곱이 상한 안에 있는지 본다. 넘으면 알리고 막는다.
-
-        두 값이 각자 범위 안에 있어도 곱하면 얼마든지 커진다. 저장할 때 막는 것은
-        단축키 충돌과 같은 이유다 — 넘긴 채로 저장되면 다음 다운로드에서야 실패하고,
-        그때는 무엇 때문인지 짚기 어렵다.
-
-        고친 뒤 바로 다시 누를 수 있게 일반 탭으로 돌려놓는다.
-        """
-        parallel = self.concurrent_spinbox.value()
-        fragments = self.fragments_spinbox.value()
-        total = parallel * fragments
-        if total <= MAX_TOTAL_CONNECTIONS:
-            return True
-        self.nav.setCurrentRow(self._general_page_row)
-        notify(
-            self, "연결 수가 너무 많습니다",
-            f"동시 다운로드 {parallel}개 × 조각 {fragments}개 = 한꺼번에 {total}개 연결입니다.\n"
-            f"연결 안정성 때문에 두 값을 곱한 수는 {MAX_TOTAL_CONNECTIONS}개까지만 됩니다.\n\n"
-            "연결이 너무 많으면 TVer이 접속을 막고, 한번 막히면 값을 되돌려도\n"
-            "한동안 다운로드가 되지 않습니다.\n\n"
-            "둘 중 하나를 줄인 뒤 다시 저장해 주세요.",
-            icon_name="info", color_key="warn", theme=self._theme,
-        )
-        return False
-
     def _save_settings(self):
         shortcut_table = self._shortcut_table()
         if shortcuts.conflicts(shortcut_table):
@@ -657,16 +625,15 @@ class SettingsDialog(QDialog):
                                 "같은 조합을 두 동작이 나눠 쓰고 있습니다.\n"
                                 "겹치는 조합을 고친 뒤 다시 저장해 주세요.")
             return
-        if not self._check_connection_total():
-            return
         self.config[shortcuts.CONFIG_KEY] = shortcut_table
         self.config["download_folder"] = self.folder_path_edit.text()
         self.config["max_concurrent_downloads"] = self.concurrent_spinbox.value()
-        self.config["concurrent_fragments"] = self.fragments_spinbox.value()
+        self.config["adaptive_concurrency"] = self.adaptive_concurrency_checkbox.isChecked()
         if self.close_action_group.checkedButton():
             self.config["close_action"] = self.close_action_group.checkedButton().property("config_value")
         self.config["clipboard_watch"] = self.clipboard_watch_checkbox.isChecked()
         self.config["auto_check_favorites_on_start"] = self.fav_autocheck_checkbox.isChecked()
+        self.config["favorites_poll_hours"] = self.fav_poll_spinbox.value()
         self.config["auto_update_check"] = self.auto_update_checkbox.isChecked()
         filename_parts: dict[str, bool] = {}; filename_order: list[str] = []
         for i in range(self.order_list.count()):
@@ -1,15 +1,21 @@
 import os
 import subprocess
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from PyQt6.QtCore import QObject, QDeadlineTimer, pyqtSignal
 
 from src.threads.download_thread import DownloadThread
 from src.threads.conversion_thread import ConversionThread
+from src.threads import ytdlp_pool
+from src import connection_budget, partial_store
 from src.history_store import HistoryStore
 from src.metadata_prefetch import MetadataPrefetcher
 from src.queue_store import QueueStore
+from src.conversion_scheduler import ConversionScheduler
+from src.progress_coalescer import ProgressCoalescer
+from src.throughput_controller import ThroughputController
+from src.task_queue import TaskQueue, PRIORITY_RESTORED, PRIORITY_USER
 from src.utils import (get_startupinfo, DEFAULT_PARALLEL, resolve_ffprobe_path,
-                       item_percent, canonicalize_config_fragments,
+                       item_percent,
                        canonicalize_config_codec, canonicalize_config_encoder)
 
 class DownloadManager(QObject):
@@ -22,8 +28,16 @@ class DownloadManager(QObject):
     """
     item_added = pyqtSignal(str)
     progress_updated = pyqtSignal(str, dict)
+    """(url, payload). 상태가 바뀌었거나 로그·제목처럼 곧바로 알려야 하는 것.
+
+    같은 상태 안에서 바뀌는 진행률은 progress_batch로 묶여 나간다
+    (progress_coalescer). 카드를 그리는 쪽은 둘 다 받아야 한다.
+    """
+    progress_batch = pyqtSignal(dict)
+    """{url: payload}. 초당 10번, 그사이 바뀐 진행률을 항목마다 마지막 값만."""
     task_finished = pyqtSignal(str, bool, str, dict)
-    queue_changed = pyqtSignal(int, int)
+    queue_changed = pyqtSignal(int, int, int)
+    """(대기, 받는 중, 변환 중). 변환 중에는 차례를 기다리는 변환도 든다."""
     all_tasks_completed = pyqtSignal()
 
     def __init__(self, config: Dict[str, Any], history_store: HistoryStore,
@@ -31,19 +45,27 @@ class DownloadManager(QObject):
         super().__init__(parent)
         self.config = config; self.history_store = history_store
         self._queue_store = queue_store
-        self._held: List[str] = []; self._queue_meta: Dict[str, Dict[str, str]] = {}
+        self._held = TaskQueue(); self._queue_meta: Dict[str, Dict[str, str]] = {}
         self.ytdlp_path: Optional[str] = None; self.ffmpeg_path: Optional[str] = None
-        self._task_queue: List[str] = []; self._active_threads: Dict[str, DownloadThread] = {}
+        self._task_queue = TaskQueue(); self._active_threads: Dict[str, DownloadThread] = {}
         self._active_conversions: Dict[str, ConversionThread] = {}
+        self._conversions = ConversionScheduler()
         self._active_urls: set[str] = set(); self._logged_start: set[str] = set()
         self._conversion_meta_cache: Dict[str, Dict] = {}
         self._concurrency_logged = False
         self._shutting_down = False
         self._item_percent: Dict[str, int] = {}
+        self._progress = ProgressCoalescer(self)
+        self._progress.immediate.connect(self.progress_updated)
+        self._progress.batch.connect(self.progress_batch)
         self._prefetch = MetadataPrefetcher(self)
         self._prefetch.set_wanted_check(self.is_queued)
         self._prefetch.set_ignore_ssl_errors(config.get("ignore_ssl_errors", False))
         self._prefetch.loaded.connect(self._on_prefetch_loaded)
+        self._throughput = ThroughputController(self)
+        self._throughput.configure(config.get("max_concurrent_downloads", DEFAULT_PARALLEL),
+                                   config.get("adaptive_concurrency", True))
+        self._throughput.limit_changed.connect(self._on_limit_changed)
 
     def overall_progress(self) -> Optional[int]:
         """이번 묶음 전체의 진행률(0~100). 아무것도 걸려 있지 않으면 None.
@@ -58,15 +80,14 @@ class DownloadManager(QObject):
 
         변환 중인 항목은 받기를 마쳤으므로 100으로 남는다. 변환은 진행률을
         내주지 않아 더 잘게 나눌 수가 없다. 그래서 변환만 남은 구간에서는 링이
-        가득 찬 채로 멈춰 있고, 몇 개가 남았는지는 툴팁의 '진행' 수가 알려 준다.
+        가득 찬 채로 멈춰 있고, 몇 개가 남았는지는 툴팁의 '변환' 수가 알려 준다.
 
         **지난 실행에서 되살려 세워 둔 것(_held)은 분모에서 뺀다.** 사용자가
         시작을 누르기 전까지는 이번 묶음이 아니다. 세어 버리면 새로 넣은 하나를
         받는 동안 고리가 낮은 값에 눌려 있고, 스무 개를 되살린 사람은 그 하나가
         다 끝나도 5%에서 멈춘 것을 본다.
         """
-        held = set(self._held)
-        tracked = [url for url in self._active_urls if url not in held]
+        tracked = [url for url in self._active_urls if url not in self._held]
         total = len(tracked)
         if not total:
             return None
@@ -94,9 +115,11 @@ class DownloadManager(QObject):
 
         변환은 다운로드가 끝난 뒤 도는 별도 스레드라 _active_threads에 없다.
         진행 여부를 물으면서 다운로드만 보면 변환 중인 항목이 '아무것도 하지 않는
-        항목'으로 새어 나가, 목록에서 지워도 ffmpeg는 계속 돈다.
+        항목'으로 새어 나가, 목록에서 지워도 ffmpeg는 계속 돈다. 변환 차례를
+        기다리는 것(_conversions)도 같은 까닭으로 여기 든다.
         """
-        return url in self._active_threads or url in self._active_conversions
+        return (url in self._active_threads or url in self._active_conversions
+                or url in self._conversions)
 
     def is_queued(self, url: str) -> bool:
         """차례를 기다리는 중. 아직 아무 프로세스도 뜨지 않았다.
@@ -126,8 +149,8 @@ class DownloadManager(QObject):
         그래서 여기만 is_pending과 답이 갈린다. 묻는 것이 달라서다 — 이쪽은
         '지금 껐을 때 잃는 것'이고, is_pending은 '아직 끝나지 않았는가'다.
         """
-        return (len(self._task_queue)
-                + len(self._active_threads) + len(self._active_conversions))
+        return (len(self._task_queue) + len(self._active_threads)
+                + len(self._active_conversions) + len(self._conversions))
 
     def stop_all(self) -> int:
         """진행 중인 다운로드와 변환을 모두 멈추고, 멈춘 개수를 돌려준다.
@@ -141,8 +164,8 @@ class DownloadManager(QObject):
         기다림은 전체 STOP_WAIT_MS 하나로 묶어, 작업이 많아도 종료가 늘어지지 않게 한다.
 
         **비우기 전에 남은 대기열을 파일에 적는다.** 받는 중이던 것까지 함께
-        적어 두고, 다음 실행에서 대기로 되살린다. 끊긴 자리에서 이어받을 수는
-        없지만 목록에서 통째로 사라지는 것보다 낫다. 적는 일이 반드시 이 자리
+        적어 두고, 다음 실행에서 대기로 되살린다. 받던 조각은 작업 폴더에
+        남아 있어 다시 시작하면 이어받는다. 적는 일이 반드시 이 자리
         앞이어야 하는 것은, 아래에서 대기열을 비운 뒤 세는 코드가 다시 저장을
         불러 방금 적은 것을 빈 목록으로 덮어쓰기 때문이다(_persist_queue가
         _shutting_down을 보고 돌아 나가는 이유이기도 하다).
@@ -151,7 +174,9 @@ class DownloadManager(QObject):
         self._shutting_down = True
         self._task_queue.clear()
         self._held.clear()
+        self._conversions.clear()
         self._item_percent.clear()
+        self._progress.clear()
         self._prefetch.stop_all()
         threads = list(self._active_threads.values()) + list(self._active_conversions.values())
         for thread in threads:
@@ -161,30 +186,41 @@ class DownloadManager(QObject):
             if not thread.wait(deadline):
                 self.log.emit("[알림] 정리가 끝나기 전에 종료합니다. 받다 만 파일이 남을 수 있습니다.")
                 break
+        ytdlp_pool.shared().shutdown()
         self._update_queue_counter()
         return len(threads)
 
     def set_paths(self, ytdlp_path: str, ffmpeg_path: str):
         self.ytdlp_path = ytdlp_path; self.ffmpeg_path = ffmpeg_path
         self._prefetch.set_ytdlp_path(ytdlp_path)
+        pool = ytdlp_pool.shared()
+        pool.set_enabled(self.config.get("ytdlp_worker_pool", True))
+        pool.prewarm()
 
     def update_config(self, new_config: Dict[str, Any]):
         self.config = new_config
         self._prefetch.set_ignore_ssl_errors(new_config.get("ignore_ssl_errors", False))
+        ytdlp_pool.shared().set_enabled(new_config.get("ytdlp_worker_pool", True))
+        self._throughput.configure(new_config.get("max_concurrent_downloads", DEFAULT_PARALLEL),
+                                   new_config.get("adaptive_concurrency", True))
         self.check_queue_and_start()
 
-    def add_task(self, url: str, title: str = "", thumbnail: str = "") -> bool:
+    def add_task(self, url: str, title: str = "", thumbnail: str = "",
+                 priority: int = PRIORITY_USER) -> bool:
         """대기열에 하나 넣는다. 제목·표지 그림을 이미 알면 함께 넘긴다.
 
         시리즈 선택 창과 즐겨찾기 확인은 그 둘을 이미 손에 들고 있다. 넘겨받으면
         카드가 그 자리에서 채워져, 미리 묻기에 회선을 쓸 일도 없다. 모르는 채로
         들어온 것(직접 붙여넣기·다중 추가·드롭)만 미리 물어본다.
+
+        priority는 대기열 묶음이다(task_queue). 즐겨찾기 확인이 넣는 것은
+        PRIORITY_FAVORITES로 넣어, 사용자가 직접 넣은 주소 뒤에 선다.
         """
         url = (url or "").strip()
         if not url or url in self._active_urls:
             if url in self._active_urls: self.log.emit(f"[알림] 이미 대기열/작업 중인 URL입니다: {url}")
             return False
-        self._active_urls.add(url); self._task_queue.append(url)
+        self._active_urls.add(url); self._task_queue.push(url, priority)
         self.item_added.emit(url); self.log.emit(f"[대기열] 추가됨: {url}")
         self._emit_preview(url, title, thumbnail)
         self._update_queue_counter(); self.check_queue_and_start()
@@ -209,7 +245,7 @@ class DownloadManager(QObject):
         if thumbnail:
             payload["thumbnail"] = thumbnail
         if payload:
-            self.progress_updated.emit(url, payload)
+            self._progress.push(url, payload, urgent=True)
 
     def _on_prefetch_loaded(self, url: str, metadata: Dict[str, Any]):
         """미리 물어본 답이 왔다. 아직 기다리는 중일 때만 카드에 얹는다.
@@ -226,6 +262,9 @@ class DownloadManager(QObject):
     def stop_task(self, url: str):
         if url in self._active_threads: self._active_threads[url].stop()
         if url in self._active_conversions: self._active_conversions[url].stop()
+        if self._conversions.remove(url) is not None:
+            self.log.emit("[알림] 사용자 요청으로 변환을 중단했습니다.")
+            self._on_conversion_finished(False, url, "")
 
     def remove_task_from_queue(self, url: str):
         """대기 중인 것 하나를 뺀다. 되살려 세워 둔 것도 같은 길로 빠진다.
@@ -234,18 +273,15 @@ class DownloadManager(QObject):
         이기 때문이다. 우클릭 메뉴의 `대기열에서 제거`가 되살린 카드에서만 듣지
         않으면, 지울 방법이 없는 카드가 생긴다.
         """
-        if url in self._held:
-            self._held.remove(url)
-        elif url in self._task_queue:
-            self._task_queue.remove(url)
-        else:
+        if not self._held.remove(url) and not self._task_queue.remove(url):
             return False
         self._active_urls.discard(url); self._queue_meta.pop(url, None)
-        self._prefetch.cancel(url)
+        self._prefetch.cancel(url); self._progress.forget(url)
         self._update_queue_counter(); self.log.emit(f"[대기열] 제거됨: {url}")
         return True
 
-    def restore_task(self, url: str, title: str = "", thumbnail: str = "") -> bool:
+    def restore_task(self, url: str, title: str = "", thumbnail: str = "",
+                     percent: int = 0) -> bool:
         """지난 실행에서 남은 항목을 카드만 세워 둔다. 받기 시작하지는 않는다.
 
         **대기열(_task_queue)이 아니라 따로 세워 둔다**(_held). 같은 줄에 넣으면
@@ -265,14 +301,76 @@ class DownloadManager(QObject):
         url = (url or "").strip()
         if not url or url in self._active_urls:
             return False
-        self._active_urls.add(url); self._held.append(url)
+        self._active_urls.add(url); self._held.push(url, PRIORITY_RESTORED)
         self.item_added.emit(url)
         self._emit_preview(url, title, thumbnail)
+        if percent > 0:
+            self._remember_progress(url, percent)
+            self._progress.push(url, {"percent": percent}, urgent=True)
         self._update_queue_counter()
         if not title:
             self._prefetch.request(url)
         return True
 
+    def restore_saved_queue(self) -> Tuple[int, int]:
+        """대기열 파일에 남은 것을 모두 세워 둔다. (되살린 수, 정리한 작업 폴더 수)
+
+        되살리기 전에 쓸모없어진 작업 폴더를 걷는다(partial_store). 받다 만
+        것이 남아 있는 항목만 받은 만큼을 그려 둔다 — 폴더가 사라졌는데 95%로
+        서 있으면, 시작을 누르는 순간 0으로 떨어진다.
+
+        창과 headless가 함께 쓴다. 둘 다 같은 queue.json을 쓰므로, 한쪽이
+        되살리지 않고 저장하면 다른 쪽이 남겨 둔 대기열을 덮어쓴다.
+        """
+        if self._queue_store is None:
+            return 0, 0
+        entries = self._queue_store.entries()
+        swept = partial_store.collect_stale(entry.get("url", "") for entry in entries)
+        restored = sum(1 for entry in entries
+                       if self.restore_task(
+                           entry.get("url", ""),
+                           title=entry.get("title", ""),
+                           thumbnail=entry.get("thumbnail", ""),
+                           percent=(entry.get("percent", 0)
+                                    if partial_store.has_partial(entry.get("url", "")) else 0)))
+        return restored, swept
+
+    def _queue_of(self, url: str) -> Optional[TaskQueue]:
+        """url이 서 있는 줄. 세워 둔 것(_held)과 대기열은 따로 줄을 선다."""
+        if url in self._task_queue:
+            return self._task_queue
+        if url in self._held:
+            return self._held
+        return None
+
+    def move_to_front(self, url: str) -> bool:
+        """기다리는 것 하나를 맨 앞으로. 다음 빈자리에서 바로 시작한다."""
+        queue = self._queue_of(url)
+        if queue is None or not queue.move_to_front(url):
+            return False
+        self._update_queue_counter()
+        return True
+
+    def move_after(self, url: str, anchor: str) -> bool:
+        """기다리는 것 하나를 anchor 바로 뒤로. 둘이 같은 줄에 있을 때만 듣는다.
+
+        세워 둔 것과 대기열 사이를 넘나들게 하면, 끌어 놓는 것만으로 누르지도
+        않은 `대기열 시작`이 일어난다.
+        """
+        queue = self._queue_of(url)
+        if queue is None or anchor not in queue or not queue.move_after(url, anchor):
+            return False
+        self._update_queue_counter()
+        return True
+
+    def set_priority(self, url: str, priority: int) -> bool:
+        """기다리는 것 하나의 묶음을 바꾼다(task_queue의 PRIORITY_*)."""
+        queue = self._queue_of(url)
+        if queue is None or not queue.set_priority(url, priority):
+            return False
+        self._update_queue_counter()
+        return True
+
     def held_count(self) -> int:
         """시작을 기다리며 세워 둔 항목 수. 0이면 되살린 것이 없다."""
         return len(self._held)
@@ -280,8 +378,8 @@ class DownloadManager(QObject):
     def start_held_tasks(self) -> int:
         """세워 둔 것들을 대기열에 넣고 받기 시작한다. 넣은 개수를 돌려준다.
 
-        **맨 앞에 붙인다.** 지난 실행에서 이미 기다리던 것들이라, 뒤에 붙이면
-        그 사이에 넣은 주소보다 더 오래 기다리게 된다.
+        **맨 앞 묶음(PRIORITY_RESTORED)으로 넣는다.** 지난 실행에서 이미 기다리던
+        것들이라, 뒤에 붙이면 그 사이에 넣은 주소보다 더 오래 기다리게 된다.
 
         개수를 세는 일은 여기서 끝내고, 실제로 몇 개가 동시에 뜰지는 여느 때와
         같이 check_queue_and_start가 정한다.
@@ -289,7 +387,8 @@ class DownloadManager(QObject):
         if not self._held:
             return 0
         count = len(self._held)
-        self._task_queue[:0] = self._held
+        for url in self._held:
+            self._task_queue.push(url, PRIORITY_RESTORED)
         self._held.clear()
         self._update_queue_counter()
         self.check_queue_and_start()
@@ -302,11 +401,31 @@ class DownloadManager(QObject):
         if self._task_queue and not self._concurrency_logged:
             self._concurrency_logged = True
             self.log.emit(f"동시 다운로드 최대 {max_concurrent}개로 진행합니다.")
-        while len(self._active_threads) < max_concurrent and self._task_queue:
-            url = self._task_queue.pop(0); self._start_download(url)
+        limit = min(max_concurrent, self._throughput.limit())
+        seats = min(max_concurrent, self._throughput.share_seats())
+        connection_budget.shared().set_download_slots(seats)
+        expected = min(seats, len(self._active_threads) + len(self._task_queue))
+        while len(self._active_threads) < limit and self._task_queue:
+            url = self._task_queue.pop(); self._start_download(url, expected)
+        self._throughput.note_running(len(self._active_threads))
         self._update_queue_counter()
 
-    def _start_download(self, url: str):
+    def _on_limit_changed(self, limit: int, reason: str):
+        """받는 속도를 보고 동시 다운로드 수를 바꿨다(throughput_controller).
+
+        늘었으면 그 자리에서 하나 더 띄운다. 줄었을 때는 돌고 있는 것을 그대로
+        두고, 끝나서 빈 자리를 채우지 않는 것으로 따라간다.
+        """
+        self.log.emit(f"[대기열] {reason} 동시 다운로드를 {limit}개로 조정합니다.")
+        self.check_queue_and_start()
+
+    def _start_download(self, url: str, expected: int = 1):
+        """하나를 띄운다. expected는 이번에 함께 돌게 될 다운로드 수다.
+
+        조각 수(-N)는 연결 주머니에서 이 자리에서 받은 몫이다(connection_budget).
+        혼자 받으면 주머니를 거의 다 쓰고, 다섯이 함께 시작하면 나눠 쓴다. 몫은
+        끝날 때(_on_download_finished) 돌려준다.
+        """
         preloaded = self._prefetch.take(url)
         download_folder = self.config.get("download_folder", "")
         if not download_folder: self._on_download_finished(url, False, "", {}); return
@@ -319,7 +438,9 @@ class DownloadManager(QObject):
         subtitle_format = self.config.get("subtitle_format", "vtt")
         ignore_ssl = self.config.get("ignore_ssl_errors", False)
         embed_thumb = self.config.get("embed_thumbnail", False)
-        fragments = canonicalize_config_fragments(self.config)
+        fragments = connection_budget.shared().grant_download(url, expected)
+        scratch = (str(partial_store.scratch_dir(url))
+                   if self.config.get("resume_downloads", True) else "")
 
         thread = DownloadThread(url=url, download_folder=download_folder, ytdlp_exe_path=self.ytdlp_path,
                                 ffmpeg_exe_path=self.ffmpeg_path, output_template=output_template,
@@ -330,7 +451,8 @@ class DownloadManager(QObject):
                                 ignore_ssl_errors=ignore_ssl,
                                 embed_thumbnail=embed_thumb,
                                 preloaded_metadata=preloaded,
-                                concurrent_fragments=fragments
+                                concurrent_fragments=fragments,
+                                scratch_dir=scratch
                                 )
         thread.progress.connect(self._on_progress); thread.finished.connect(self._on_download_finished)
         self._active_threads[url] = thread; self._logged_start.discard(url); thread.start()
@@ -343,7 +465,14 @@ class DownloadManager(QObject):
         self._remember_meta(url, payload.get("title") or "", payload.get("thumbnail") or "")
         self._item_percent[url] = item_percent(payload.get("percent"),
                                                self._item_percent.get(url, 0))
-        self.progress_updated.emit(url, payload)
+        if "percent" in payload or payload.get("fragment"):
+            self._remember_progress(url, self._item_percent[url], payload.get("fragment", ""))
+        speed = payload.get("speed_bps") or payload.get("speed")
+        if speed:
+            self._throughput.note_speed(url, speed)
+        if payload.get("retrying"):
+            self._throughput.note_network_error()
+        self._progress.push(url, payload)
 
     def _get_video_codec(self, filepath: str) -> Optional[str]:
         ffprobe_path = resolve_ffprobe_path(self.ffmpeg_path)
@@ -371,6 +500,9 @@ class DownloadManager(QObject):
     def _on_download_finished(self, url: str, success: bool, final_filepath: str, metadata: dict):
         thread = self._active_threads.pop(url, None)
         if thread: thread.deleteLater()
+        connection_budget.shared().release_download(url)
+        self._throughput.forget(url)
+        self._throughput.note_running(len(self._active_threads))
 
         if not success or not final_filepath or not os.path.exists(final_filepath):
             self.log.emit(f"[실패] 다운로드 실패 또는 파일 없음: {url}")
@@ -378,6 +510,7 @@ class DownloadManager(QObject):
             self._check_completion(); return
 
         self.log.emit(f"[성공] 다운로드 완료: {final_filepath}")
+        partial_store.discard(url)
         self._conversion_meta_cache[url] = metadata
 
         target_container_format = self.config.get("conversion_format", "none")
@@ -406,23 +539,45 @@ class DownloadManager(QObject):
             self._check_completion()
 
     def _start_conversion(self, url: str, input_path: str, target_format: Optional[str] = None, target_codec: Optional[str] = None, delete_original: Optional[bool] = None):
-        status_msg = ""
-        if target_format: status_msg = f"{target_format.upper()} 변환 중..."
-        elif target_codec: status_msg = f"{target_codec.upper()} 변환 중..."
-        self.progress_updated.emit(url, {"status": status_msg})
+        """변환을 줄에 세운다. 자리가 나면 _run_conversions가 띄운다.
 
+        다운로드가 끝나는 자리에서 곧바로 띄우지 않는다(conversion_scheduler).
+        여럿이 함께 끝나면 인코더가 코어를 나눠 먹어 모두가 늦어진다.
+        """
         delete_on_conv = self.config.get("delete_on_conversion", False)
         if delete_original is not None:
             delete_on_conv = delete_original
 
+        self._conversions.push(url, {"input_path": input_path,
+                                     "target_format": target_format,
+                                     "target_codec": target_codec,
+                                     "delete_original": delete_on_conv})
+        self._progress.push(url, {"status": "변환 대기"}, urgent=True)
+        self._run_conversions()
+        self.check_queue_and_start()
+
+    def _run_conversions(self):
+        """자리가 나는 만큼 줄 앞의 변환을 띄운다."""
+        if self._shutting_down: return
+        for url, job in self._conversions.take_ready(len(self._active_conversions)):
+            self._launch_conversion(url, **job)
+        self._update_queue_counter()
+
+    def _launch_conversion(self, url: str, input_path: str, target_format: Optional[str],
+                           target_codec: Optional[str], delete_original: bool):
+        status_msg = ""
+        if target_format: status_msg = f"{target_format.upper()} 변환 중..."
+        elif target_codec: status_msg = f"{target_codec.upper()} 변환 중..."
+        self._progress.push(url, {"status": status_msg}, urgent=True)
+
         thread = ConversionThread(url, input_path, self.ffmpeg_path,
                                   target_format=target_format,
                                   target_codec=target_codec,
-                                  delete_original=delete_on_conv,
-                                  hw_encoder_setting=canonicalize_config_encoder(self.config))
+                                  delete_original=delete_original,
+                                  hw_encoder_setting=canonicalize_config_encoder(self.config),
+                                  threads=self._conversions.threads_per_job())
         thread.log.connect(self.log); thread.finished.connect(self._on_conversion_finished)
         self._active_conversions[url] = thread; thread.start()
-        self.check_queue_and_start()
 
     def _on_conversion_finished(self, success: bool, url:str, new_filepath: str):
         thread = self._active_conversions.pop(url, None)
@@ -431,8 +586,9 @@ class DownloadManager(QObject):
         final_status = "완료" if success else "변환 오류"
         payload = {"status": final_status}
         if success: payload["final_filepath"] = new_filepath
-        self.progress_updated.emit(url, payload)
+        self._progress.push(url, payload, urgent=True)
         self.task_finished.emit(url, success, new_filepath if success else "", meta)
+        self._run_conversions()
         self._check_completion()
 
     def _check_completion(self):
@@ -441,7 +597,8 @@ class DownloadManager(QObject):
 
         self.check_queue_and_start()
 
-        if not self._task_queue and not self._active_threads and not self._active_conversions:
+        if (not self._task_queue and not self._active_threads
+                and not self._active_conversions and not self._conversions):
             self._active_urls = set(self._held); self._logged_start.clear()
             self._item_percent.clear()
             self._queue_meta = {url: meta for url, meta in self._queue_meta.items()
@@ -463,25 +620,62 @@ class DownloadManager(QObject):
         if thumbnail:
             entry["thumbnail"] = thumbnail
 
+    def _remember_progress(self, url: str, percent: int, fragment: str = ""):
+        """어디까지 받았는지 대기열 저장용으로 적어 둔다.
+
+        다음 실행에서 되살린 카드가 0%가 아니라 끊긴 자리에서 서 있게 하려는
+        것이다. 실제로 이어받는 자리는 yt-dlp가 작업 폴더의 `.ytdl`에서 읽으므로
+        (partial_store), 여기 적는 것은 보여 주는 데만 쓴다.
+        """
+        entry = self._queue_meta.setdefault(url, {})
+        entry["percent"] = int(percent)
+        if fragment:
+            entry["fragment"] = fragment
+
     def _snapshot_pending(self) -> List[Dict[str, str]]:
         """파일에 남길 항목을 대기열 차례대로 늘어놓는다.
 
         **받는 중·변환 중인 것도 함께 적는다.** 다음 실행에서 그것들은 대기로
-        되살아난다. 끊긴 자리에서 이어받을 수는 없지만, 목록에서 사라지는 것보다
-        '아직 안 받았다'로 남는 편이 낫다.
+        되살아나고, 다시 시작하면 작업 폴더(partial_store)에 남은 조각부터
+        이어받는다. 받은 정도도 함께 적어 두어 카드가 0%로 돌아가지 않는다.
 
         차례는 먼저 시작한 것이 앞이다. 되살린 것 → 변환 중 → 받는 중 →
         기다리는 중 순으로 늘어놓으면 다음 실행의 대기열이 이번과 같은 차례로
         선다. 카드는 새로 온 것을 맨 위에 꽂으므로 화면에서도 지금과 같은
         위아래가 된다.
         """
-        urls = (list(self._held) + list(self._active_conversions)
+        urls = (list(self._held) + list(self._active_conversions) + list(self._conversions)
                 + list(self._active_threads) + list(self._task_queue))
         return [{"url": url,
                  "title": self._queue_meta.get(url, {}).get("title", ""),
-                 "thumbnail": self._queue_meta.get(url, {}).get("thumbnail", "")}
+                 "thumbnail": self._queue_meta.get(url, {}).get("thumbnail", ""),
+                 "percent": self._queue_meta.get(url, {}).get("percent", 0),
+                 "fragment": self._queue_meta.get(url, {}).get("fragment", "")}
                 for url in urls]
 
+    def queue_snapshot(self) -> List[Dict[str, Any]]:
+        """밖에 보여 줄 대기열(control_server). 파일에 남기는 것과 같은 차례다.
+
+        항목마다 지금 어느 단계인지(state)를 붙인다. 저장용과 차례를 같게 둔 것은
+        스크립트가 보는 차례와 다음 실행에서 되살아나는 차례가 갈리지 않게 하려는
+        것이다.
+        """
+        items: List[Dict[str, Any]] = []
+        for entry in self._snapshot_pending():
+            url = entry["url"]
+            if url in self._held:
+                state = "held"
+            elif url in self._active_conversions:
+                state = "converting"
+            elif url in self._conversions:
+                state = "conversion-waiting"
+            elif url in self._active_threads:
+                state = "downloading"
+            else:
+                state = "queued"
+            items.append(dict(entry, state=state))
+        return items
+
     def _persist_queue(self):
         """지금 남은 대기열을 파일에 적는다.
 
@@ -502,19 +696,17 @@ class DownloadManager(QObject):
         군데가 자료구조를 각자 세다 조건이 어긋난 적이 있다.
         """
         queued = len(self._task_queue) + len(self._held)
-        active = len(self._active_threads) + len(self._active_conversions)
+        converting = len(self._active_conversions) + len(self._conversions)
         self._persist_queue()
-        self.queue_changed.emit(queued, active)
+        self.queue_changed.emit(queued, len(self._active_threads), converting)
 
     def reset_for_redownload(self, url: str):
         if not url: return
-        try:
-            if url in self._task_queue: self._task_queue.remove(url)
-            if url in self._held: self._held.remove(url)
-        except ValueError: pass
+        self._task_queue.remove(url); self._held.remove(url)
         self._active_urls.discard(url)
         self._logged_start.discard(url)
         self._item_percent.pop(url, None)
+        self._progress.forget(url)
         self._queue_meta.pop(url, None)
         self._conversion_meta_cache.pop(url, None)
         self._prefetch.cancel(url)
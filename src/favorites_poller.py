@@ -0,0 +1,127 @@
+"""켜 둔 동안 즐겨찾기를 조금씩 나눠 확인하는 곳.
+
+즐겨찾기 확인은 켤 때 한 번(check_all_favorites)과 `갱신` 버튼뿐이었다. 한 주
+내내 켜 두는 PC는 월요일에 켠 뒤로 새 회차를 하나도 모르고, 켤 때마다 수백
+개를 한꺼번에 분석에 밀어 넣어 그동안 회선과 TVer를 함께 붙잡는다.
+
+여기서는 **확인 간격(favorites_poll_hours) 안에 한 바퀴가 돌도록 조금씩** 내보낸다.
+몇 분마다 깨어나, 마지막 확인(FavoritesStore의 last_check)이 간격보다 오래된
+시리즈 가운데 가장 오래된 것부터 몫만큼만 넘긴다. 몫은 한 바퀴를 간격에 고르게
+나눈 크기다. 깨어나는 때에도 흔들림(JITTER)을 주어, 켜 둔 PC 여러 대나 다른 정기
+작업과 같은 순간에 몰리지 않게 한다.
+
+**다운로드가 돌고 있으면 그 차례를 건너뛴다**(connection_budget의 downloading()).
+받는 속도를 깎아 가며 할 만큼 급한 일이 아니다. 다음 차례에 다시 본다.
+query_room()으로는 가릴 수 없다 — 주머니가 조회 몫(QUERY_RESERVE)을 늘 비워 두어,
+다운로드가 나머지를 다 채워도 0이 되지 않는다. 미리 묻기(MetadataPrefetcher._limit)와
+시리즈 분석(SeriesParser._background_limit)이 보는 것과 같은 신호를 본다.
+
+넘긴 시리즈를 분석해 기록과 대조하고 넣는 일은 예전 길(SeriesParser의 fav-check →
+on_fav_check_parsed)을 그대로 탄다. 여기서 하는 것은 무엇을 언제 넘길지뿐이다.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from datetime import datetime
+from typing import Callable, List, Set
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src import connection_budget
+
+TICK_SECONDS = 120
+"""깨어나는 간격(초). 간격이 짧을수록 몫이 작아져 더 고르게 퍼진다."""
+
+JITTER = 0.25
+"""깨어나는 간격을 흔드는 비율. 0.25면 90~150초 사이에서 고른다."""
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class FavoritesPoller(QObject):
+    """확인할 때가 된 즐겨찾기를 조금씩 due로 내보낸다."""
+
+    due = pyqtSignal(list)
+
+    def __init__(self, fav_store, series_parser, parent=None):
+        super().__init__(parent)
+        self.fav_store = fav_store
+        self.series_parser = series_parser
+        self._interval_hours = 0.0
+        self._inflight: Set[str] = set()
+        """넘겼는데 아직 결과가 오지 않은 시리즈. 두 번 넘기지 않는다."""
+        self._ready: Callable[[], bool] = lambda: True
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        series_parser.finished.connect(self._on_parsed)
+
+    def set_interval_hours(self, hours: float):
+        """확인 간격을 바꾼다. 0이면 멈춘다."""
+        self._interval_hours = max(0.0, float(hours or 0))
+        if self._interval_hours <= 0:
+            self._timer.stop()
+        elif not self._timer.isActive():
+            self._arm()
+
+    def set_ready_check(self, predicate: Callable[[], bool]):
+        """지금 확인해도 되는지 묻는 함수를 건다. 저장 폴더가 없으면 받을 곳이 없다."""
+        self._ready = predicate
+
+    def is_active(self) -> bool:
+        return self._interval_hours > 0
+
+    def start_now(self):
+        """곧바로 한 차례 돌고 이어서 간격대로 돈다. 켤 때 부른다."""
+        if self.is_active():
+            self._timer.start(0)
+
+    def _arm(self):
+        delay = TICK_SECONDS * random.uniform(1 - JITTER, 1 + JITTER)
+        self._timer.start(int(delay * 1000))
+
+    def _on_parsed(self, context: str, series_url: str, _title: str, _episodes: list):
+        if context == "fav-check":
+            self._inflight.discard(series_url)
+
+    def due_series(self, now: float) -> List[str]:
+        """간격보다 오래 확인하지 않은 시리즈. 가장 오래된 것부터."""
+        interval = self._interval_hours * 3600
+        stamps = []
+        for url, meta in self.fav_store.sorted_entries():
+            if url in self._inflight:
+                continue
+            try:
+                checked = datetime.strptime(meta.get("last_check") or "", TIME_FORMAT).timestamp()
+            except ValueError:
+                checked = 0.0
+            if now - checked >= interval:
+                stamps.append((checked, url))
+        return [url for _, url in sorted(stamps)]
+
+    def _share(self) -> int:
+        """한 차례에 넘길 수. 즐겨찾기 한 바퀴를 간격 안에 고르게 나눈 크기."""
+        total = len(self.fav_store.list_series())
+        ticks = max(1.0, self._interval_hours * 3600 / TICK_SECONDS)
+        return max(1, math.ceil(total / ticks))
+
+    def _tick(self):
+        """한 차례. 다운로드가 돌고 있거나 분석 대기열이 밀려 있으면 넘기지 않는다.
+
+        대기열이 밀려 있다는 것은 `갱신`이나 켤 때 확인이 전부를 이미 넣었다는
+        뜻이다. 거기에 더 얹으면 같은 시리즈를 두 번 보게 된다.
+        """
+        if not self.is_active():
+            return
+        self._arm()
+        if not self._ready() or connection_budget.shared().downloading():
+            return
+        if self.series_parser.pending_count():
+            return
+        urls = self.due_series(datetime.now().timestamp())[:self._share()]
+        if not urls:
+            return
+        self._inflight.update(urls)
+        self.due.emit(urls)
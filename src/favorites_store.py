@@ -1,9 +1,22 @@
+"""즐겨찾기 시리즈를 favorites.json에 남기는 곳.
+
+바뀔 때마다 파일 전체를 다시 쓰지 않고 변경 일지(store_journal)에 한 줄씩
+덧붙인다. 확인 하나가 끝날 때마다 last_check가 바뀌므로, 즐겨찾기가 많을수록
+통째로 쓰는 값이 컸다. favorites.json은 일지를 접을 때 쓴다. 백업(favoritbak/)을
+언제 뜰지는 snapshot_backups가 정한다.
+"""
+
 from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Tuple, Iterable, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Tuple, Iterable, List, Optional
+
+from src.snapshot_backups import SnapshotBackups, digest
+from src.store_journal import StoreJournal, write_json_atomic
 
 
 def _now_str() -> str:
@@ -11,21 +24,55 @@ def _now_str() -> str:
 
 
 class FavoritesStore:
-    def __init__(self, path: str):
+    DEFAULT_KEEP = 30
+
+    def __init__(self, path: str, keep_backups: int = DEFAULT_KEEP):
         self.path = path
         self._data: Dict[str, Dict[str, str]] = {}
+        self._journal = StoreJournal(path)
+        bak_dir = Path(os.path.dirname(os.path.abspath(path))) / "favoritbak"
+        self._backups = SnapshotBackups(bak_dir, "favorites", ".bak.json", keep_backups)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._loaded = False
+        """favorites.json을 제대로 읽었는지. 아니면 백업을 뜨지 않는다."""
+        self._writable = True
+        """favorites.json을 덮어써도 되는지. 읽지 못한 파일을 치우지 못했으면 False."""
 
     def load(self) -> None:
-        if not os.path.exists(self.path):
-            self._data = {}
-            return
+        """favorites.json을 읽고 일지를 다시 적용한다.
+
+        읽지 못하는 파일은 **빈 목록으로 덮기 전에 옆으로 치운다**
+        (`favorites.json.corrupt-시각`). 손으로 고치다 쉼표 하나를 빠뜨린 파일이
+        다음 접기에서 `{}`로 덮이면 되살릴 길이 없다. 그 실행 동안은 백업도 뜨지
+        않는다 — 비어 있는 목록이 keep_backups를 차례로 밀어내 멀쩡했던 백업을
+        지우게 된다. 치우지도 못했으면 favorites.json을 쓰지 않고 일지에만 남긴다.
+        """
+        raw: Any = {}
+        self._loaded = True
+        self._writable = True
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            except Exception:
+                raw = {}
+                self._loaded = False
+                self._writable = self._move_aside()
+        self._data = self._clean(raw)
+        for op in self._journal.read():
+            self._apply(op)
+
+    def _move_aside(self) -> bool:
+        """읽지 못한 favorites.json의 이름을 바꿔 둔다. 바꿨으면 True."""
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        except Exception:
-            self._data = {}
-            return
+            os.replace(self.path, f"{self.path}.corrupt-{ts}")
+        except OSError:
+            return False
+        return True
 
+    @staticmethod
+    def _clean(raw: Any) -> Dict[str, Dict[str, str]]:
         out: Dict[str, Dict[str, str]] = {}
         if isinstance(raw, dict):
             for url, meta in raw.items():
@@ -52,43 +99,75 @@ class FavoritesStore:
                             "last_check": item.get("last_check") or "",
                             "title": item.get("title", ""),
                         }
-        self._data = out
+        return out
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """일지 한 줄을 적용한다. 같은 줄을 두 번 적용해도 결과가 같다."""
+        url = op.get("url")
+        if not isinstance(url, str):
+            return
+        if op.get("op") == "remove":
+            self._data.pop(url, None)
+        elif op.get("op") == "put" and isinstance(op.get("meta"), dict):
+            self._data.update(self._clean({url: op["meta"]}))
+
+    def _record(self, op: Dict[str, Any]) -> None:
+        """변경 하나를 일지에 남긴다. 일지가 커졌으면 다른 스레드에서 접는다.
+
+        일지에 쓰지 못하면 그 자리에서 전체를 쓴다. 변경을 잃는 것보다 느린 편이 낫다.
+        """
+        if not self._journal.append([op]):
+            self.save()
+        elif self._journal.needs_compaction():
+            self._journal.compact(self._snapshot_writer())
+        if self._loaded and self._backups.changed():
+            data = {url: dict(meta) for url, meta in self._data.items()}
+            self._executor.submit(self._backup_sync, data)
+
+    def _put(self, url: str) -> None:
+        self._record({"op": "put", "url": url, "meta": dict(self._data[url])})
 
     def _ensure_parent(self) -> None:
         d = os.path.dirname(os.path.abspath(self.path))
         if d and not os.path.isdir(d):
             os.makedirs(d, exist_ok=True)
 
-    def _backup_existing(self) -> None:
-        if not os.path.exists(self.path):
-            return
-        base_dir = os.path.dirname(os.path.abspath(self.path))
-        bak_dir = os.path.join(base_dir, "favoritbak")
-        os.makedirs(bak_dir, exist_ok=True)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name = f"favorites_{ts}.bak.json"
-        try:
-            with open(self.path, "r", encoding="utf-8") as src, open(
-                os.path.join(bak_dir, name), "w", encoding="utf-8"
-            ) as dst:
-                dst.write(src.read())
-        except Exception:
-            pass
+    def _backup_sync(self, data: Dict[str, Dict[str, str]]) -> bool:
+        """복사해 둔 상태를 favoritbak/에 한 벌 뜬다. 마지막 백업과 같으면 건너뛴다.
+
+        같은지 볼 때 last_check는 뺀다. 확인 하나마다 바뀌는 값이라 넣으면 거의
+        모든 백업이 '다른 내용'이 되고, 잃어서 아까운 것은 어느 시리즈를 언제
+        담았는가이지 마지막으로 확인한 시각이 아니다.
+        """
+        if not self._loaded:
+            return False
+        kept = {url: {k: v for k, v in meta.items() if k != "last_check"}
+                for url, meta in data.items()}
+        content_digest = digest(json.dumps(kept, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+        def write(target) -> bool:
+            target.write_bytes(payload)
+            return True
+        return self._backups.take(content_digest, write) is not None
 
     def save(self) -> None:
-        self._ensure_parent()
-        self._backup_existing()
-        tmp = self.path + ".tmp"
-        try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, ensure_ascii=False, indent=2)
-            os.replace(tmp, self.path)
-        except Exception:
+        """지금 상태를 favorites.json에 통째로 쓰고 일지를 비운다."""
+        self._journal.compact_now(self._snapshot_writer())
+
+    def _snapshot_writer(self):
+        """지금 상태를 복사해 두고, 그것을 쓰는 함수를 돌려준다."""
+        data = {url: dict(meta) for url, meta in self._data.items()}
+
+        def write() -> bool:
+            if not self._writable:
+                return False
             try:
-                if os.path.exists(tmp):
-                    os.remove(tmp)
-            except Exception:
-                pass
+                self._ensure_parent()
+            except OSError:
+                return False
+            return write_json_atomic(self.path, data)
+        return write
 
     def add(self, series_url: str) -> None:
         u = (series_url or "").strip()
@@ -96,7 +175,7 @@ class FavoritesStore:
             return
         if u not in self._data:
             self._data[u] = {"added": _now_str(), "last_check": "", "title": ""}
-            self.save()
+            self._put(u)
 
     def remove(self, series_url: str) -> None:
         u = (series_url or "").strip()
@@ -104,7 +183,7 @@ class FavoritesStore:
             return
         if u in self._data:
             self._data.pop(u, None)
-            self.save()
+            self._record({"op": "remove", "url": u})
 
     def exists(self, series_url: str) -> bool:
         return (series_url or "").strip() in self._data
@@ -130,4 +209,4 @@ class FavoritesStore:
             self._data[u]["last_check"] = now
             if series_title and self._data[u].get("title") != series_title:
                 self._data[u]["title"] = series_title
-        self.save()
+        self._put(u)
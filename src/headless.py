@@ -0,0 +1,381 @@
+"""창 없이 돌리는 진입점(`TVerDownloader --headless`).
+
+화면이 없는 상자(집 서버·NAS 옆 PC)에 두고 즐겨찾기를 저절로 받거나, 다른
+스크립트가 주소를 밀어 넣는 데 쓴다. 받는 일 자체는 창과 똑같이
+DownloadManager·SeriesParser·각 저장소가 한다. 여기서 하는 것은 그 사이를
+잇는 일뿐이다 — 창에서는 MainWindow와 컨트롤러들이 하던 일이다.
+
+**QApplication이 아니라 QCoreApplication으로 뜬다.** 창·글꼴·테마·트레이를
+하나도 만들지 않아, 디스플레이가 없어도 뜨고 뜨는 데 드는 것도 그만큼 적다.
+
+**주고받는 것은 줄 단위 JSON이다.** 주소는 인자로 주거나 표준 입력으로 한 줄에
+하나씩 넣는다(`-`를 주면 표준 입력을 읽는다). 나가는 것은 한 줄에 한 사건이다.
+
+    {"event": "progress", "url": "...", "percent": 42, "speed": "2.1MiB/s", ...}
+    {"event": "finished", "url": "...", "ok": true, "path": "..."}
+
+사건 이름은 ready / added / skipped / progress / finished / queue / log /
+series / error / exit 이다. 제어 API(control_server)를 열어 두면 다른 프로그램이
+돌고 있는 이것에 주소를 더 넣을 수 있다. progress의 나머지 칸은 DownloadManager가
+progress_updated로 보내는 것을 그대로 옮긴다.
+
+창과 다른 판단이 셋 있다.
+
+- **이미 받은 주소는 묻지 않고 건너뛴다**(`--redownload`로 바꾼다). 물어볼
+  사람이 없고, 저절로 도는 즐겨찾기 확인이 같은 회차를 또 받으면 안 된다.
+- **시리즈는 찾은 회차를 모두 넣는다.** 고르는 창이 없다. 받은 기록에 있는
+  것은 위 규칙으로 빠진다.
+- **지난 실행의 대기열은 세워만 두고**, `--resume-queue`를 주어야 받는다. 창과
+  같은 queue.json을 쓰므로 세워 두지도 않고 저장하면 창이 남긴 것이 지워진다.
+
+창과 함께 뜨지 않는다. 같은 기록·대기열 파일을 나눠 쓰므로, 창이 떠 있으면
+알리고 끝난다. 떠 있는 동안에는 창이 새로 뜨지 못하게 같은 소켓을 잡아 둔다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from typing import Any, Dict, List, Optional, TextIO
+
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from src.control_server import ControlServer
+from src.download_manager import DownloadManager
+from src.favorites_store import FavoritesStore
+from src.history_store import HistoryStore
+from src.queue_store import QueueStore
+from src.series_parser import SeriesParser
+from src.task_queue import PRIORITY_FAVORITES, PRIORITY_USER
+from src.threads.setup_thread import SetupThread
+from src.utils import SOCKET_NAME, is_media_url, load_config
+
+HEADLESS_FLAG = "--headless"
+
+FALLBACK_OUTPUT = "headless.jsonl"
+"""표준 출력이 없을 때 사건을 적을 파일.
+
+창 없는 빌드(pyinstaller --windowed)로 띄우면 sys.stdout이 None이다. 그대로
+두면 사건이 모두 사라지고, 왜 아무것도 안 나오는지 알 길이 없다."""
+
+SIGNAL_POLL_MS = 500
+"""Ctrl+C를 살피는 간격.
+
+Qt 이벤트 루프가 도는 동안에는 파이썬 쪽 시그널 처리기가 불리지 않는다.
+주기적으로 파이썬에 제어를 돌려주어야 Ctrl+C가 들린다."""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=f"TVerDownloader {HEADLESS_FLAG}",
+        description="창 없이 받습니다. 진행 상황은 한 줄에 하나씩 JSON으로 나갑니다.")
+    parser.add_argument("urls", nargs="*",
+                        help="받을 회차·시리즈 주소. '-'를 주면 표준 입력에서 한 줄에 하나씩 읽습니다.")
+    parser.add_argument("--output-dir", default="",
+                        help="저장 폴더. 주지 않으면 설정의 다운로드 폴더를 씁니다(설정은 바꾸지 않습니다).")
+    parser.add_argument("--favorites", action="store_true",
+                        help="시작할 때 즐겨찾기 시리즈의 새 회차를 확인해 받습니다.")
+    parser.add_argument("--favorites-every", type=float, default=0, metavar="MINUTES",
+                        help="즐겨찾기 확인을 이 간격(분)으로 되풀이합니다. 주면 끝나지 않고 계속 돕니다.")
+    parser.add_argument("--resume-queue", action="store_true",
+                        help="지난 실행에서 남은 대기열도 받습니다.")
+    parser.add_argument("--redownload", action="store_true",
+                        help="이미 받은 기록이 있는 주소도 다시 받습니다.")
+    parser.add_argument("--ytdlp", default="", help="yt-dlp 실행 파일. 주면 자동 설치를 건너뜁니다(--ffmpeg와 함께).")
+    parser.add_argument("--ffmpeg", default="", help="ffmpeg 실행 파일.")
+    parser.add_argument("--api-port", type=int, default=None, metavar="PORT",
+                        help="127.0.0.1의 이 포트에서 제어 API를 엽니다. 주면 끝나지 않고 계속 돕니다. "
+                             "주지 않으면 설정의 control_api_port를 따릅니다.")
+    parser.add_argument("--output", default="-",
+                        help="사건을 적을 곳. 기본은 표준 출력입니다.")
+    return parser
+
+
+class HeadlessRunner(QObject):
+    """창 없이 받는 한 번의 실행. 창의 MainWindow가 하던 연결을 맡는다."""
+
+    stdin_line = pyqtSignal(str)
+    """표준 입력에서 읽은 한 줄. 읽는 스레드에서 UI 스레드로 넘기는 데 쓴다."""
+    stdin_closed = pyqtSignal()
+
+    def __init__(self, args: argparse.Namespace, out: TextIO, parent=None):
+        super().__init__(parent)
+        self.args = args
+        self._out = out
+        self._ready = False
+        self._pending_urls: List[str] = []
+        self._reading_stdin = "-" in args.urls
+        self.stopping = False
+
+        self.config = load_config()
+        if args.output_dir:
+            self.config["download_folder"] = os.path.abspath(args.output_dir)
+        self.history_store = HistoryStore(); self.history_store.load()
+        self.fav_store = FavoritesStore("favorites.json"); self.fav_store.load()
+        self.queue_store = QueueStore(); self.queue_store.load()
+        self.series_parser = SeriesParser(ytdlp_path="", config=self.config)
+        self.download_manager = DownloadManager(self.config, self.history_store, self.queue_store)
+
+        manager = self.download_manager
+        manager.log.connect(lambda text: self._emit("log", text=text))
+        manager.heading.connect(lambda title, body: self._emit("log", text=f"{title}: {body}"))
+        manager.item_added.connect(lambda url: self._emit("added", url=url))
+        manager.progress_updated.connect(self._on_progress)
+        manager.progress_batch.connect(
+            lambda batch: [self._on_progress(url, payload) for url, payload in batch.items()])
+        manager.task_finished.connect(self._on_task_finished)
+        manager.queue_changed.connect(
+            lambda queued, active, converting: self._emit(
+                "queue", queued=queued, active=active, converting=converting))
+        manager.all_tasks_completed.connect(self._schedule_quit_check)
+        self.series_parser.log.connect(lambda _ctx, text: self._emit("log", text=text))
+        self.series_parser.finished.connect(self._on_series_parsed)
+        self.stdin_line.connect(self.submit)
+        self.stdin_closed.connect(self._on_stdin_closed)
+
+        self.control_server = ControlServer(manager, self.history_store, self)
+
+        self._fav_timer = QTimer(self)
+        self._fav_timer.timeout.connect(self.check_favorites)
+
+    # --- 내보내기 ---
+
+    def _emit(self, event: str, **fields: Any):
+        """사건 하나를 한 줄로 적는다. 못 적어도 받는 일은 멈추지 않는다.
+
+        읽는 쪽이 파이프를 먼저 닫으면(`| head`) 쓰기가 실패한다. 그렇다고 받던
+        것까지 끊으면 앞의 명령이 끝난 것과 상관없이 파일이 반쯤 남는다.
+        """
+        record: Dict[str, Any] = {"event": event}
+        record.update(fields)
+        try:
+            self._out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self._out.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _on_progress(self, url: str, payload: Dict[str, Any]):
+        self._emit("progress", **{**payload, "url": url})
+
+    def _on_task_finished(self, url: str, success: bool, final_filepath: str, meta: dict):
+        """끝난 것을 알리고, 받았으면 기록에 남긴다. 창의 _on_task_finished와 같다."""
+        self._emit("finished", url=url, ok=success, path=final_filepath,
+                   title=meta.get("title", ""))
+        if success and final_filepath:
+            self.history_store.add(url, meta.get("title", ""), final_filepath,
+                                   series_id=meta.get("series_id"),
+                                   thumbnail_url=meta.get("thumbnail"))
+            self.history_store.save()
+
+    # --- 시작 ---
+
+    def start(self):
+        """yt-dlp·ffmpeg를 준비한다. 경로를 받았으면 설치를 건너뛴다."""
+        folder = self.config.get("download_folder", "")
+        if not folder or not os.path.isdir(folder):
+            self._emit("error", message="다운로드 폴더가 없습니다. --output-dir로 지정하세요.",
+                       folder=folder)
+            QCoreApplication.exit(2)
+            return
+        port = self.args.api_port if self.args.api_port is not None else self.config.get("control_api_port", 0)
+        if port and not self.control_server.listen(port):
+            self._emit("error", message=f"제어 API를 {port}번 포트에서 열지 못했습니다.",
+                       detail=self.control_server.error_text())
+            QCoreApplication.exit(2)
+            return
+        if self._reading_stdin:
+            threading.Thread(target=self._read_stdin, name="headless-stdin", daemon=True).start()
+        if self.args.ytdlp and self.args.ffmpeg:
+            self._on_setup_finished(True, self.args.ytdlp, self.args.ffmpeg)
+            return
+        self._setup_thread = SetupThread(self)
+        self._setup_thread.log.connect(lambda text: self._emit("log", text=text))
+        self._setup_thread.finished.connect(self._on_setup_finished)
+        self._setup_thread.start()
+
+    def _on_setup_finished(self, ok: bool, ytdlp_path: str, ffmpeg_path: str):
+        if not ok:
+            self._emit("error", message="yt-dlp/ffmpeg를 준비하지 못했습니다.")
+            QCoreApplication.exit(1)
+            return
+        self.download_manager.set_paths(ytdlp_path, ffmpeg_path)
+        self.series_parser.set_ytdlp_path(ytdlp_path)
+        self._ready = True
+        restored, _swept = self.download_manager.restore_saved_queue()
+        if restored and self.args.resume_queue:
+            self.download_manager.start_held_tasks()
+        self._emit("ready", ytdlp=ytdlp_path, ffmpeg=ffmpeg_path,
+                   restored=restored, folder=self.config.get("download_folder", ""))
+        for url in [u for u in self.args.urls if u != "-"] + self._pending_urls:
+            self.submit(url)
+        self._pending_urls.clear()
+        if self.args.favorites or self.args.favorites_every > 0:
+            self.check_favorites()
+        if self.args.favorites_every > 0:
+            self._fav_timer.start(int(self.args.favorites_every * 60_000))
+        self._schedule_quit_check()
+
+    def _read_stdin(self):
+        """표준 입력을 한 줄씩 읽어 넘긴다. 별도 스레드에서 돈다.
+
+        Qt에는 윈도우의 표준 입력을 이벤트 루프에 거는 방법이 없다. 시그널로
+        넘기면 받는 쪽은 UI 스레드에서 불린다.
+        """
+        try:
+            for line in sys.stdin:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    self.stdin_line.emit(line)
+        except (OSError, ValueError):
+            pass
+        self.stdin_closed.emit()
+
+    # --- 넣기 ---
+
+    def submit(self, url: str):
+        """주소 하나를 받는다. 시리즈면 분석에 넘기고, 회차면 대기열에 넣는다."""
+        url = (url or "").strip()
+        if not url:
+            return
+        if not self._ready:
+            self._pending_urls.append(url)
+            return
+        if not is_media_url(url):
+            self._emit("skipped", url=url, reason="not-a-url")
+            return
+        if "/series/" in url:
+            self._emit("series", url=url, status="parsing")
+            self.series_parser.parse("bulk", [url])
+            return
+        self._add(url)
+
+    def _add(self, url: str, title: str = "", thumbnail: str = "",
+             priority: int = PRIORITY_USER) -> bool:
+        """대기열에 넣는다. 이미 받은 것은 --redownload가 없으면 건너뛴다."""
+        if self.history_store.exists(url) and not self.args.redownload:
+            self._emit("skipped", url=url, reason="history",
+                       title=self.history_store.get_title(url))
+            return False
+        return self.download_manager.add_task(url, title=title, thumbnail=thumbnail,
+                                              priority=priority)
+
+    def check_favorites(self):
+        urls = self.fav_store.list_series()
+        if not urls:
+            self._emit("log", text="[즐겨찾기] 등록된 즐겨찾기가 없습니다.")
+            return
+        self._emit("log", text=f"[즐겨찾기] 전체 확인 시작 ({len(urls)}개 시리즈)")
+        self.series_parser.parse("fav-check", urls)
+
+    def _on_series_parsed(self, context: str, series_url: str, series_title: str,
+                          episode_info: List[Dict[str, str]]):
+        """찾은 회차를 모두 넣는다. 즐겨찾기 확인이면 확인 시각도 적는다."""
+        if context == "fav-check":
+            self.fav_store.touch_last_check(series_url, series_title)
+        priority = PRIORITY_FAVORITES if context == "fav-check" else PRIORITY_USER
+        added = sum(1 for ep in episode_info if ep.get("url")
+                    and self._add(ep["url"], title=ep.get("title", ""),
+                                  thumbnail=ep.get("thumbnail_url", ""), priority=priority))
+        self._emit("series", url=series_url, status="parsed", title=series_title,
+                   episodes=len(episode_info), added=added)
+        self._schedule_quit_check()
+
+    # --- 끝내기 ---
+
+    def _on_stdin_closed(self):
+        self._reading_stdin = False
+        self._schedule_quit_check()
+
+    def _schedule_quit_check(self):
+        """다음 이벤트 루프 차례에 끝낼지 본다.
+
+        바로 보지 않는 것은, all_tasks_completed가 끝난 항목의 뒷정리보다 먼저
+        올 수 있어서다. 그 자리에서 끝내면 마지막 항목의 기록이 저장되기 전에
+        프로세스가 빠진다.
+        """
+        QTimer.singleShot(0, self._maybe_quit)
+
+    def _idle(self) -> bool:
+        """남은 일이 없다. 세워만 둔 대기열(--resume-queue 없이 되살린 것)은 세지 않는다."""
+        return (not self.download_manager.pending_count()
+                and not self.series_parser.pending_count()
+                and not self.series_parser.is_busy())
+
+    def _maybe_quit(self):
+        """할 일이 더 올 수 없고 남은 일도 없으면 끝낸다."""
+        if not self._ready or self.stopping:
+            return
+        if self._reading_stdin or self._fav_timer.isActive() or self.control_server.is_listening():
+            return
+        if self._idle():
+            QCoreApplication.exit(0)
+
+    def emit_exit(self, code: int):
+        """마지막 줄. 이 뒤로는 아무것도 나가지 않는다."""
+        self._emit("exit", code=code)
+
+    def shutdown(self):
+        """Ctrl+C·종료 신호. 받던 것을 멈추고 대기열을 남긴다."""
+        if self.stopping:
+            return
+        self.stopping = True
+        self._fav_timer.stop()
+        stopped = self.download_manager.stop_all()
+        if stopped:
+            self._emit("log", text=f"[대기열] 진행 중이던 작업 {stopped}개를 중지했습니다.")
+        QCoreApplication.exit(130)
+
+
+def _open_output(target: str) -> TextIO:
+    if target and target != "-":
+        return open(target, "a", encoding="utf-8")
+    if sys.stdout is None:
+        return open(FALLBACK_OUTPUT, "a", encoding="utf-8")
+    try:
+        sys.stdout.reconfigure(encoding="utf-8")
+    except (AttributeError, ValueError):
+        pass
+    return sys.stdout
+
+
+def _another_instance_running() -> bool:
+    socket = QLocalSocket()
+    socket.connectToServer(SOCKET_NAME)
+    running = socket.waitForConnected(500)
+    socket.close()
+    return running
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = _open_output(args.output)
+    app = QCoreApplication(sys.argv[:1])
+    if _another_instance_running():
+        out.write(json.dumps({"event": "error", "message": "이미 실행 중인 TVer Downloader가 있습니다."},
+                             ensure_ascii=False) + "\n")
+        out.flush()
+        return 3
+    QLocalServer.removeServer(SOCKET_NAME)
+    server = QLocalServer()
+    server.listen(SOCKET_NAME)
+    server.newConnection.connect(lambda: server.nextPendingConnection().close())
+
+    runner = HeadlessRunner(args, out)
+    signal.signal(signal.SIGINT, lambda *_: runner.shutdown())
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda *_: runner.shutdown())
+    poll = QTimer()
+    poll.timeout.connect(lambda: None)
+    poll.start(SIGNAL_POLL_MS)
+    QTimer.singleShot(0, runner.start)
+    code = app.exec()
+    if not runner.stopping:
+        runner.download_manager.stop_all()
+    runner.emit_exit(code)
+    server.close()
+    return code
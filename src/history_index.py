@@ -0,0 +1,329 @@
+"""기록 탭 검색을 위한 메모리 색인. 글자를 칠 때마다 기록 전체를 훑지 않는다.
+
+기록 탭은 검색창에 글자를 칠 때마다 기록 전체를 날짜순으로 다시 정렬하고,
+모든 제목과 주소를 소문자로 바꿔 하나하나 포함 여부를 보고, 제목순이면 한 번 더
+정렬했다. 기록이 수만 건이면 한 글자마다 그만큼을 한다.
+
+여기서는 **제목을 두 글자씩(bigram) 잘라 글자 쌍 → 항목 색인을 둔다.** 일본어·
+한국어 제목은 띄어쓰기로 낱말이 갈리지 않아 낱말 색인이 듣지 않는다. 검색어의
+글자 쌍을 가진 항목만 후보로 남기고, 후보에만 실제로 포함되는지 확인한다.
+한 글자 검색어는 글자 쌍이 없어 제목을 훑는다.
+
+글자 쌍은 그대로 열쇠로 쓰지 않고 GRAM_BUCKETS개의 칸으로 해시해 모은다. 한자·
+한글 제목은 글자 쌍의 가짓수가 항목 수만큼 많아, 쌍마다 집합을 두면 거의 한두 개짜리
+집합이 수십만 개 생기고 그 부피가 색인의 대부분이 된다. 칸이 겹쳐 섞여 든 후보는
+어차피 하는 포함 확인에서 떨어진다.
+
+**주소는 영숫자 토막(token)으로 찾는다.** `https`·`tver`·`episodes`·`ep1a2b3c`
+처럼 자른 토막의 앞부분이 검색어의 토막과 맞으면 걸린다. 주소를 통째로 붙여 넣거나
+회차 ID의 앞부분을 치는 쓰임새는 그대로다. 주소 한가운데를 글자 단위로 찾는 것만
+빠졌다 — 주소의 글자 쌍은 거의 모든 항목이 같이 가져 색인이 부풀 뿐 걸러 내지 못한다.
+
+**정렬은 미리 해 둔다.** 날짜순과 제목순 목록을 늘 정렬된 채로 들고, 더하고 뺄
+때 그 자리에만 끼우고 뺀다(bisect). 검색 결과가 많으면 이 목록을 앞에서부터 걸으며
+결과에 든 것만 고르고, 적으면 결과만 정렬한다.
+
+HistoryStore가 켤 때 한 번 채우고 add·remove에서 함께 고친다. 색인을 만드는 일
+말고는 UI 스레드에서만 쓴다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from itertools import compress, islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ORDER_DATE = "date"
+"""최근에 받은 것부터."""
+ORDER_TITLE = "title"
+"""제목 가나다(오름차)순."""
+
+WALK_RATIO = 8
+"""결과가 전체의 1/WALK_RATIO를 넘으면 결과를 정렬하지 않고 미리 정렬해 둔 목록을
+걷는다. 많이 걸리는 검색일수록 걸으며 고르는 편이 싸다."""
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+GRAM_BUCKETS = 1 << 16
+"""글자 쌍을 모으는 칸 수. 늘리면 섞여 드는 후보가 줄고 칸마다 드는 부피가 는다."""
+
+
+def _bigrams(text: str) -> Set[int]:
+    """글자 쌍의 칸 번호. 해시는 실행마다 달라도 색인이 메모리에만 있어 상관없다."""
+    mask = GRAM_BUCKETS - 1
+    return {hash(text[i:i + 2]) & mask for i in range(len(text) - 1)}
+
+
+def _tokens(url: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(url.lower()))
+
+
+class HistoryIndex:
+    """주소 → 기록 항목에 글자 쌍·주소 토막 색인과 두 정렬 순서를 얹은 것.
+
+    글자 쌍·토막 색인은 warm()이 다른 스레드에서 만든다. 수만 건이면 1초 남짓
+    걸리는 일이라 켜는 것을 그만큼 늦출 수 없고, 처음 검색하는 글자에서 멈칫하게
+    둘 수도 없다. 다 만들기 전에 검색하면 그때 기다린다. 다 만든 뒤로는 put·remove가
+    함께 고친다.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._docs: Dict[int, Tuple[str, dict]] = {}
+        self._titles: Dict[int, str] = {}
+        """항목 번호 → 소문자 제목. 후보의 제목을 직접 볼 때 쓴다."""
+        self._next_id = 0
+        self._indexed = False
+        self._warming: Optional[threading.Thread] = None
+        self._built: Optional[tuple] = None
+        self._changed: List[Tuple[int, Optional[str], Optional[str]]] = []
+        """만드는 동안 바뀐 것. (항목 번호, 뺀 것이면 그 제목, 뺀 것이면 그 주소)."""
+        self._grams: Dict[int, Set[int]] = {}
+        """글자 쌍의 칸 번호 → 그 칸의 쌍을 제목에 가진 항목."""
+        self._url_tokens: Dict[str, Set[int]] = {}
+        self._token_list: List[str] = []
+        """_url_tokens의 열쇠를 정렬해 둔 것. 앞부분이 같은 토막을 bisect로 찾는다."""
+        self._by_date: List[Tuple[str, int]] = []
+        self._by_title: List[Tuple[str, str, int]] = []
+        self._ranks: Dict[str, Dict[int, int]] = {}
+        """정렬 순서 → 항목 번호의 자리. 결과만 정렬할 때 열쇠로 쓴다. 바뀌면 버린다."""
+        self._listings: Dict[str, Tuple[List[int], List[Tuple[str, dict]]]] = {}
+        """정렬 순서 → 그 차례대로 늘어놓은 항목 번호와 (주소, 항목). 기록 탭은 개수
+        제한 없이 전부를 받아 가므로, 많이 걸리는 검색마다 정렬 목록을 걸으며 항목을
+        찾아 담는 대신 이것을 한 번 만들어 두고 걸러 쓴다. 바뀌면 버린다."""
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def rebuild(self, entries: Iterable[Tuple[str, dict]]):
+        """비우고 한꺼번에 채운다. 정렬은 끝에 한 번만 한다."""
+        if self._warming is not None:
+            self._warming.join()
+        self.__init__()
+        for url, meta in entries:
+            self._insert(url, meta, keep_sorted=False)
+        self._by_date.sort()
+        self._by_title.sort()
+
+    def put(self, url: str, meta: dict):
+        """더하거나, 이미 있으면 갈아 끼운다."""
+        self.remove(url)
+        doc = self._insert(url, meta, keep_sorted=True)
+        self._ranks.clear()
+        self._listings.clear()
+        if self._indexed:
+            self._index_doc(doc, self._titles[doc], url)
+        elif self._warming is not None:
+            self._changed.append((doc, None, None))
+
+    def remove(self, url: str):
+        doc = self._ids.pop(url, None)
+        if doc is None:
+            return
+        url, meta = self._docs.pop(doc)
+        title = self._titles.pop(doc)
+        if self._indexed:
+            self._unindex_doc(doc, title, url)
+        elif self._warming is not None:
+            self._changed.append((doc, title, url))
+        self._remove_sorted(self._by_date, self._date_key(meta, doc))
+        self._remove_sorted(self._by_title, self._title_key(meta, doc))
+        self._ranks.clear()
+        self._listings.clear()
+
+    def get(self, url: str) -> Optional[dict]:
+        doc = self._ids.get(url)
+        return self._docs[doc][1] if doc is not None else None
+
+    def _insert(self, url: str, meta: dict, keep_sorted: bool) -> int:
+        doc = self._next_id
+        self._next_id += 1
+        self._ids[url] = doc
+        self._docs[doc] = (url, meta)
+        self._titles[doc] = (meta.get("title") or "").lower()
+        date_key, title_key = self._date_key(meta, doc), self._title_key(meta, doc)
+        if keep_sorted:
+            bisect.insort(self._by_date, date_key)
+            bisect.insort(self._by_title, title_key)
+        else:
+            self._by_date.append(date_key)
+            self._by_title.append(title_key)
+        return doc
+
+    def warm(self):
+        """글자 쌍·토막 색인을 다른 스레드에서 만들기 시작한다. 이미 했으면 그냥 둔다.
+
+        지금 가진 제목·주소를 복사해 넘긴다. 그동안 바뀌는 것은 _changed에 모았다가
+        다 만든 색인을 받을 때 얹는다.
+        """
+        if self._indexed or self._warming is not None:
+            return
+        titles = dict(self._titles)
+        urls = {doc: url for doc, (url, _) in self._docs.items()}
+        self._changed = []
+        self._warming = threading.Thread(target=self._build, args=(titles, urls),
+                                         name="history-index", daemon=True)
+        self._warming.start()
+
+    def _build(self, titles: Dict[int, str], urls: Dict[int, str]):
+        """칸마다 목록에 모았다가 집합으로 바꾼다.
+
+        항목마다 _index_doc을 부르는 것과 결과는 같다. 수만 건을 처음 만들 때는
+        칸 번호로 목록을 바로 집는 편이 사전을 찾아 집합에 넣는 것보다 빠르다.
+        """
+        buckets: List[List[int]] = [[] for _ in range(GRAM_BUCKETS)]
+        for doc, title in titles.items():
+            for gram in _bigrams(title):
+                buckets[gram].append(doc)
+        grams = {gram: set(docs) for gram, docs in enumerate(buckets) if docs}
+        tokens: Dict[str, List[int]] = {}
+        for doc, url in urls.items():
+            for token in _tokens(url):
+                tokens.setdefault(token, []).append(doc)
+        url_tokens = {token: set(docs) for token, docs in tokens.items()}
+        self._built = (grams, url_tokens, sorted(url_tokens))
+
+    def _ensure_indexed(self):
+        """만든 색인을 받는다. 아직 만드는 중이면 기다리고, 시작도 안 했으면 시작한다."""
+        if self._indexed:
+            return
+        self.warm()
+        self._warming.join()
+        self._grams, self._url_tokens, self._token_list = self._built
+        self._built = None
+        self._warming = None
+        self._indexed = True
+        for doc, title, url in self._changed:
+            if title is not None:
+                self._unindex_doc(doc, title, url)
+            elif doc in self._docs:
+                self._index_doc(doc, self._titles[doc], self._docs[doc][0])
+        self._changed = []
+
+    def _index_doc(self, doc: int, title: str, url: str):
+        grams = self._grams
+        for gram in _bigrams(title):
+            docs = grams.get(gram)
+            if docs is None:
+                docs = grams[gram] = set()
+            docs.add(doc)
+        for token in _tokens(url):
+            docs = self._url_tokens.get(token)
+            if docs is None:
+                docs = self._url_tokens[token] = set()
+                bisect.insort(self._token_list, token)
+            docs.add(doc)
+
+    def _unindex_doc(self, doc: int, title: str, url: str):
+        for gram in _bigrams(title):
+            self._discard(self._grams, gram, doc)
+        for token in _tokens(url):
+            if self._discard(self._url_tokens, token, doc):
+                del self._token_list[bisect.bisect_left(self._token_list, token)]
+
+    @staticmethod
+    def _date_key(meta: dict, doc: int) -> Tuple[str, int]:
+        return (meta.get("date") or "", doc)
+
+    @staticmethod
+    def _title_key(meta: dict, doc: int) -> Tuple[str, str, int]:
+        return (meta.get("title") or "", meta.get("date") or "", doc)
+
+    @staticmethod
+    def _discard(postings: dict, key, doc: int) -> bool:
+        """postings[key]에서 doc을 뺀다. 그래서 비었으면 열쇠째 지우고 True."""
+        docs = postings.get(key)
+        if docs is None:
+            return False
+        docs.discard(doc)
+        if docs:
+            return False
+        del postings[key]
+        return True
+
+    @staticmethod
+    def _remove_sorted(keys: list, key) -> None:
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    # --- 찾기 ---
+
+    def _title_matches(self, term: str) -> Set[int]:
+        """제목에 term이 든 항목.
+
+        가장 짧은 두 목록만 맞대고 나머지는 제목을 직접 본다. 칸이 겹쳐 섞여 든
+        것을 걸러야 하므로 확인은 어차피 하고, 흔한 쌍의 긴 목록을 끝까지 맞대는
+        것보다 남은 후보의 제목을 보는 편이 싸다.
+        """
+        titles = self._titles
+        if len(term) < 2:
+            return {doc for doc, title in titles.items() if term in title}
+        postings = sorted((self._grams.get(gram, set()) for gram in _bigrams(term)), key=len)
+        found = postings[0].intersection(*postings[1:2])
+        return {doc for doc in found if term in titles[doc]}
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        """prefix로 시작하는 주소 토막을 가진 항목. 토막은 [0-9a-z]라 `{`가 끝을 막는다."""
+        tokens = self._token_list
+        start = bisect.bisect_left(tokens, prefix)
+        end = bisect.bisect_left(tokens, prefix + "{", start)
+        return set().union(*map(self._url_tokens.__getitem__, tokens[start:end]))
+
+    def _url_matches(self, term: str) -> Set[int]:
+        """검색어의 영숫자 토막마다, 그것으로 시작하는 주소 토막을 가진 항목."""
+        pieces = sorted(set(_TOKEN_RE.findall(term)), key=len, reverse=True)
+        if not pieces:
+            return set()
+        found = self._prefix_docs(pieces[0])
+        for piece in pieces[1:]:
+            if not found:
+                break
+            if len(found) * WALK_RATIO < len(self._docs):
+                # 남은 후보가 적으면 후보의 주소를 직접 본다. `tver`·`episodes`처럼
+                # 거의 모든 항목이 가진 토막의 목록을 모으는 것보다 싸다.
+                found = {doc for doc in found
+                         if any(token.startswith(piece) for token in _tokens(self._docs[doc][0]))}
+            else:
+                found &= self._prefix_docs(piece)
+        return found
+
+    def search(self, term: str, order: str = ORDER_DATE,
+               limit: Optional[int] = None) -> Tuple[int, List[Tuple[str, dict]]]:
+        """(걸린 수, 앞에서부터 limit개의 (주소, 기록 항목)). 대소문자는 가리지 않는다.
+
+        빈 검색어는 전부다. limit이 없으면 걸린 것을 모두 돌려준다.
+        """
+        keys = self._by_title if order == ORDER_TITLE else self._by_date
+        walk = keys if order == ORDER_TITLE else reversed(keys)
+        term = term.lower()
+        if not term:
+            docs = None
+            total = len(keys)
+        else:
+            self._ensure_indexed()
+            docs = self._title_matches(term) | self._url_matches(term)
+            total = len(docs)
+        count = total if limit is None else min(limit, total)
+        if docs is None or total * WALK_RATIO > len(keys):
+            order_docs, rows = self._listing(order, walk)
+            if docs is None or total == len(rows):
+                return total, rows[:count]
+            chosen = compress(rows, map(docs.__contains__, order_docs))
+            return total, list(islice(chosen, count))
+        rank = self._ranks.get(order)
+        if rank is None:
+            rank = self._ranks[order] = {key[-1]: i for i, key in enumerate(walk)}
+        picked = sorted(docs, key=rank.__getitem__)[:count]
+        return total, [self._docs[doc] for doc in picked]
+
+    def _listing(self, order: str, walk) -> Tuple[List[int], List[Tuple[str, dict]]]:
+        """이 정렬 순서의 (항목 번호 목록, (주소, 항목) 목록). 바뀌기 전까지 다시 쓴다."""
+        listing = self._listings.get(order)
+        if listing is None:
+            order_docs = [key[-1] for key in walk]
+            listing = self._listings[order] = (order_docs, [self._docs[doc] for doc in order_docs])
+        return listing
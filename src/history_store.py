@@ -1,101 +1,270 @@
+"""받은 기록을 SQLite 파일(urlhistory.db) 하나에 남기는 곳.
+
+예전에는 기록 전체가 JSON 사전 하나(urlhistory.json)였다. **하나를 받을 때마다
+전부를 다시 썼다** — indent를 넣어 직렬화하고, 그전에 옛 파일을 historybak/에
+통째로 복사한 뒤에. 몇 년 쓰면 기록이 수만 건이 되고, 그러면 받기가 하나 끝날
+때마다 몇 MB를 두 번 쓴다. 켤 때도 그만큼을 읽어 사전으로 만들어야 했다.
+
+여기서는 **바뀐 한 줄만 쓴다.** add는 한 줄 upsert, remove는 한 줄 delete이고,
+각각 트랜잭션 하나로 끝나 도중에 앱이 죽어도 반쯤 쓰인 기록이 남지 않는다.
+exists·get_title은 주소(기본 키) 색인으로 찾고, sorted_entries는 날짜 색인을 따라
+읽는다. series_id에도 색인을 두어 시리즈 단위로 묻는 일이 생겨도 훑지 않는다.
+
+**바깥에서 보는 모양은 예전 그대로다.** 부르는 쪽(TVerDownloader·headless·
+library·control_server)은 고치지 않는다. save()는 쓰기가 add·remove에서 이미
+끝나므로 백업(snapshot_backups)만 맡는다.
+
+**처음 열 때 urlhistory.json을 옮겨 담는다.** 사전 모양과 더 예전의 목록 모양을
+모두 읽는다. 다 옮기면 원본은 urlhistory.migrated.json으로 이름을 바꿔 남긴다 —
+지우지 않는 것은 옮기다 놓친 것이 있을 때 되찾을 곳이 있어야 해서이고, 이름을
+바꾸는 것은 다음 실행에 두 번 옮기지 않으려는 것이다.
+
+WAL을 쓰지 않는다. 쓰기가 받기 하나에 한 번이라 빨라질 것이 없고, WAL이면 .db
+옆에 -wal 파일이 붙어 'urlhistory.db 하나만 복사해 두면 된다'는 안내가 틀려진다.
+"""
+
 from __future__ import annotations
+
+import hashlib
 import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Tuple
+
+from src.history_index import ORDER_DATE, HistoryIndex
+from src.snapshot_backups import SnapshotBackups
+
+SCHEMA_VERSION = 1
+"""PRAGMA user_version에 적는 판. 칸을 더하는 날 옮겨 담는 길을 가를 때 본다."""
+
+LEGACY_JSON = "urlhistory.json"
+MIGRATED_SUFFIX = ".migrated.json"
+NO_TITLE = "(제목 없음)"
+
+_COLUMNS = ("title", "date", "filepath", "series_id", "thumbnail_url")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    url           TEXT PRIMARY KEY,
+    title         TEXT NOT NULL DEFAULT '',
+    date          TEXT NOT NULL DEFAULT '',
+    filepath      TEXT NOT NULL DEFAULT '',
+    series_id     TEXT,
+    thumbnail_url TEXT
+);
+CREATE INDEX IF NOT EXISTS history_date ON history(date);
+CREATE INDEX IF NOT EXISTS history_series ON history(series_id);
+"""
+
+_UPSERT = """
+INSERT INTO history (url, title, date, filepath, series_id, thumbnail_url)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    title = excluded.title, date = excluded.date, filepath = excluded.filepath,
+    series_id = excluded.series_id, thumbnail_url = excluded.thumbnail_url
+"""
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _optional(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
+
+
+def _legacy_rows(raw: Any) -> Iterable[Tuple[str, str, str, str, Optional[str], Optional[str]]]:
+    """urlhistory.json의 두 모양(주소→항목 사전, 항목 목록)을 줄로 바꾼다."""
+    if isinstance(raw, dict):
+        items = ((url, meta) for url, meta in raw.items())
+    elif isinstance(raw, list):
+        items = ((item.get("url"), item) for item in raw if isinstance(item, dict))
+    else:
+        return
+    for url, meta in items:
+        url = _text(url).strip()
+        if not url:
+            continue
+        meta = meta if isinstance(meta, dict) else {}
+        yield (url, _text(meta.get("title")) or NO_TITLE, _text(meta.get("date")),
+               _text(meta.get("filepath")), _optional(meta.get("series_id")),
+               _optional(meta.get("thumbnail_url")))
+
 
 class HistoryStore:
+    DEFAULT_PATH = "urlhistory.db"
     DEFAULT_BAK_DIR = Path("historybak")
     DEFAULT_KEEP = 30
 
-    def __init__(self, path: str = "urlhistory.json",
+    def __init__(self, path: str = DEFAULT_PATH,
                  backup_dir: Optional[Path] = None,
-                 keep_backups: int = DEFAULT_KEEP):
+                 keep_backups: int = DEFAULT_KEEP,
+                 legacy_path: Optional[str] = None):
         self.path = path
-        self._data: Dict[str, dict] = {}
+        self.legacy_path = legacy_path or str(Path(path).with_name(LEGACY_JSON))
         self.backup_dir: Path = backup_dir or self.DEFAULT_BAK_DIR
         self.keep_backups: int = max(0, int(keep_backups))
+        self._backups = SnapshotBackups(self.backup_dir, "urlhistory", ".bak.db", self.keep_backups)
+        self._lock = threading.Lock()
+        """UI 스레드와 백업 스레드가 한 연결을 함께 쓴다. sqlite3 연결은 동시에 못 쓴다."""
+        self._conn: Optional[sqlite3.Connection] = None
+        self._index = HistoryIndex()
+        """기록 탭 검색용 메모리 색인. 켤 때 한 번 채우고 add·remove가 함께 고친다."""
         self._executor = ThreadPoolExecutor(max_workers=1)
+        self._loaded = False
+        """파일을 제대로 열었는지. 아니면 백업을 뜨지 않는다(save 참고)."""
 
     def load(self) -> bool:
-        p = Path(self.path)
-        if not p.exists():
-            self._data = {}
-            return True
+        """파일을 연다. 열지 못하면 메모리에만 두고 실패를 알린다.
+
+        메모리에라도 여는 것은 기록 파일이 깨졌다고 받기까지 막을 수는 없어서다.
+        그 실행 동안 받은 기록은 남지 않고, **백업도 뜨지 않는다** — 메모리의 몇
+        줄짜리 기록이 keep_backups를 차례로 밀어내 깨지기 전의 백업을 지우게 된다.
+        """
         try:
-            obj = json.loads(p.read_text(encoding="utf-8"))
-            if isinstance(obj, dict):
-                self._data = obj
-            elif isinstance(obj, list):
-                self._data = {
-                    item.get("url"): {
-                        "title": item.get("title", ""), "date": item.get("date", ""),
-                        "filepath": item.get("filepath", ""), "series_id": item.get("series_id"),
-                        "thumbnail_url": item.get("thumbnail_url")
-                    } for item in obj if isinstance(item, dict) and item.get("url")
-                }
-            else: self._data = {}
-            return True
-        except (json.JSONDecodeError, IOError):
-            self._data = {}; return False
+            conn = self._open(self.path)
+            self._migrate_legacy(conn)
+            ok = True
+        except (sqlite3.Error, OSError):
+            conn = self._open(":memory:")
+            ok = False
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = conn
+            self._loaded = ok
+        self._index.rebuild(self.sorted_entries())
+        self._index.warm()
+        return ok
 
-    def save(self) -> None:
-        """비동기로 저장을 수행하여 UI 블로킹을 방지합니다."""
-        data_snapshot = self._data.copy()
-        self._executor.submit(self._save_sync, data_snapshot)
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        return conn
+
+    def _migrate_legacy(self, conn: sqlite3.Connection) -> None:
+        """urlhistory.json이 남아 있으면 옮겨 담고 이름을 바꾼다.
 
-    def _save_sync(self, data: Dict[str, dict]) -> bool:
-        """실제 디스크 쓰기 작업 (백그라운드에서 실행됨)"""
+        이미 들어 있는 줄은 덮지 않는다(INSERT OR IGNORE). 옮긴 뒤 이름을 바꾸지
+        못한 채 앱이 꺼졌다가 다시 켜졌을 때, 그 사이 새로 받은 기록을 옛 것으로
+        되돌리지 않으려는 것이다. 읽지 못하는 JSON은 건드리지 않고 그대로 둔다.
+        """
+        legacy = Path(self.legacy_path)
+        if not legacy.exists():
+            return
         try:
-            target = Path(self.path)
-            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            raw = json.loads(legacy.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO history (url, title, date, filepath, series_id, thumbnail_url)"
+                " VALUES (?, ?, ?, ?, ?, ?)", _legacy_rows(raw))
+        try:
+            legacy.replace(legacy.with_name(legacy.stem + MIGRATED_SUFFIX))
+        except OSError:
+            pass
+
+    def _db(self) -> sqlite3.Connection:
+        """열린 연결. load()를 부르지 않고 쓰면 여기서 연다. 잠그기 전에 부른다."""
+        if self._conn is None:
+            self.load()
+        return self._conn
 
-            if target.exists():
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                bak_path = self.backup_dir / f"urlhistory_{ts}.bak.json"
+    def save(self) -> None:
+        """변경을 하나 센다. 백업을 뜰 때가 되었으면 다른 스레드에서 뜬다.
+
+        기록 자체는 add·remove가 이미 써 두었다. 백업을 언제 뜰지는
+        snapshot_backups가 정한다 — 저장마다 뜨면 받기가 몰리는 날 30벌이 몇 분
+        만에 갈린다. 파일을 열지 못해 메모리에만 두고 있으면 뜨지 않는다.
+        """
+        if self.path != ":memory:" and self._loaded and self._backups.changed():
+            self._executor.submit(self._backup_sync)
+
+    def _backup_sync(self) -> bool:
+        """내용이 마지막 백업과 다르면 SQLite 백업 API로 한 벌 뜬다.
+
+        파일을 그냥 복사하면 쓰는 도중의 것을 집어 갈 수 있다. 해시는 줄을 주소
+        차례로 읽어 낸다. 같은 내용이어도 파일의 바이트는 다를 수 있어서다.
+        해시와 백업을 한 잠금 안에서 떠야 둘이 같은 상태를 본다.
+        """
+        source = self._db()
+        with self._lock:
+            if not self._loaded:
+                return False
+            try:
+                hasher = hashlib.sha256()
+                for row in source.execute(f"SELECT url, {', '.join(_COLUMNS)} FROM history ORDER BY url"):
+                    hasher.update(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+                    hasher.update(b"\n")
+            except sqlite3.Error:
+                return False
+
+            def write(target: Path) -> bool:
+                dest = sqlite3.connect(str(target))
                 try:
-                    bak_path.write_bytes(target.read_bytes())
-                    self._prune_backups()
-                except OSError: pass
-
-            tmp_path = target.with_suffix(".tmp")
-            tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-            tmp_path.replace(target)
-            return True
-        except Exception: return False
-
-    def _prune_backups(self):
-        if self.keep_backups <= 0: return
-        try:
-            files = sorted(self.backup_dir.glob("urlhistory_*.bak.json"), key=lambda p: p.stat().st_mtime)
-            for f in files[:-self.keep_backups]: f.unlink(missing_ok=True)
-        except OSError: pass
+                    source.backup(dest)
+                    return True
+                except sqlite3.Error:
+                    return False
+                finally:
+                    dest.close()
+            return self._backups.take(hasher.hexdigest(), write) is not None
 
     def exists(self, url: str) -> bool:
-        return (url or "").strip() in self._data
+        conn = self._db()
+        with self._lock:
+            row = conn.execute("SELECT 1 FROM history WHERE url = ?",
+                               ((url or "").strip(),)).fetchone()
+        return row is not None
 
     def get_title(self, url: str) -> str:
-        entry = self._data.get((url or "").strip(), {})
-        return entry.get("title", "(제목 없음)")
+        conn = self._db()
+        with self._lock:
+            row = conn.execute("SELECT title FROM history WHERE url = ?",
+                               ((url or "").strip(),)).fetchone()
+        return row[0] if row and row[0] else NO_TITLE
 
     def add(self, url: str, title: str, filepath: Optional[str] = None,
             series_id: Optional[str] = None, thumbnail_url: Optional[str] = None):
         """기록에 항목을 추가합니다. series_id와 thumbnail_url을 선택적으로 저장합니다."""
         url = (url or "").strip()
         if not url: return
-
-        self._data[url] = {
-            "title": title or "(제목 없음)",
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "filepath": filepath or "",
-            "series_id": series_id,
-            "thumbnail_url": thumbnail_url
-        }
+        row = (url, title or NO_TITLE, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+               filepath or "", series_id or None, thumbnail_url or None)
+        conn = self._db()
+        with self._lock:
+            with conn:
+                conn.execute(_UPSERT, row)
+        self._index.put(url, dict(zip(_COLUMNS, row[1:])))
 
     def remove(self, url: str) -> None:
         url = (url or "").strip()
-        if url and url in self._data: self._data.pop(url)
+        if not url: return
+        conn = self._db()
+        with self._lock:
+            with conn:
+                conn.execute("DELETE FROM history WHERE url = ?", (url,))
+        self._index.remove(url)
 
     def sorted_entries(self) -> List[Tuple[str, dict]]:
-        return sorted(self._data.items(), key=lambda item: item[1].get("date", ""), reverse=True)
+        """최근에 받은 것부터. 날짜 색인을 거꾸로 따라 읽는다."""
+        conn = self._db()
+        with self._lock:
+            rows = conn.execute(
+                f"SELECT url, {', '.join(_COLUMNS)} FROM history ORDER BY date DESC").fetchall()
+        return [(row[0], dict(zip(_COLUMNS, row[1:]))) for row in rows]
+
+    def search(self, term: str, order: str = ORDER_DATE,
+               limit: Optional[int] = None) -> Tuple[int, List[Tuple[str, dict]]]:
+        """기록 탭 검색. (걸린 수, 앞에서부터 limit개의 (주소, 항목)). history_index를 본다."""
+        self._db()
+        return self._index.search(term, order, limit)
@@ -0,0 +1,347 @@
+"""기록 탭 목록. 모델 하나와 행을 직접 그리는 델리게이트로 보여 준다.
+
+예전에는 기록 한 줄마다 카드 위젯(HistoryItemWidget)을 만들어 QListWidget에
+걸었다. 위젯 하나가 라벨 넷과 색 띠, 썸네일 요청까지 들고 있어 수백 개만 되어도
+탭을 여는 순간 멈칫했고, 그래서 **앞의 100개만 그리고 나머지는 '검색해서 찾으라'며
+숨겼다.** 검색창에 한 글자 칠 때마다 카드를 전부 헐고(clear_item_widgets) 새로
+만들었다.
+
+여기서는 **보이는 줄만 그린다.** 모델(HistoryListModel)은 검색 결과를 (주소, 항목)
+목록으로 들고 있을 뿐이고, 델리게이트(HistoryItemDelegate)가 화면에 걸린 줄만 카드
+모양으로 칠한다. 줄 높이가 모두 같아(setUniformItemSizes) 뷰가 줄마다 크기를 묻지
+않으므로, 기록이 몇만 건이어도 개수 제한 없이 끝까지 스크롤된다. 검색은 모델의
+질의만 바꾼다(set_query) — 헐고 새로 만들 위젯이 없다.
+
+**썸네일은 보이는 줄의 것만 부른다.** 스크롤이 멈추면(THUMB_SETTLE_MS) 뷰가 지금
+보이는 줄의 범위를 모델에 알리고, 모델이 캐시 파일을 읽거나 받으러 보낸다. 그사이
+지나쳐 버린 줄의 '아직 시작 전' 요청은 그때 대기열에서 뺀다. 휙 훑고 지나간 수천 줄의
+그림을 받으러 가지 않는다.
+
+카드의 모양은 예전 카드 위젯과 같다 — 왼쪽 색 띠, 둥근 썸네일, 제목·날짜·주소 세 줄.
+QSS가 닿지 않으므로 색은 palette에서, 글자 크기는 qss의 카드 글자 크기에서 가져와
+직접 칠한다. 제목은 한 줄로 줄인다(말줄임). 줄 높이가 같아야 위의 이점이 살아서다.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QPoint, QRectF, QSize, Qt, QTimer
+from PyQt6.QtGui import QColor, QFont, QPainter, QPainterPath, QPen, QPixmap
+from PyQt6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+from src.qss import CARD_SELECT_MIX, blend, palette
+from src.widgets import (LIST_THUMB_H, LIST_THUMB_W, STRIP_WIDTH, THUMBNAIL_CACHE_DIR,
+                         cached_thumbnail, discard_thumbnail_requests, rounded_thumbnail,
+                         start_thumbnail_download)
+
+META_ROLE = Qt.ItemDataRole.UserRole + 1
+"""기록 항목 사전 전체. UserRole은 예전처럼 주소다(우클릭 메뉴가 읽는다)."""
+
+THUMB_CACHE_SIZE = 200
+"""모델이 들고 있는 둥글린 썸네일 수. 넘으면 가장 오래 안 쓴 것부터 버린다.
+화면 두세 장 분량이면 위아래로 조금 오가는 동안은 다시 읽지 않는다."""
+
+THUMB_SETTLE_MS = 60
+"""스크롤이 이만큼 멈춰야 보이는 줄의 썸네일을 부른다. 스크롤바를 끌고 지나가는
+동안에는 캐시 파일도 읽지 않는다."""
+
+
+def _cache_path(url: str):
+    """예전 카드 위젯과 같은 자리. 회차 ID로 이름을 붙인다."""
+    return THUMBNAIL_CACHE_DIR / f"{url.strip('/').split('/')[-1]}.jpg"
+
+
+class HistoryListModel(QAbstractListModel):
+    """기록 검색 결과 한 벌과, 그 줄들의 썸네일."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._search = None
+        self._rows: List[Tuple[str, dict]] = []
+        self._thumbs: "OrderedDict[str, QPixmap]" = OrderedDict()
+        """기록 주소 → 둥글린 썸네일."""
+        self._dpr = 1.0
+        self._missing: Set[str] = set()
+        """그림이 없거나 받지 못한 기록 주소. 화면에 걸릴 때마다 다시 부르지 않는다."""
+        self._waiting: Dict[str, Set[str]] = {}
+        """받으러 보낸 썸네일 주소 → 그 그림을 기다리는 기록 주소."""
+        self._queued: Set[str] = set()
+        """보냈지만 아직 대기열에 있는 썸네일 주소. 보이는 줄이 바뀌면 뺀다."""
+
+    def set_source(self, search):
+        """검색할 곳. HistoryStore.search와 같은 모양의 함수를 받는다."""
+        self._search = search
+
+    def set_query(self, term: str, order: str):
+        """검색어와 정렬로 결과를 다시 받는다. 같은 질의여도 다시 받는다(기록이 바뀌었을 수 있다).
+
+        썸네일 캐시는 기록 주소로 찾으므로 그대로 둔다. 받지 못했던 것은 다시 해 볼
+        기회를 준다 — 예전에도 목록을 새로 그릴 때마다 다시 불렀다.
+        """
+        rows = self._search(term, order)[1] if self._search is not None else []
+        self.beginResetModel()
+        self._rows = rows
+        self._missing.clear()
+        self._drop_queued()
+        self.endResetModel()
+
+    def remove_url(self, url: str) -> bool:
+        """그 줄만 뺀다. 목록을 다시 받지 않아 스크롤 자리와 선택이 그대로 남는다."""
+        for row, (row_url, _meta) in enumerate(self._rows):
+            if row_url == url:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                self._thumbs.pop(url, None)
+                return True
+        return False
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        url, meta = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return meta.get("title") or "(제목 없음)"
+        if role == Qt.ItemDataRole.UserRole:
+            return url
+        if role == META_ROLE:
+            return meta
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._thumbs.get(url)
+            if pixmap is not None:
+                self._thumbs.move_to_end(url)
+            return pixmap
+        return None
+
+    def load_thumbnails(self, first: int, last: int, dpr: float = 1.0):
+        """first~last 줄의 썸네일을 캐시 파일에서 읽거나 받으러 보낸다.
+
+        그 전에 앞서 보낸 요청 중 아직 대기열에 있는 것을 뺀다. 지금 보이는 줄의 것은
+        곧바로 다시 넣으므로, 남는 것은 이미 지나친 줄의 요청뿐이다.
+        """
+        dpr = dpr or 1.0
+        if dpr != self._dpr:
+            self._dpr = dpr
+            self._thumbs.clear()
+        self._drop_queued()
+        found = False
+        for row in range(max(0, first), min(last, len(self._rows) - 1) + 1):
+            url, meta = self._rows[row]
+            if url in self._thumbs or url in self._missing:
+                continue
+            thumb_url = meta.get("thumbnail_url")
+            if not thumb_url:
+                self._missing.add(url)
+                continue
+            pixmap = cached_thumbnail(_cache_path(url))
+            if pixmap is not None:
+                self._keep(url, pixmap)
+                found = True
+                continue
+            waiting = self._waiting.get(thumb_url)
+            if waiting is not None:
+                waiting.add(url)
+                continue
+            self._waiting[thumb_url] = {url}
+            if start_thumbnail_download(thumb_url, self._on_thumb_loaded) is None:
+                self._queued.add(thumb_url)
+        if found:
+            self._thumbs_changed()
+
+    def _drop_queued(self):
+        """대기열에 남은 이 모델의 요청을 빼고, 그 그림을 기다리던 것도 잊는다."""
+        discard_thumbnail_requests(self)
+        for thumb_url in self._queued:
+            self._waiting.pop(thumb_url, None)
+        self._queued.clear()
+
+    def _on_thumb_loaded(self, result: tuple):
+        """받아 온 것을 그림으로 읽어 보고, 읽히는 것만 캐시 파일로 남긴다.
+
+        읽어 보기 전에 적어 두면 사라진 영상 자리의 오류 쪽지가 캐시가 된다
+        (cached_thumbnail 참고).
+        """
+        try: thumb_url, data = result
+        except (TypeError, ValueError): return
+        self._queued.discard(thumb_url)
+        urls = self._waiting.pop(thumb_url, set())
+        pixmap = QPixmap()
+        if not data or not pixmap.loadFromData(data):
+            self._missing.update(urls)
+            return
+        for url in urls:
+            try:
+                THUMBNAIL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                _cache_path(url).write_bytes(data)
+            except OSError:
+                pass
+            self._keep(url, pixmap)
+        if urls:
+            self._thumbs_changed()
+
+    def _keep(self, url: str, pixmap: QPixmap):
+        self._thumbs[url] = rounded_thumbnail(pixmap, LIST_THUMB_W, LIST_THUMB_H, self._dpr)
+        while len(self._thumbs) > THUMB_CACHE_SIZE:
+            self._thumbs.popitem(last=False)
+
+    def _thumbs_changed(self):
+        """썸네일이 들어왔다고 알린다. 여러 줄에 걸친 dataChanged는 뷰가 보이는 곳만
+        다시 칠하므로, 어느 줄인지 찾아 하나씩 알릴 필요가 없다."""
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1),
+                                  [Qt.ItemDataRole.DecorationRole])
+
+
+class HistoryItemDelegate(QStyledItemDelegate):
+    """기록 한 줄을 카드 모양으로 칠한다. 예전 HistoryItemWidget과 같은 자리·색이다.
+
+    초점 사각형은 그리지 않는다(NoFocusDelegate와 같은 까닭). 스타일의 행 그리기를
+    아예 부르지 않으므로 따로 지울 것도 없다.
+    """
+
+    ROW_HEIGHT = LIST_THUMB_H + 20
+    """썸네일에 위아래 여백 10px씩. 모든 줄이 이 높이다."""
+    RADIUS = 10
+    PADDING = 12
+    TITLE_PX = 14
+    SUB_PX = 12
+    """글자 크기. qss의 카드 제목(fs_card)·보조 글(fs_sub)과 같은 값이다."""
+
+    def __init__(self, theme: str = "light", parent=None):
+        super().__init__(parent)
+        self.apply_theme(theme)
+
+    def apply_theme(self, theme: str):
+        colors = palette(theme)
+        self._colors = {key: QColor(colors[key]) for key in
+                        ("surface", "bg", "border", "border_strong", "text", "text_dim",
+                         "ctx_history")}
+        self._colors["tint"] = QColor(blend(colors["ctx_history"], colors["surface"], CARD_SELECT_MIX))
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(0, self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index):
+        colors = self._colors
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        card = QPainterPath()
+        card.addRoundedRect(rect, self.RADIUS, self.RADIUS)
+        painter.fillPath(card, colors["tint"] if selected else colors["surface"])
+
+        painter.save()
+        painter.setClipPath(card)
+        strip = QPainterPath()
+        strip.addRoundedRect(QRectF(rect.left(), rect.top(), STRIP_WIDTH, rect.height()),
+                             STRIP_WIDTH / 2, STRIP_WIDTH / 2)
+        painter.fillPath(strip, colors["ctx_history"])
+        painter.restore()
+
+        border = (colors["ctx_history"] if selected
+                  else colors["border_strong"] if hovered else colors["border"])
+        painter.setPen(QPen(border, 1))
+        painter.drawPath(card)
+
+        thumb = QRectF(rect.left() + STRIP_WIDTH + self.PADDING,
+                       rect.top() + (rect.height() - LIST_THUMB_H) / 2,
+                       LIST_THUMB_W, LIST_THUMB_H)
+        frame = QPainterPath()
+        frame.addRoundedRect(thumb, 4, 4)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is None:
+            painter.fillPath(frame, colors["bg"])
+        else:
+            painter.drawPixmap(thumb.topLeft(), pixmap)
+        painter.setPen(QPen(colors["border"], 1))
+        painter.drawPath(frame)
+
+        meta = index.data(META_ROLE) or {}
+        left = thumb.right() + self.PADDING
+        width = max(0, int(rect.right() - self.PADDING - left))
+        sub_color = colors["text"] if selected else colors["text_dim"]
+        lines = ((index.data(Qt.ItemDataRole.DisplayRole) or "", self.TITLE_PX,
+                  QFont.Weight.Medium, colors["text"]),
+                 (meta.get("date", ""), self.SUB_PX, QFont.Weight.Normal, sub_color),
+                 (index.data(Qt.ItemDataRole.UserRole) or "", self.SUB_PX,
+                  QFont.Weight.Normal, sub_color))
+        top = thumb.top()
+        for text, size, weight, color in lines:
+            font = QFont(option.font)
+            font.setPixelSize(size)
+            font.setWeight(weight)
+            painter.setFont(font)
+            painter.setPen(color)
+            metrics = painter.fontMetrics()
+            painter.drawText(QRectF(left, top, width, metrics.height()),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             metrics.elidedText(text, Qt.TextElideMode.ElideRight, width))
+            top += metrics.height() + 4
+        painter.restore()
+
+
+class HistoryListView(QListView):
+    """기록 탭 목록. 모델을 직접 만들어 들고, 스크롤이 멈추면 보이는 줄의 썸네일을 부른다."""
+
+    def __init__(self, theme: str = "light", parent=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        model = HistoryListModel(self)
+        self.setModel(model)
+        self.setItemDelegate(HistoryItemDelegate(theme, self))
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.setInterval(THUMB_SETTLE_MS)
+        self._thumb_timer.timeout.connect(self._load_visible_thumbnails)
+        for signal in (self.verticalScrollBar().valueChanged, model.modelReset, model.rowsRemoved):
+            signal.connect(self._schedule_thumbnails)
+
+    def apply_theme(self, theme: str):
+        self.itemDelegate().apply_theme(theme)
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_thumbnails()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_thumbnails()
+
+    def _schedule_thumbnails(self, *_):
+        """스크롤·질의가 바뀔 때마다 다시 잰다. 멈춘 뒤 한 번만 부른다.
+
+        신호의 인자를 타이머에 그대로 넘기면 안 된다. QTimer.start(int)가 스크롤
+        위치를 밀리초로 받아 버린다.
+        """
+        self._thumb_timer.start()
+
+    def _load_visible_thumbnails(self):
+        """지금 뷰포트에 걸린 줄의 범위를 모델에 알린다. 숨어 있으면 부르지 않는다."""
+        count = self.model().rowCount()
+        if not count or not self.isVisible():
+            return
+        viewport = self.viewport().rect()
+        first = self._row_at(viewport.top(), 0)
+        last = self._row_at(viewport.bottom(), count - 1)
+        self.model().load_thumbnails(first - 1, last + 1, self.devicePixelRatioF())
+
+    def _row_at(self, y: int, fallback: int) -> int:
+        """그 높이의 줄. 줄 사이 틈(spacing)에 떨어지면 틈 너머를 본다."""
+        x = self.viewport().rect().center().x()
+        step = self.spacing() + 1
+        for dy in (0, step, -step):
+            index = self.indexAt(QPoint(x, y + dy))
+            if index.isValid():
+                return index.row()
+        return fallback
@@ -0,0 +1,185 @@
+"""yt-dlp에 물어 얻은 정보를 디스크에 남겨 두고 다시 쓰는 곳.
+
+미리 묻기가 받아 둔 정보(MetadataPrefetcher._cache)는 메모리에만 있어 앱을 끄면
+사라졌다. 대기열 100개를 되살리면(restore_saved_queue) 제목을 띄우려고만 `-J`를
+100번 다시 던졌고, 시리즈 분석은 같은 시리즈를 몇 분 사이에 두 번 넣어도 매번
+회차를 처음부터 훑었다. 그 질의 하나하나가 받는 쪽과 연결 주머니를 나눠 쓴다.
+
+여기서는 답을 **종류(kind)와 다듬은 주소로** 한 파일씩 남긴다.
+
+- EPISODE: 회차 하나의 `-J` 답. 미리 묻기와 DownloadThread가 함께 쓴다.
+- SERIES: 시리즈 분석 결과(제목과 회차 목록). 즐겨찾기 확인도 이 길을 지난다.
+
+**종류마다 수명이 다르다**(TTL). 회차 제목과 표지 그림은 좀처럼 바뀌지 않지만,
+시리즈의 회차 목록은 새 회차가 올라오면 바로 달라진다. 수명이 지난 것은 없는
+것으로 보고, 부르는 쪽은 예전처럼 묻는다. 더 짧게 보고 싶은 쪽은 max_age를 준다.
+
+**크기가 MAX_BYTES를 넘으면 오래된 것부터 지운다.** 회차 하나의 답은 형식
+목록까지 들어 수십 KB다. 즐겨찾기를 몇 달 돌리면 끝없이 쌓인다.
+
+읽기는 UI 스레드와 작업 스레드(DownloadThread·SeriesParseThread)에서 섞여
+일어나 자물쇠로 묶는다. 파일을 읽고 쓰는 일은 자물쇠 밖에서 한다 — 느린
+디스크에서 한쪽이 쓰는 동안 다른 쪽이 통째로 서지 않게.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+CACHE_ROOT = Path("cache") / "metadata"
+
+EPISODE = "episode"
+SERIES = "series"
+
+TTL: Dict[str, float] = {EPISODE: 24 * 3600, SERIES: 10 * 60}
+"""종류별 수명(초).
+
+회차는 하루. 제목·표지 그림이 그 사이에 바뀌는 일은 드물고, 대기열을 되살리는
+것은 대개 전날 끈 것이다. 시리즈는 10분. 새 회차를 찾으려고 돌리는 것이라 길게
+두면 막 올라온 회차를 놓친다. 몇 분 사이에 같은 시리즈를 다시 넣는 경우(붙여
+넣기 실수, 즐겨찾기에 넣자마자 확인)만 아낀다."""
+
+MAX_BYTES = 64 * 1024 * 1024
+"""캐시 폴더 전체의 크기 상한. 회차 답 수천 개가 들어간다."""
+
+
+def normalize_url(url: str) -> str:
+    """같은 회차를 가리키는 주소를 하나로 모은다.
+
+    물음표 뒤(공유 링크의 추적 인자)와 `#` 뒤, 끝의 `/`를 떼고 호스트를
+    소문자로, http를 https로 맞춘다. 경로의 대소문자는 그대로 둔다 — TVer의
+    회차 ID는 대소문자를 가린다.
+    """
+    parts = urlsplit((url or "").strip())
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme.lower()
+    return urlunsplit((scheme, parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+def _file_name(kind: str, url: str) -> str:
+    digest = hashlib.sha1(f"{kind}\n{normalize_url(url)}".encode("utf-8")).hexdigest()
+    return f"{kind}-{digest[:24]}.json"
+
+
+class MetadataCache:
+    """종류와 주소로 찾는 디스크 캐시."""
+
+    def __init__(self, root: Path = CACHE_ROOT, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None
+        """파일 이름 → (남긴 시각, 크기). 처음 쓸 때 폴더를 한 번 훑어 채운다."""
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        """폴더를 훑어 목록을 만든다. 자물쇠를 쥔 채 부른다."""
+        if self._index is not None:
+            return self._index
+        index: Dict[str, Tuple[float, int]] = {}
+        try:
+            for entry in os.scandir(self.root):
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    index[entry.name] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            pass
+        self._index = index
+        return index
+
+    def age(self, kind: str, url: str) -> Optional[float]:
+        """남긴 지 몇 초가 지났는지. 없으면 None."""
+        with self._lock:
+            found = self._scan().get(_file_name(kind, url))
+        return None if found is None else max(0.0, time.time() - found[0])
+
+    def get(self, kind: str, url: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """남겨 둔 답. 없거나 수명(또는 max_age)이 지났거나 읽지 못하면 None."""
+        name = _file_name(kind, url)
+        limit = TTL.get(kind, 0) if max_age is None else min(max_age, TTL.get(kind, max_age))
+        with self._lock:
+            found = self._scan().get(name)
+        if found is None or time.time() - found[0] > limit:
+            return None
+        try:
+            record = json.loads((self.root / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError, UnicodeDecodeError):
+            self.discard(kind, url)
+            return None
+        if not isinstance(record, dict) or record.get("url") != normalize_url(url):
+            return None
+        return record.get("data")
+
+    def put(self, kind: str, url: str, data: Any) -> bool:
+        """답을 남긴다. 성공 여부를 돌려준다.
+
+        임시 파일에 쓰고 바꿔치기한다. 반쯤 쓰인 파일은 읽을 때 걸러지지만,
+        걸러지는 동안 있던 답을 잃는다.
+        """
+        if not url or data is None:
+            return False
+        name = _file_name(kind, url)
+        target = self.root / name
+        tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            body = json.dumps({"url": normalize_url(url), "kind": kind, "data": data},
+                              ensure_ascii=False)
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(body, encoding="utf-8")
+            os.replace(tmp, target)
+        except (OSError, TypeError, ValueError):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            self._scan()[name] = (time.time(), len(body.encode("utf-8")))
+            victims = self._over_budget()
+        for victim in victims:
+            try:
+                (self.root / victim).unlink()
+            except OSError:
+                pass
+        return True
+
+    def discard(self, kind: str, url: str):
+        name = _file_name(kind, url)
+        with self._lock:
+            self._scan().pop(name, None)
+        try:
+            (self.root / name).unlink()
+        except OSError:
+            pass
+
+    def _over_budget(self) -> list:
+        """크기 상한을 넘긴 만큼 오래된 것부터 목록에서 빼고 그 이름을 돌려준다.
+
+        자물쇠를 쥔 채 부른다. 지우는 일은 부르는 쪽이 자물쇠 밖에서 한다.
+        """
+        index = self._scan()
+        total = sum(size for _, size in index.values())
+        if total <= self.max_bytes:
+            return []
+        victims = []
+        for name, (_, size) in sorted(index.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            victims.append(name)
+            total -= size
+        for name in victims:
+            del index[name]
+        return victims
+
+
+_shared = MetadataCache()
+
+
+def shared() -> MetadataCache:
+    """앱 전체가 함께 쓰는 메타데이터 캐시."""
+    return _shared
@@ -1,10 +1,24 @@
 """대기열에 서 있는 항목의 정보를 미리 받아 두는 조정자.
 
-**한 번에 하나씩만 물어본다.** 대기열에 스무 개가 있다고 스무 개를 한꺼번에
-물으면, 그 순간 받고 있는 영상과 회선을 나눠 쓰게 된다. 조회 쪽이 느려지는
-것으로 끝나지 않는다 — ytdlp_run 주석에 적힌 `Read timed out`이 바로 그
-상황에서 났고, 그때 실패하는 것은 조회가 아니라 **받는 쪽**일 수도 있다.
-줄 세워 하나씩 던지면 늘어나는 부하가 언제나 질의 하나뿐이다.
+**한꺼번에 묻는 수를 회선 형편에 맞춘다.** 예전에는 한 번에 하나씩만 물었다.
+스무 개를 한꺼번에 물으면 받고 있는 영상과 회선을 나눠 쓰게 되고, ytdlp_run
+주석에 적힌 `Read timed out`이 바로 그 상황에서 났다 — 그때 실패하는 것은
+조회가 아니라 **받는 쪽**일 수도 있다. 그런데 하나씩이면 받는 것이 없을 때도
+하나씩이라, 주소 60개를 붙여 넣으면 제목이 다 뜨기까지 몇 분이 걸렸다.
+
+그래서 한꺼번에 묻는 수(_limit)를 세 가지로 묶는다.
+
+- 연결 주머니(connection_budget)에서 지금 기다리지 않고 꺼낼 수 있는 자리 수.
+  다운로드가 주머니를 채우고 있으면 0이 되어 새로 묻지 않는다.
+- 받는 것이 하나라도 돌면 하나. 남은 자리가 있어도 받는 쪽 회선을 나눠 쓰는
+  것은 같아서, 예전처럼 늘어나는 부하를 질의 하나로 묶어 둔다.
+- 질의가 걸린 시간. 끝날 때마다 평소(지수 평균)와 견주어, 느려졌으면 그
+  자리에서 절반으로 줄이고 제때 끝났으면 하나씩 늘린다. 조회가 느려지는 것은
+  TVer가 밀리기 시작했다는 첫 표시라, 오류가 날 때까지 기다리면 늦다.
+
+**한 질의에 주소를 여럿 묶는다**(MetadataThread). 자리 하나가 프로세스 하나라,
+줄 선 것을 빈자리 수로 나눠 BATCH_SIZE까지 함께 넘긴다. 걸린 시간은 묶음 전체가
+아니라 답이 하나 올 때마다 앞의 답(처음에는 시작)으로부터 잰다.
 
 **받아 둔 것은 그대로 DownloadThread에 넘어간다**(take). 그래서 미리 묻기가
 통신을 두 배로 늘리지 않고 앞당기기만 한다. 미리 묻지 못한 항목은 예전처럼
@@ -12,19 +26,55 @@
 
 **차례가 온 항목은 기다리지 않고 버린다.** 마침 그 항목을 묻고 있었다면 질의를
 죽이고 받기부터 시작한다. 조회가 끝나기를 기다리면 미리 묻기가 다운로드를
-늦추는 셈이 되는데, 그건 이 기능이 하려던 것과 정반대다.
+늦추는 셈이 되는데, 그건 이 기능이 하려던 것과 정반대다. 다만 묶음에 아직
+필요한 다른 주소가 있으면 죽이지 않고 그 답만 버린다 — 묶음을 죽이면 나머지를
+처음부터 다시 물어야 한다.
 """
 
-from typing import Callable, Dict, List, Optional
+import time
+from typing import Callable, Dict, List, Optional, Set
 
 from PyQt6 import sip
-from PyQt6.QtCore import QDeadlineTimer, QObject, pyqtSignal
+from PyQt6.QtCore import QDeadlineTimer, QObject, QTimer, pyqtSignal
 
+from src import connection_budget
+from src.threads import ytdlp_run
 from src.threads.metadata_thread import MetadataThread
 
+MAX_PARALLEL = 4
+"""받는 것이 없을 때 한꺼번에 묻는 수의 상한.
+
+질의 하나는 yt-dlp 하나를 띄우고 TVer API를 여러 번 부른다. 연결 주머니에
+자리가 남아도 이보다 많이 띄우면, 빨라지는 것보다 같은 서버에 한꺼번에 몰린
+요청이 거절당할 몫이 커진다."""
+
+LATENCY_WEIGHT = 0.3
+"""걸린 시간의 지수 평균에서 새 값에 주는 무게. 클수록 최근 질의를 더 믿는다."""
+
+SLOW_FACTOR = 2.0
+"""평소의 몇 배가 걸리면 느려졌다고 보는지."""
+
+SLOW_SECONDS = 20.0
+"""평소와 상관없이 이보다 오래 걸리면 느려졌다고 본다.
+
+처음 몇 번은 평균이 자리를 잡지 못해 비교할 것이 없다. 그동안에도 제한
+시간(MetadataThread.TIMEOUT)의 삼분의 일을 넘기면 줄인다."""
+
+BATCH_SIZE = 10
+"""질의 하나에 묶어 넘기는 주소 수의 상한.
+
+크게 잡을수록 프로세스를 띄우는 비용은 줄지만, 한 묶음이 차례로 읽히므로
+뒤에 선 주소의 제목이 늦게 뜨고, 죽여야 할 때 버리는 몫도 커진다."""
+
+RETRY_MS = 1000
+"""자리가 없어 묻지 못했을 때 다시 살펴보는 간격.
+
+자리가 나는 것은 다운로드가 끝나거나 몫을 돌려줄 때인데, 그 소식은 이쪽으로
+오지 않는다. 기다리는 것이 있을 때만 돈다."""
+
 
 class MetadataPrefetcher(QObject):
-    """대기열 항목의 제목·표지 그림을 한 번에 하나씩 미리 받아 둔다."""
+    """대기열 항목의 제목·표지 그림을 회선 형편만큼 나눠 미리 받아 둔다."""
 
     loaded = pyqtSignal(str, dict)
 
@@ -40,12 +90,22 @@ class MetadataPrefetcher(QObject):
         self.ytdlp_path: Optional[str] = None
         self.ignore_ssl_errors = False
         self._pending: List[str] = []
-        self._thread: Optional[MetadataThread] = None
-        self._current: Optional[str] = None
+        self._threads: Dict[str, MetadataThread] = {}
+        """묻는 중인 주소 → 질의 스레드. 한 스레드가 주소 여럿을 맡는다."""
+        self._marks: Dict[MetadataThread, float] = {}
+        """질의 스레드 → 마지막으로 답이 온(또는 시작한) 시각."""
         self._cache: Dict[str, dict] = {}
         self._retiring: List[MetadataThread] = []
         self._shutting_down = False
         self._is_wanted: Optional[Callable[[str], bool]] = None
+        self._parallel = 1
+        """걸린 시간으로 정한 한꺼번에 묻는 수. 하나에서 시작해 제때 끝날 때마다 는다."""
+        self._latency: Optional[float] = None
+        """질의 하나가 걸린 시간(초)의 지수 평균. 아직 끝난 것이 없으면 None."""
+        self._retry = QTimer(self)
+        self._retry.setSingleShot(True)
+        self._retry.setInterval(RETRY_MS)
+        self._retry.timeout.connect(self._pump)
 
     def set_ytdlp_path(self, path: str):
         """준비가 끝나 yt-dlp를 쓸 수 있게 되면 알려 준다.
@@ -69,13 +129,17 @@ class MetadataPrefetcher(QObject):
         self._is_wanted = predicate
 
     def request(self, url: str):
-        """차례를 기다리는 항목 하나를 미리 물어볼 목록에 넣는다."""
+        """차례를 기다리는 항목 하나를 미리 물어볼 목록에 넣는다.
+
+        묻기는 이벤트 루프가 한 바퀴 돈 뒤에 시작한다. 한꺼번에 넣기는 주소를
+        한 번에 하나씩 넣으므로, 곧바로 시작하면 첫 주소만 혼자 한 묶음이 된다.
+        """
         if self._shutting_down or not url:
             return
-        if url in self._cache or url == self._current or url in self._pending:
+        if url in self._cache or url in self._threads or url in self._pending:
             return
         self._pending.append(url)
-        self._pump()
+        QTimer.singleShot(0, self._pump)
 
     def take(self, url: str) -> Optional[dict]:
         """받아 둔 정보를 넘기고 그 항목에 대한 미리 묻기를 끝낸다.
@@ -93,43 +157,95 @@ class MetadataPrefetcher(QObject):
         if url in self._pending:
             self._pending.remove(url)
         self._cache.pop(url, None)
-        if url == self._current and self._thread is not None:
-            self._thread.stop()
+        thread = self._threads.pop(url, None)
+        if thread is not None and thread not in self._running():
+            self._marks.pop(thread, None)
+            thread.stop()
 
     def stop_all(self):
-        """앱을 끝낼 때 부른다. 담아 둔 것을 버리고 도는 질의를 거둔다."""
+        """앱을 끝낼 때 부른다. 담아 둔 것을 버리고 도는 질의를 거둔다.
+
+        _threads에 든 것만 보면 안 된다. cancel()로 묶음 전체가 취소된 스레드는
+        거기서 빠지지만 run()을 아직 빠져나오지 못했을 수 있다. 도는 QThread를
+        남긴 채 앱이 끝나면 "Destroyed while thread is still running"으로 프로세스가
+        그 자리에서 죽으므로, 아직 거두지 않은(_retiring) 것까지 모두 세워 기다린다.
+        """
         self._shutting_down = True
+        self._retry.stop()
         self._pending.clear()
         self._cache.clear()
-        thread = self._thread
-        self._thread = None
-        self._current = None
-        if thread is None:
-            return
-        thread.stop()
-        thread.wait(QDeadlineTimer(self.STOP_WAIT_MS))
+        threads = [thread for thread in set(self._retiring) | self._running()
+                   if not sip.isdeleted(thread) and not thread.isFinished()]
+        self._threads.clear()
+        self._marks.clear()
+        for thread in threads:
+            thread.stop()
+        deadline = QDeadlineTimer(self.STOP_WAIT_MS)
+        for thread in threads:
+            thread.wait(deadline)
 
     def pending_count(self) -> int:
         """아직 답을 받지 못한 개수(줄 서 있는 것 + 묻는 중인 것)."""
-        return len(self._pending) + (1 if self._current else 0)
+        return len(self._pending) + len(self._threads)
+
+    def _running(self) -> Set[MetadataThread]:
+        """도는 질의 스레드들. 연결 주머니에서는 하나가 한 칸이다."""
+        return set(self._threads.values())
+
+    def _limit(self) -> int:
+        """지금 한꺼번에 묻고 있어도 되는 수. 0이면 새로 묻지 않는다.
+
+        연결 주머니의 남은 자리에는 이미 묻고 있는 것의 몫이 빠져 있어 도로
+        더한다. 질의 스레드는 자리를 기다리는 동안에도 _running에 드는데, 그
+        몫까지 더하면 한 칸을 두 번 세지만 상한(MAX_PARALLEL)이 막아 준다.
+        """
+        budget = connection_budget.shared()
+        room = budget.query_room() + len(self._running())
+        ceiling = 1 if budget.downloading() else MAX_PARALLEL
+        return max(0, min(self._parallel, ceiling, room))
 
     def _pump(self):
-        """줄에서 하나를 꺼내 묻기 시작한다. 이미 묻는 중이면 아무것도 하지 않는다."""
-        if self._shutting_down or self._thread is not None or not self.ytdlp_path:
+        """줄 앞에서부터 꺼내 묻기 시작한다. 자리가 찼으면 그대로 둔다.
+
+        줄 선 것을 빈자리 수로 고루 나눠 묶는다. 빈자리가 넷인데 앞의 한 묶음에
+        열 개를 다 넣으면 나머지 셋이 놀고, 하나씩 넣으면 묶는 보람이 없다.
+        """
+        if self._shutting_down or not self.ytdlp_path:
             return
-        while self._pending:
-            url = self._pending.pop(0)
-            if self._is_wanted is not None and not self._is_wanted(url):
+        limit = self._limit()
+        running = len(self._running())
+        while self._pending and running < limit:
+            size = min(BATCH_SIZE, -(-len(self._pending) // (limit - running)))
+            batch: List[str] = []
+            while self._pending and len(batch) < size:
+                url = self._pending.pop(0)
+                if self._is_wanted is None or self._is_wanted(url):
+                    batch.append(url)
+            if not batch:
                 continue
-            thread = MetadataThread(url, self.ytdlp_path, self.ignore_ssl_errors)
+            thread = MetadataThread(batch, self.ytdlp_path, self.ignore_ssl_errors)
             thread.loaded.connect(self._on_loaded)
             thread.failed.connect(self._on_failed)
             thread.finished.connect(self._reap)
-            self._current = url
-            self._thread = thread
+            for url in batch:
+                self._threads[url] = thread
+            self._marks[thread] = time.monotonic()
             self._retiring.append(thread)
             thread.start()
-            return
+            running += 1
+        if self._pending and not self._threads and not self._retry.isActive():
+            self._retry.start()
+
+    def _note_latency(self, seconds: float):
+        """질의 하나가 걸린 시간을 보고 한꺼번에 묻는 수를 고친다."""
+        average = self._latency
+        slow = seconds >= SLOW_SECONDS or (average is not None and seconds > average * SLOW_FACTOR)
+        if slow:
+            self._parallel = max(1, self._parallel // 2)
+        else:
+            self._parallel = min(MAX_PARALLEL, self._parallel + 1)
+        self._latency = (seconds if average is None
+                         else average + LATENCY_WEIGHT * (seconds - average))
 
     def _reap(self):
         """다 돈 질의 스레드를 거둔다.
@@ -152,26 +268,41 @@ class MetadataPrefetcher(QObject):
             alive.append(thread)
         self._retiring = alive
 
-    def _finish(self, url: str):
-        """묻던 항목 하나를 끝내고 다음으로 넘어간다."""
-        if url != self._current:
+    def _finish(self, url: str, measured: bool):
+        """묻던 항목 하나를 끝내고 빈자리를 채운다. measured면 걸린 시간을 셈에 넣는다.
+
+        걸린 시간은 같은 묶음에서 앞의 답이 온 때부터다. 묶음은 주소를 차례로
+        읽으므로, 그 간격이 곧 주소 하나를 묻는 데 든 시간이다.
+        """
+        thread = self._threads.pop(url, None)
+        if thread is None:
             return
-        self._thread = None
-        self._current = None
+        now = time.monotonic()
+        mark = self._marks.get(thread)
+        if measured and mark is not None:
+            self._note_latency(now - mark)
+        if thread in self._running():
+            self._marks[thread] = now
+        else:
+            self._marks.pop(thread, None)
         self._pump()
 
     def _on_loaded(self, url: str, metadata: dict):
-        if self._shutting_down:
+        if self._shutting_down or url not in self._threads:
             return
         wanted = self._is_wanted is None or self._is_wanted(url)
         if wanted:
             self._cache[url] = metadata
-        self._finish(url)
+        self._finish(url, measured=True)
         if wanted:
             self.loaded.emit(url, metadata)
 
     def _on_failed(self, url: str, reason: str):
-        """못 가져와도 알리지 않는다. 받을 때 DownloadThread가 다시 묻는다."""
+        """못 가져와도 알리지 않는다. 받을 때 DownloadThread가 다시 묻는다.
+
+        그만두게 한 것이 아니면 걸린 시간을 센다. 제한 시간을 넘겨 떨어진
+        질의야말로 줄여야 한다는 가장 분명한 표시다.
+        """
         if self._shutting_down:
             return
-        self._finish(url)
+        self._finish(url, measured=reason != ytdlp_run.ABORTED)
@@ -0,0 +1,85 @@
+"""받다 만 영상을 다음에 이어받도록 남겨 두는 작업 폴더.
+
+예전에는 `--force-overwrites`로 늘 처음부터 받았다. 대기열은 앱을 꺼도 남지만
+(queue_store), 되살린 항목은 0%부터 다시 시작했다 — 한 시간 반짜리 드라마가
+95%에서 끊기면 그 95%를 통째로 다시 받는다. 취소했다가 `재다운로드`를 눌러도
+마찬가지다.
+
+**영상마다 작업 폴더를 하나씩 둔다**(partial/<주소 해시>). yt-dlp에 `-P temp:`로
+넘기면 받는 중인 `.part`, 조각 위치를 적은 `.ytdl`, 합치기 전의 영상·음성 파일이
+모두 거기 쌓이고, 다 되면 저장 폴더로 옮겨진다. 그래서
+
+- 저장 폴더에는 받다 만 파일이 보이지 않고,
+- 다시 시작할 때 같은 폴더를 넘기면 yt-dlp가 `.ytdl`을 읽어 끊긴 조각부터
+  이어받는다. 이미 다 받은 영상 쪽은 건너뛰고 음성만 받는다.
+
+이름을 주소의 해시로 짓는 것은 폴더만 보고 어느 항목의 것인지 알아야 하기
+때문이다. 대기열 파일에 경로를 따로 적으면 둘 중 하나만 남는 일이 생긴다.
+
+**쓸모없어진 폴더는 켤 때 걷는다**(collect_stale). 대기열에 없는 항목의 것,
+그리고 PARTIAL_MAX_AGE_DAYS보다 오래된 것이다. 카드를 지우거나 대기열에서 뺄
+때마다 지우지 않는 것은, 같은 실행 안에서 `재다운로드`를 누르면 그것을 이어받을
+수 있어야 해서다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable
+
+PARTIAL_ROOT = Path("partial")
+
+PARTIAL_MAX_AGE_DAYS = 14
+"""이보다 오래 손대지 않은 작업 폴더는 대기열에 남아 있어도 버린다.
+
+TVer 회차는 대개 1~2주 뒤에 내려간다. 그보다 오래된 조각은 이어받을 곳이 없어
+자리만 차지한다. 한 편이 수 GB라 남겨 둔 것을 잊으면 디스크가 금방 찬다."""
+
+
+def _key(url: str) -> str:
+    """작업 폴더 이름. 경로 길이 제한(260자) 때문에 짧게 자른다."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def scratch_dir(url: str) -> Path:
+    """이 주소의 작업 폴더. 만들지는 않는다."""
+    return (PARTIAL_ROOT / _key(url)).resolve()
+
+
+def has_partial(url: str) -> bool:
+    """이어받을 것이 남아 있는지. 빈 폴더는 없는 것으로 본다."""
+    folder = scratch_dir(url)
+    try:
+        return folder.is_dir() and any(folder.iterdir())
+    except OSError:
+        return False
+
+
+def discard(url: str) -> None:
+    """이 주소의 작업 폴더를 지운다. 다 받았거나 더 이어받을 일이 없을 때."""
+    shutil.rmtree(scratch_dir(url), ignore_errors=True)
+
+
+def collect_stale(keep_urls: Iterable[str], max_age_days: float = PARTIAL_MAX_AGE_DAYS) -> int:
+    """keep_urls에 없는 것과 너무 오래된 작업 폴더를 지운다. 지운 개수를 돌려준다."""
+    if not PARTIAL_ROOT.is_dir():
+        return 0
+    keep = {_key(url) for url in keep_urls}
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for folder in PARTIAL_ROOT.iterdir():
+        if not folder.is_dir():
+            continue
+        try:
+            touched = max([folder.stat().st_mtime]
+                          + [p.stat().st_mtime for p in folder.iterdir()])
+        except OSError:
+            continue
+        if folder.name in keep and touched >= cutoff:
+            continue
+        shutil.rmtree(folder, ignore_errors=True)
+        removed += 1
+    return removed
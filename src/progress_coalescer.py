@@ -0,0 +1,87 @@
+"""진행률을 항목별로 모았다가 정해진 간격으로 한꺼번에 내보내는 곳.
+
+yt-dlp는 `--newline`으로 돌아 진행률을 줄마다 찍고, DownloadThread는 그 줄마다
+progress를 보낸다. 예전에는 그 하나하나가 곧장 progress_updated로 나가 카드를
+찾아(목록을 처음부터 훑었다) 진행 막대 애니메이션을 새로 걸었다. 조각을 여럿
+함께 받으면 한 편이 초당 수십 줄을 내고, 스무 편을 함께 받으면 UI 스레드가
+그것만 하다가 창이 굳는다. 사람 눈에는 초당 열 번이면 충분히 매끄럽다.
+
+그래서 **두 갈래로 나눈다.**
+
+- 곧바로 보낼 것(immediate): 상태가 바뀐 순간(`다운로드 중` → `후처리 중`),
+  로그 줄, 제목·표지 그림·최종 경로. 늦게 가면 카드의 글과 로그 순서가 어긋나고,
+  `오류`가 100ms 늦게 뜨는 사이 사용자가 누른 재시도가 엇갈린다.
+- 모았다가 보낼 것(batch): 나머지 — 같은 상태 안에서 바뀌는 percent·speed·eta.
+  항목마다 마지막 값으로 덮어 두었다가 FLUSH_INTERVAL_MS마다 {url: payload}
+  하나로 내보낸다.
+
+곧바로 보낼 때는 그 항목에 모아 둔 것을 **먼저 합쳐서** 함께 보낸다. 모아 둔 것이
+나중에 따로 나가면, 이미 `변환 대기`로 바뀐 카드에 묵은 `다운로드 중`이 덮인다.
+
+UI 스레드에서만 쓴다. 진행률은 스레드 사이 시그널로 이미 UI 스레드에 건너온 뒤다.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+FLUSH_INTERVAL_MS = 100
+"""모아 둔 진행률을 내보내는 간격(초당 10번).
+
+진행 막대 애니메이션이 한 번에 이보다 길게 돌아서, 더 자주 보내도 눈에 보이는
+차이가 없다. 더 길게 잡으면 속도·남은 시간 글자가 뚝뚝 끊겨 보인다."""
+
+IMMEDIATE_KEYS = frozenset({"log", "title", "thumbnail", "final_filepath"})
+"""들어 있으면 모으지 않고 곧바로 보내는 칸."""
+
+
+class ProgressCoalescer(QObject):
+    """항목별 진행률을 모아 두었다가 묶어서 내보낸다."""
+
+    immediate = pyqtSignal(str, dict)
+    """(url, payload). 상태가 바뀌었거나 로그·제목처럼 늦으면 안 되는 것."""
+    batch = pyqtSignal(dict)
+    """{url: payload}. 같은 상태 안에서 바뀐 값을 항목마다 마지막 것만 담는다."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_status: Dict[str, str] = {}
+        self._timer = QTimer(self)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, url: str, payload: Dict[str, Any], urgent: bool = False):
+        """payload 하나를 받는다. urgent면 모으지 않고 곧바로 보낸다."""
+        status = payload.get("status")
+        if (urgent or not IMMEDIATE_KEYS.isdisjoint(payload)
+                or (status is not None and status != self._last_status.get(url))):
+            merged = self._pending.pop(url, {})
+            merged.update(payload)
+            if status is not None:
+                self._last_status[url] = status
+            self.immediate.emit(url, merged)
+            return
+        self._pending.setdefault(url, {}).update(payload)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """모아 둔 것을 모두 내보낸다. 비었으면 타이머를 멈춘다."""
+        if not self._pending:
+            self._timer.stop()
+            return
+        pending, self._pending = self._pending, {}
+        self.batch.emit(pending)
+
+    def forget(self, url: str):
+        """끝난 항목을 잊는다. 다시 받으면 첫 상태부터 곧바로 나가게 한다."""
+        self._pending.pop(url, None)
+        self._last_status.pop(url, None)
+
+    def clear(self):
+        self._pending.clear()
+        self._last_status.clear()
+        self._timer.stop()
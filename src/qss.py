@@ -128,6 +128,10 @@ FILENAME_PART_COLORS = {
 쪽에 얹혀도 명암비가 5를 넘는다.
 """
 
+CARD_SELECT_MIX = 0.18
+"""고른 카드에 까는 색의 비율. 카드 바탕에 탭별 포인트 컬러를 섞는다. 기록 목록은
+QSS 대신 HistoryItemDelegate가 이 값으로 직접 칠한다."""
+
 FILENAME_ROW_SELECT_MIX = 0.16
 """구성 요소 목록에서 고른 행에 까는 색의 비율. 창 배경에 accent를 섞는다.
 
@@ -189,9 +193,8 @@ def build_qss(theme: str = "dark") -> str:
     colors = palette(theme)
     ind = indicator_images(theme, colors)
 
-    tint_dl = blend(colors["ctx_download"], colors["surface"], 0.18)
-    tint_hi = blend(colors["ctx_history"], colors["surface"], 0.18)
-    tint_fa = blend(colors["ctx_favorites"], colors["surface"], 0.18)
+    tint_dl = blend(colors["ctx_download"], colors["surface"], CARD_SELECT_MIX)
+    tint_fa = blend(colors["ctx_favorites"], colors["surface"], CARD_SELECT_MIX)
 
     order_sel = blend(colors["accent"], colors["bg"], FILENAME_ROW_SELECT_MIX)
 
@@ -531,7 +534,7 @@ def build_qss(theme: str = "dark") -> str:
     #EmptyStateText {{ font-size: {fs_sub}px; font-weight: 400; color: {colors["text_dim"]}; }}
 
     /* 리스트 */
-    QListWidget#DownloadList, QListWidget#HistoryList, QListWidget#FavoritesList {{
+    QListWidget#DownloadList, QListView#HistoryList, QListWidget#FavoritesList {{
         background: {colors["bg"]};
         border: 1px solid {colors["border"]};
         border-radius: 8px;
@@ -542,25 +545,26 @@ def build_qss(theme: str = "dark") -> str:
 
        고른 행에 생기던 사각 자국은 여기서 고칠 수 없다. 그것은 배경이 아니라
        초점 사각형이고, `outline: none`을 넣어 봐야 그대로 그려진다(실측).
-       `NoFocusDelegate`(src/widgets.py)가 맡는다. */
-    QListWidget#DownloadList::item, QListWidget#HistoryList::item,
+       `NoFocusDelegate`(src/widgets.py)가 맡는다.
+
+       기록 목록은 여기에 없다. 카드 위젯 없이 `HistoryItemDelegate`(src/history_view.py)가
+       행을 통째로 칠하므로 ::item 규칙이 닿지 않는다. 같은 색을 palette에서 가져다 쓴다. */
+    QListWidget#DownloadList::item,
     QListWidget#FavoritesList::item {{ background: transparent; border-radius: 10px; }}
     QListWidget#DownloadList::item:selected {{ background: {tint_dl}; }}
-    QListWidget#HistoryList::item:selected {{ background: {tint_hi}; }}
     QListWidget#FavoritesList::item:selected {{ background: {tint_fa}; }}
 
-    /* 카드 — 세 목록이 같은 모양을 쓴다 */
-    #DownloadItem, #HistoryItem, #FavoriteItem {{
+    /* 카드 — 세 목록이 같은 모양을 쓴다(기록은 HistoryItemDelegate가 같은 모양으로 칠한다) */
+    #DownloadItem, #FavoriteItem {{
         background: {colors["surface"]};
         border: 1px solid {colors["border"]};
         border-radius: 10px;
     }}
-    #DownloadItem:hover, #HistoryItem:hover, #FavoriteItem:hover {{
+    #DownloadItem:hover, #FavoriteItem:hover {{
         border-color: {colors["border_strong"]};
     }}
     /* 선택은 탭별 포인트 컬러로. 옅은 배경 + 테두리라 글자 대비를 해치지 않는다. */
     #DownloadItem[selected="true"] {{ background: {tint_dl}; border: 1px solid {colors["ctx_download"]}; }}
-    #HistoryItem[selected="true"] {{ background: {tint_hi}; border: 1px solid {colors["ctx_history"]}; }}
     #FavoriteItem[selected="true"] {{ background: {tint_fa}; border: 1px solid {colors["ctx_favorites"]}; }}
 
     QLabel#Title {{ font-size: {fs_card}px; font-weight: 500; color: {colors["text"]}; }}
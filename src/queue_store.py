@@ -11,8 +11,12 @@
 번의 조작만으로 백업이 50벌 쌓이고 그중 어느 것도 다시 볼 일이 없다.
 
 **쓰기는 동기다.** 마지막 한 번이 앱을 끝내기 직전(stop_all)에 일어나는데,
-다른 스레드에 맡기면 그 쓰기가 끝나기 전에 프로세스가 사라진다. 남길 것이 몇
-KB뿐이라 그 자리에서 써도 눈에 띄지 않는다.
+다른 스레드에 맡기면 그 쓰기가 끝나기 전에 프로세스가 사라진다.
+
+**파일 전체가 아니라 바뀐 것만 일지에 덧붙인다**(store_journal). 받은 정도가
+바뀔 때마다 저장이 불려, 수백 개를 걸어 두면 몇 초마다 대기열 전체를 다시 썼다.
+지난번 저장과 견주어 빠진 것·새로 들었거나 바뀐 것·차례가 바뀐 것만 적는다.
+일지를 queue.json으로 접는 일만 다른 스레드에서 한다.
 """
 
 from __future__ import annotations
@@ -21,12 +25,24 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
+from src.store_journal import StoreJournal, write_json_atomic
+
 
 def _text(value: Any) -> str:
     """글이 아닌 것이 들어 있으면 빈 글로 본다."""
     return value if isinstance(value, str) else ""
 
 
+def _percent(value: Any) -> int:
+    """받은 정도(0~100). 숫자가 아니면 0으로 본다.
+
+    이어받기(partial_store)가 생기며 함께 적게 된 값이다. 그전 파일에는 없다.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return max(0, min(100, int(value)))
+
+
 class QueueStore:
     """대기열에 남은 항목을 담고, 파일과 주고받는다."""
 
@@ -35,24 +51,57 @@ class QueueStore:
     def __init__(self, path: str = DEFAULT_PATH):
         self.path = path
         self._items: List[Dict[str, str]] = []
+        self._saved: List[Dict[str, str]] = []
+        """마지막으로 파일(스냅숏 + 일지)에 남긴 상태. save()가 이것과 견준다."""
+        self._journal = StoreJournal(path)
 
     def load(self) -> bool:
-        """파일을 읽는다. 읽지 못하면 빈 채로 열되 실패를 알린다.
+        """파일을 읽고 일지를 다시 적용한다. 읽지 못하면 빈 채로 열되 실패를 알린다.
 
         없는 파일과 깨진 파일을 가른다. 없는 것은 대기열이 비어 있었다는 뜻이라
-        정상이고, 깨진 것은 부르는 쪽이 로그에 남길 만한 일이다.
+        정상이고, 깨진 것은 부르는 쪽이 로그에 남길 만한 일이다. 파일이 깨졌어도
+        일지는 적용한다 — 일지에 남은 만큼은 살린다.
         """
         target = Path(self.path)
-        if not target.exists():
-            self._items = []
-            return True
-        try:
-            raw = json.loads(target.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
-            self._items = []
-            return False
-        self._items = self._clean(raw)
-        return True
+        ok = True
+        raw: Any = []
+        if target.exists():
+            try:
+                raw = json.loads(target.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+                raw, ok = [], False
+        items = self._clean(raw)
+        for op in self._journal.read():
+            items = self._apply(items, op)
+        self._items = self._clean(items)
+        self._saved = list(self._items)
+        return ok
+
+    @staticmethod
+    def _apply(items: List[Dict[str, str]], op: Dict[str, Any]) -> List[Dict[str, str]]:
+        """일지 한 줄을 적용한 새 목록. 같은 줄을 두 번 적용해도 결과가 같다.
+
+        put은 이미 있는 항목이면 그 자리에서 고치고, 없으면 맨 뒤에 붙인다.
+        order는 주소 차례를 통째로 준다. 거기 없는 항목은 원래 차례대로 뒤에 둔다.
+        """
+        kind = op.get("op")
+        if kind == "replace":
+            return QueueStore._clean(op.get("items"))
+        if kind == "remove":
+            return [item for item in items if item.get("url") != op.get("url")]
+        if kind == "put":
+            cleaned = QueueStore._clean([op.get("item")])
+            if not cleaned:
+                return items
+            new = cleaned[0]
+            out = [new if item.get("url") == new["url"] else item for item in items]
+            if not any(item.get("url") == new["url"] for item in items):
+                out.append(new)
+            return out
+        if kind == "order" and isinstance(op.get("urls"), list):
+            rank = {url: i for i, url in enumerate(op["urls"]) if isinstance(url, str)}
+            return sorted(items, key=lambda item: rank.get(item.get("url"), len(rank)))
+        return items
 
     @staticmethod
     def _clean(raw: Any) -> List[Dict[str, str]]:
@@ -78,7 +127,9 @@ class QueueStore:
             seen.add(url)
             out.append({"url": url,
                         "title": _text(item.get("title")),
-                        "thumbnail": _text(item.get("thumbnail"))})
+                        "thumbnail": _text(item.get("thumbnail")),
+                        "percent": _percent(item.get("percent")),
+                        "fragment": _text(item.get("fragment"))})
         return out
 
     def entries(self) -> List[Dict[str, str]]:
@@ -95,22 +146,53 @@ class QueueStore:
         self._items = self._clean(list(items))
 
     def save(self) -> bool:
-        """지금 담긴 것을 파일에 쓴다. 성공 여부를 돌려준다.
+        """지난번 저장에서 바뀐 것을 일지에 덧붙인다. 성공 여부를 돌려준다.
 
-        임시 파일에 썼다가 바꿔치기한다. 이 파일은 앱을 끝내는 길목에서 쓰이므로
-        쓰는 도중에 프로세스가 사라지는 일이 실제로 일어날 수 있는데, 그때 반쯤
-        쓰인 파일이 남으면 다음 실행에서 대기열을 통째로 못 읽는다.
+        일지에 쓰지 못하면 그 자리에서 파일 전체를 쓴다. 전체는 임시 파일에
+        썼다가 바꿔치기한다. 이 파일은 앱을 끝내는 길목에서 쓰이므로 쓰는 도중에
+        프로세스가 사라지는 일이 실제로 일어날 수 있는데, 그때 반쯤 쓰인 파일이
+        남으면 다음 실행에서 대기열을 통째로 못 읽는다.
         """
-        target = Path(self.path)
-        tmp = target.with_suffix(".tmp")
-        try:
-            tmp.write_text(json.dumps(self._items, ensure_ascii=False, indent=2),
-                           encoding="utf-8")
-            tmp.replace(target)
+        ops = self._diff(self._saved, self._items)
+        if not ops:
             return True
-        except OSError:
-            try:
-                tmp.unlink(missing_ok=True)
-            except OSError:
-                pass
-            return False
+        if not self._journal.append(ops):
+            if not self._journal.compact_now(self._snapshot_writer()):
+                return False
+        elif self._journal.needs_compaction():
+            self._journal.compact(self._snapshot_writer())
+        self._saved = list(self._items)
+        return True
+
+    @classmethod
+    def _diff(cls, old: List[Dict[str, str]], new: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """old를 new로 만드는 일지 줄. 줄이 항목 수보다 많아지면 replace 하나로 낸다.
+
+        받은 정도가 바뀐 것은 put 한 줄이다. 차례는 빼고 붙인 뒤에도 어긋날 때와
+        **새 주소가 들어올 때** order로 적는다.
+
+        새 주소의 put은 '맨 뒤에 붙여라'라서, 적을 때 마침 맨 뒤가 맞았어도 다른
+        상태 위에 다시 적용하면 엉뚱한 자리에 선다. 떼어 둔 일지(.folding)를 지우지
+        못한 채 스냅숏을 새로 썼다면, 다음 실행은 그 일지를 **자기보다 새 스냅숏 위에**
+        다시 적용한다. 그때 [u1, u5]가 [u5, u1]로 돌아왔다. 뒤따르는 order가 그 자리를
+        주소 차례로 못박아 두면 어느 상태 위에 적용해도 같은 차례가 된다.
+        """
+        new_urls = {item["url"] for item in new}
+        ops: List[Dict[str, Any]] = [{"op": "remove", "url": item["url"]}
+                                     for item in old if item["url"] not in new_urls]
+        before = {item["url"]: item for item in old}
+        ops += [{"op": "put", "item": item} for item in new if before.get(item["url"]) != item]
+        added = any(item["url"] not in before for item in new)
+        applied = old
+        for op in ops:
+            applied = cls._apply(applied, op)
+        if added or [item["url"] for item in applied] != [item["url"] for item in new]:
+            ops.append({"op": "order", "urls": [item["url"] for item in new]})
+        if len(ops) > max(1, len(new)):
+            return [{"op": "replace", "items": new}]
+        return ops
+
+    def _snapshot_writer(self):
+        """지금 담긴 것을 복사해 두고, 그것을 queue.json에 쓰는 함수를 돌려준다."""
+        items = [dict(item) for item in self._items]
+        return lambda: write_json_atomic(self.path, items)
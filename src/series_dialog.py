@@ -10,31 +10,34 @@ from PyQt6.QtWidgets import (
 from src.widgets import start_thumbnail_download, THUMBNAIL_CACHE_DIR
 
 class SeriesSelectionDialog(QDialog):
-    """시리즈의 에피소드 목록을 보여주고 사용자가 다운로드할 항목을 선택하게 하는 다이얼로그."""
+    """시리즈의 에피소드 목록을 보여주고 사용자가 다운로드할 항목을 선택하게 하는 다이얼로그.
 
-    def __init__(self, episode_info: List[Dict[str, str]], parent=None):
+    loading=True로 열면 분석이 끝나기 전에 뜬다. 회차는 찾는 대로 add_episodes로
+    붙고, 분석이 끝나면 finish_loading이 불린다. 최신 회차 두어 개만 받으려는
+    사람은 나머지를 기다리지 않고 골라 넣을 수 있다.
+    """
+
+    def __init__(self, episode_info: List[Dict[str, str]], parent=None, loading: bool = False):
         super().__init__(parent)
         self.setWindowTitle("시리즈 에피소드 선택")
         self.setMinimumSize(720, 540)
 
         self._pending_thumbs: Dict[str, List[tuple[QListWidgetItem, Path]]] = {}
+        self._episodes: Dict[str, Dict[str, str]] = {}
+        self.loading = loading
+        self._new_state = Qt.CheckState.Checked
+        """새로 붙는 회차의 체크 상태. 마지막으로 누른 전체 선택·해제를 따른다."""
         THUMBNAIL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
         root = QVBoxLayout(self); root.setContentsMargins(16, 16, 16, 16); root.setSpacing(10)
-        desc_label = QLabel(f"다운로드할 에피소드를 선택하세요. (총 {len(episode_info)}개)"); root.addWidget(desc_label)
+        self.desc_label = QLabel(); root.addWidget(self.desc_label)
 
         self.list_widget = QListWidget()
         self.list_widget.setViewMode(QListWidget.ViewMode.ListMode)
         self.list_widget.setIconSize(QSize(128, 72))
         root.addWidget(self.list_widget, 1)
 
-        for episode in episode_info:
-            item = QListWidgetItem(episode["title"])
-            item.setData(Qt.ItemDataRole.UserRole, episode["url"])
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(Qt.CheckState.Checked)
-            self.list_widget.addItem(item)
-            self._load_or_download_thumbnail(item, episode)
+        self.add_episodes(episode_info)
 
         button_layout = QHBoxLayout()
         self.select_all_btn = QPushButton("전체 선택")
@@ -51,6 +54,42 @@ class SeriesSelectionDialog(QDialog):
         self.dialog_buttons.accepted.connect(self.accept)
         self.dialog_buttons.rejected.connect(self.reject)
 
+    def add_episodes(self, episode_info: List[Dict[str, str]]):
+        """회차를 목록 끝에 붙인다. 이미 있는 주소는 건너뛴다.
+
+        새로 붙은 것은 체크된 채로 서되, 찾는 도중에 '전체 해제'를 눌렀으면 해제된
+        채로 선다. 두어 개만 고르려고 모두 풀어 둔 사이에 뒤늦게 온 회차가 체크된
+        채 끼어들면, 모르고 누른 확인이 그것까지 넣는다.
+        """
+        for episode in episode_info:
+            url = episode.get("url")
+            if not url or url in self._episodes:
+                continue
+            self._episodes[url] = episode
+            item = QListWidgetItem(episode.get("title") or url)
+            item.setData(Qt.ItemDataRole.UserRole, url)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(self._new_state)
+            self.list_widget.addItem(item)
+            self._load_or_download_thumbnail(item, episode)
+        self._update_description()
+
+    def finish_loading(self, episode_info: List[Dict[str, str]]):
+        """분석이 끝났다. 도중에 알리지 못한 회차가 있으면 마저 붙인다."""
+        self.loading = False
+        self.add_episodes(episode_info)
+
+    def episodes(self) -> Dict[str, Dict[str, str]]:
+        """목록에 있는 회차(주소 → 분석이 준 정보)."""
+        return dict(self._episodes)
+
+    def _update_description(self):
+        count = len(self._episodes)
+        if self.loading:
+            self.desc_label.setText(f"다운로드할 에피소드를 선택하세요. ({count}개 · 나머지를 찾는 중…)")
+        else:
+            self.desc_label.setText(f"다운로드할 에피소드를 선택하세요. (총 {count}개)")
+
     def _load_or_download_thumbnail(self, item: QListWidgetItem, episode_meta: Dict[str, str]):
         thumb_url = episode_meta.get("thumbnail_url")
         if not thumb_url: return
@@ -87,6 +126,7 @@ class SeriesSelectionDialog(QDialog):
     def _toggle_all_checkboxes(self, check: bool = True):
         """목록의 모든 체크박스 상태를 변경합니다."""
         state = Qt.CheckState.Checked if check else Qt.CheckState.Unchecked
+        self._new_state = state
         for i in range(self.list_widget.count()):
             self.list_widget.item(i).setCheckState(state)
 
@@ -0,0 +1,117 @@
+"""즐겨찾기 시리즈마다 지난번 확인에서 본 회차를 적어 두는 곳.
+
+즐겨찾기 확인은 시리즈마다 `yt-dlp -J`로 회차를 **하나하나 열어** 제목과 표지
+그림을 받은 뒤에야 기록(HistoryStore)과 대조했다. 70화짜리 시리즈에 새 회차가
+하나 올라왔어도 70번을 연다. 즐겨찾기가 스무 개면 시작할 때마다 그것을 스무 번
+한다.
+
+여기 적어 둔 것이 있으면 확인은 회차 목록만 훑고(`--flat-playlist`, 회차를 열지
+않는다) 여기에 없는 회차만 연다(SeriesParseThread._run_incremental). 이미 아는
+회차의 제목·표지 그림은 여기서 꺼내 쓴다. 그래서 확인 결과는 예전과 같은 회차
+목록이고, 기록과 대조하는 쪽(on_fav_check_parsed)은 달라지는 것이 없다.
+
+QueueStore처럼 백업을 두지 않는다. 잃어도 다음 확인이 예전처럼 전부 열어 보고
+다시 채운다.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+class SeriesIndexStore:
+    """시리즈 주소 → 그 시리즈에서 본 회차(주소 → 제목·표지 그림)."""
+
+    DEFAULT_PATH = "series_index.json"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._data: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> bool:
+        """파일을 읽는다. 없으면 빈 채로, 깨졌으면 빈 채로 열되 False."""
+        target = Path(self.path)
+        if not target.exists():
+            self._data = {}
+            return True
+        try:
+            raw = json.loads(target.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            self._data = {}
+            return False
+        self._data = {}
+        if isinstance(raw, dict):
+            for series_url, record in raw.items():
+                if isinstance(series_url, str) and isinstance(record, dict):
+                    self._data[series_url] = {
+                        "title": _text(record.get("title")),
+                        "checked": _text(record.get("checked")),
+                        "episodes": self._clean_episodes(record.get("episodes")),
+                    }
+        return True
+
+    @staticmethod
+    def _clean_episodes(raw: Any) -> Dict[str, Dict[str, str]]:
+        if not isinstance(raw, dict):
+            return {}
+        return {url: {"title": _text(meta.get("title")),
+                      "thumbnail_url": _text(meta.get("thumbnail_url"))}
+                for url, meta in raw.items()
+                if isinstance(url, str) and url and isinstance(meta, dict)}
+
+    def known(self, series_url: str) -> Dict[str, Dict[str, str]]:
+        """이 시리즈에서 본 회차. 한 번도 확인하지 않았으면 빈 dict.
+
+        작업 스레드에 넘기는 것이라 사본을 준다.
+        """
+        record = self._data.get((series_url or "").strip())
+        if not record:
+            return {}
+        return {url: dict(meta) for url, meta in record["episodes"].items()}
+
+    def title(self, series_url: str) -> str:
+        record = self._data.get((series_url or "").strip())
+        return record["title"] if record else ""
+
+    def update(self, series_url: str, series_title: str,
+               episodes: Iterable[Dict[str, str]]) -> None:
+        """이번 확인에서 본 회차로 갈아 끼운다. 파일에 쓰는 일은 save()가 한다.
+
+        목록에서 빠진 회차(방송 기간이 끝나 내려간 것)는 함께 지운다. 남겨 두면
+        인기 시리즈는 몇 년 치 회차가 끝없이 쌓인다.
+        """
+        url = (series_url or "").strip()
+        if not url:
+            return
+        self._data[url] = {
+            "title": series_title or self.title(url),
+            "checked": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "episodes": self._clean_episodes(
+                {ep.get("url"): ep for ep in episodes if isinstance(ep, dict)}),
+        }
+
+    def forget(self, series_url: str) -> None:
+        self._data.pop((series_url or "").strip(), None)
+
+    def save(self) -> bool:
+        """지금 담긴 것을 파일에 쓴다. 임시 파일에 쓰고 바꿔치기한다."""
+        target = Path(self.path)
+        tmp = target.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(self._data, ensure_ascii=False, indent=2),
+                           encoding="utf-8")
+            tmp.replace(target)
+            return True
+        except OSError:
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return False
@@ -1,11 +1,20 @@
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Tuple
+from urllib.parse import urlsplit
+
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from src import connection_budget
+from src.series_index_store import SeriesIndexStore
 from src.threads.series_parse_thread import SeriesParseThread
 
 class SeriesParser(QObject):
     log = pyqtSignal(str, str)
     finished = pyqtSignal(str, str, str, list)
+    progress = pyqtSignal(str, str, str, list)
+    """(맥락, 시리즈 주소, 시리즈 제목, 찾은 회차 일부). 분석 도중 찾는 대로 나간다.
+
+    같은 시리즈의 finished는 그 뒤에 전체 목록으로 한 번 더 나간다. 도중 것을
+    모으지 않는 쪽은 finished만 보면 된다."""
 
     USER_CONTEXTS = ("single", "bulk", "fav-add-check")
     """사용자가 방금 요청한 분석. 배경으로 도는 즐겨찾기 확인보다 앞에 세운다."""
@@ -13,14 +22,37 @@ class SeriesParser(QObject):
     TITLE_ONLY_CONTEXTS = ("fav-add-check",)
     """제목만 있으면 되는 분석. 회차 목록을 훑지 않아 몇 초 만에 끝난다."""
 
+    INCREMENTAL_CONTEXTS = ("fav-check",)
+    """지난번 회차 목록(SeriesIndexStore)과 견주어 새 회차만 여는 분석.
+
+    즐겨찾기 확인만 그렇게 한다. 사용자가 넣은 시리즈는 대개 처음 보는 것이라
+    견줄 목록이 없고, 있더라도 그 자리에서 고를 회차를 빠짐없이 보여 줘야 한다.
+    """
+
+    MAX_PARALLEL = 4
+    """함께 도는 분석 수의 상한.
+
+    하나씩 돌 때는 즐겨찾기 수백 개를 확인하는 데 수십 분이 걸렸다. 분석 하나는
+    대부분 TVer의 답을 기다리는 시간이라 몇 개를 겹치면 그만큼 빨리 끝난다.
+    yt-dlp를 부를 때마다 연결 주머니(connection_budget)에서 칸을 빌리므로,
+    여기서 더 늘려도 다운로드 몫을 빼앗지는 않고 주머니 앞에서 기다릴 뿐이다."""
+
+    BACKGROUND_WHILE_DOWNLOADING = 1
+    """받는 중일 때 함께 돌리는 즐겨찾기 확인 수. MetadataPrefetcher와 같은 셈이다.
+
+    받는 쪽과 같은 회선을 나눠 쓴다. 확인은 조금 늦어져도 되지만 받는 속도가
+    떨어지면 사용자가 바로 안다."""
+
     def __init__(self, ytdlp_path: str, config: Dict, parent=None):
         super().__init__(parent)
         self.ytdlp_path = ytdlp_path
         self.config = config
+        self.index = SeriesIndexStore()
+        self.index.load()
+        self._index_dirty = False
         self._queue: List[Tuple[str, str]] = []
-        self._thread: Optional[SeriesParseThread] = None
-        self._current_context: str = ""
-        self._current_url: str = ""
+        self._threads: Dict[SeriesParseThread, Tuple[str, str]] = {}
+        """도는 분석 → (맥락, 주소). 양보하라고 세운 것도 끝날 때까지 남는다."""
 
     def set_ytdlp_path(self, path: str):
         self.ytdlp_path = path
@@ -33,6 +65,7 @@ class SeriesParser(QObject):
 
         즐겨찾기를 여러 개 확인하는 중에는 대기열이 길어서, 그냥 뒤에 붙이면
         방금 붙여넣은 시리즈가 몇 분씩 밀린다. 사용자가 기다리는 쪽을 먼저 돌린다.
+        자리가 다 찼으면 도는 즐겨찾기 확인 하나를 세워 자리를 내준다(_preempt).
         """
         if not self.ytdlp_path:
             self.log.emit(context, "[오류] yt-dlp 경로가 설정되지 않아 시리즈를 분석할 수 없습니다.")
@@ -40,10 +73,7 @@ class SeriesParser(QObject):
 
         items = [(context, url) for url in urls]
         if context in self.USER_CONTEXTS:
-            insert_at = 0
-            while (insert_at < len(self._queue)
-                   and self._queue[insert_at][0] in self.USER_CONTEXTS):
-                insert_at += 1
+            insert_at = self._user_waiting()
             self._queue[insert_at:insert_at] = items
         else:
             self._queue.extend(items)
@@ -54,24 +84,145 @@ class SeriesParser(QObject):
         """대기 중인 분석 건수(진행 중인 것은 제외)."""
         return len(self._queue)
 
+    def is_busy(self) -> bool:
+        """분석이 하나라도 돌고 있다."""
+        return bool(self._threads)
+
+    def _user_waiting(self) -> int:
+        """대기열 맨 앞에 선 사용자 요청 수."""
+        count = 0
+        while count < len(self._queue) and self._queue[count][0] in self.USER_CONTEXTS:
+            count += 1
+        return count
+
+    def _active(self) -> List[SeriesParseThread]:
+        """양보하라고 세우지 않은, 제 일을 하고 있는 분석."""
+        return [thread for thread in self._threads if not thread.stopped]
+
+    def _background_limit(self) -> int:
+        if connection_budget.shared().downloading():
+            return self.BACKGROUND_WHILE_DOWNLOADING
+        return self.MAX_PARALLEL
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _next_background(self) -> int:
+        """다음에 돌릴 즐겨찾기 확인의 대기열 위치. 없으면 -1.
+
+        도는 확인이 가장 적은 호스트의 것을 먼저 고른다. 같으면 먼저 들어온 것.
+        호스트 하나에 몰린 즐겨찾기가 대기열 앞을 차지해도 다른 호스트의 확인이
+        그 뒤에 줄줄이 밀리지 않고, 한 서버에 동시에 거는 분석 수도 고르게 퍼진다.
+        """
+        running: Dict[str, int] = {}
+        for thread in self._active():
+            host = self._host(self._threads[thread][1])
+            running[host] = running.get(host, 0) + 1
+        best, best_load = -1, None
+        for position, (context, url) in enumerate(self._queue):
+            if context in self.USER_CONTEXTS:
+                continue
+            load = running.get(self._host(url), 0)
+            if best_load is None or load < best_load:
+                best, best_load = position, load
+                if load == 0:
+                    break
+        return best
+
     def _run_next(self):
-        if self._thread is not None or not self._queue:
-            return
-        self._current_context, self._current_url = self._queue.pop(0)
-        exclude_keywords = self.config.get("series_exclude_keywords", [])
-        self._thread = SeriesParseThread(
-            self._current_url, self.ytdlp_path, exclude_keywords,
-            title_only=self._current_context in self.TITLE_ONLY_CONTEXTS)
-        self._thread.log.connect(lambda msg: self.log.emit(self._current_context, msg))
-        self._thread.finished.connect(self._on_parse_finished)
-        self._thread.start()
+        """자리가 나는 만큼 분석을 띄운다.
 
-    def _on_parse_finished(self, series_title: str, episode_urls: List[str]):
-        """스레드 완료 시 결과를 finished 시그널로 보내고 다음 작업을 시작합니다."""
-        self.finished.emit(self._current_context, self._current_url, series_title, episode_urls or [])
+        사용자 요청은 MAX_PARALLEL까지 곧바로 돌고, 자리가 모자라면 즐겨찾기 확인을
+        세워서라도 자리를 만든다. 즐겨찾기 확인은 남은 자리 가운데
+        _background_limit()까지만 쓴다.
+        """
+        while self._user_waiting():
+            if len(self._active()) >= self.MAX_PARALLEL and not self._preempt():
+                break
+            self._start(*self._queue.pop(0))
+        while len(self._active()) < self.MAX_PARALLEL:
+            background = [t for t in self._active()
+                          if self._threads[t][0] not in self.USER_CONTEXTS]
+            if len(background) >= self._background_limit():
+                break
+            position = self._next_background()
+            if position < 0:
+                break
+            self._start(*self._queue.pop(position))
+        if not self._queue and not self._threads:
+            self._save_index()
+
+    def _preempt(self) -> bool:
+        """가장 늦게 시작한 즐겨찾기 확인을 세우고 대기열 앞(사용자 요청 뒤)에 되돌린다.
+
+        늦게 시작한 것일수록 버리는 일이 적다. 세운 분석은 프로세스를 죽이고 곧
+        finished를 내는데, _on_parse_finished가 stopped를 보고 결과로 치지 않는다.
+        되돌린 확인은 회차 캐시 덕에 이미 연 회차를 다시 열지 않는다.
+        """
+        background = [t for t in self._active() if self._threads[t][0] not in self.USER_CONTEXTS]
+        if not background:
+            return False
+        victim = background[-1]
+        victim.stop()
+        context, url = self._threads[victim]
+        insert_at = self._user_waiting()
+        self._queue.insert(insert_at, (context, url))
+        self.log.emit(context, f"[시리즈] 먼저 요청한 분석에 자리를 내주고 잠시 미룹니다: {url}")
+        return True
+
+    def _start(self, context: str, url: str):
+        exclude_keywords = self.config.get("series_exclude_keywords", [])
+        incremental = context in self.INCREMENTAL_CONTEXTS
+        thread = SeriesParseThread(
+            url, self.ytdlp_path, exclude_keywords,
+            title_only=context in self.TITLE_ONLY_CONTEXTS,
+            known=self.index.known(url) if incremental else None)
+        self._threads[thread] = (context, url)
+        thread.log.connect(lambda msg, ctx=context: self.log.emit(ctx, msg))
+        thread.entries.connect(
+            lambda title, episodes, t=thread: self._on_entries(t, title, episodes))
+        thread.finished.connect(
+            lambda title, episodes, t=thread: self._on_parse_finished(t, title, episodes))
+        thread.start()
+
+    def _on_entries(self, thread: SeriesParseThread, series_title: str, episodes: list):
+        if thread.stopped or thread not in self._threads:
+            return
+        context, url = self._threads[thread]
+        self.progress.emit(context, url, series_title, episodes)
 
-        if self._thread:
-            self._thread.deleteLater()
-            self._thread = None
+    def _on_parse_finished(self, thread: SeriesParseThread, series_title: str,
+                           episode_urls: List[str]):
+        """끝난 분석의 결과를 finished로 보내고 빈자리를 채운다.
 
+        finished는 **끝난 차례대로** 나간다. 넣은 차례를 지키려고 앞의 것을 기다리면
+        오래 걸리는 시리즈 하나 뒤에서 나머지 결과가 모두 묶인다. 받는 쪽
+        (on_fav_check_parsed)은 시리즈마다 따로 처리하므로 차례에 기대지 않는다.
+        """
+        context, url = self._threads.pop(thread, ("", ""))
+        thread.wait()  # finished를 낸 직후라 곧 돌아온다. 돌던 QThread를 지우면 앱이 죽는다.
+        thread.deleteLater()
+        if not thread.stopped:
+            if thread.indexed and context in self.INCREMENTAL_CONTEXTS:
+                self.index.update(url, series_title, thread.indexed)
+                self._index_dirty = True
+            self.finished.emit(context, url, series_title, episode_urls or [])
         self._run_next()
+
+    def forget(self, series_url: str):
+        """즐겨찾기에서 뺀 시리즈의 회차 목록을 지운다."""
+        self.index.forget(series_url)
+        self._index_dirty = True
+        if not self._threads:
+            self._save_index()
+
+    def _save_index(self):
+        """적어 둔 회차 목록을 파일에 쓴다. 분석이 다 끝났을 때 한 번만.
+
+        시리즈마다 쓰면 즐겨찾기가 수백 개일 때 같은 파일을 수백 번 통째로 쓴다.
+        도중에 앱을 끄면 이번 확인분을 잃지만, 다음 확인이 그만큼 더 열어 볼 뿐이다.
+        """
+        if self._index_dirty:
+            self.index.save()
+            self._index_dirty = False
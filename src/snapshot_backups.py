@@ -0,0 +1,128 @@
+"""기록(historybak/)과 즐겨찾기(favoritbak/)의 롤링 백업을 언제 뜰지 정하는 곳.
+
+예전에는 저장할 때마다 백업을 한 벌씩 떴다. 받기가 몰리는 날에는 몇 분 만에
+30벌이 모두 갈리고, 그러면 '어제 상태'로 돌아갈 백업이 남지 않는다. 한 벌이 파일
+전체라 받는 만큼 복사량도 늘었고, 뜰 때마다 폴더를 훑어 시각 순으로 늘어놓아
+지울 것을 골랐다.
+
+여기서는 **시간과 변경 수로 뜬다.** 마지막 백업에서 BACKUP_INTERVAL이 지났거나
+변경이 BACKUP_EVERY_CHANGES만큼 쌓였을 때만 뜬다. 받기가 아무리 많아도 복사는
+그 둘 중 먼저 오는 쪽으로 묶인다.
+
+**내용이 같으면 뜨지 않는다.** 부르는 쪽이 내용의 해시를 넘기고, 그것이 마지막
+백업과 같으면 건너뛴다. 해시 앞부분을 파일 이름에 넣어 두어, 다시 켠 뒤에도 파일을
+열지 않고 마지막 백업의 해시를 안다.
+
+폴더는 처음 한 번만 훑는다. 그 뒤로는 뜬 것을 목록 끝에 붙이고, keep_backups를
+넘으면 앞에서부터 지운다. 이름이 `접두어_시각`으로 시작해 이름 순이 곧 시각 순이다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+BACKUP_INTERVAL = 15 * 60
+"""백업 사이의 최소 간격(초). 변경이 하나라도 있고 이만큼 지났으면 뜬다."""
+
+BACKUP_EVERY_CHANGES = 50
+"""간격이 차기 전이라도 변경이 이만큼 쌓이면 뜬다. 한꺼번에 많이 받은 날의 몫."""
+
+DIGEST_LENGTH = 12
+"""파일 이름에 넣는 해시 글자 수. 바로 앞 백업과 같은지만 가리면 된다."""
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotBackups:
+    """백업 폴더 하나. 뜰 때인지 세고, 뜨고, 오래된 것을 지운다."""
+
+    def __init__(self, directory: Path, prefix: str, suffix: str, keep: int,
+                 interval: float = BACKUP_INTERVAL,
+                 every_changes: int = BACKUP_EVERY_CHANGES):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.keep = max(0, int(keep))
+        self.interval = interval
+        self.every_changes = every_changes
+        self._lock = threading.Lock()
+        self._changes = 0
+        self._last_taken = 0.0
+        self._files: Optional[List[Path]] = None
+        self._last_digest: Optional[str] = None
+        self._name_re = re.compile(rf"^{re.escape(prefix)}_\d{{8}}_\d{{6}}(?:_([0-9a-f]+))?\.bak\.")
+
+    def changed(self, count: int = 1) -> bool:
+        """변경을 센다. 백업을 뜰 때가 되었으면 True를 돌려주고 셈을 새로 한다.
+
+        True를 받은 쪽은 take()를 불러야 한다. 뜨기 전에 셈을 비우는 것은, 뜨는
+        동안 들어온 변경이 같은 백업을 또 부르지 않게 하려는 것이다.
+        """
+        if self.keep <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._changes += count
+            due = (self._changes >= self.every_changes
+                   or (self._changes > 0 and (not self._last_taken
+                                              or now - self._last_taken >= self.interval)))
+            if due:
+                self._changes = 0
+                self._last_taken = now
+        return due
+
+    def take(self, content_digest: str, write: Callable[[Path], bool]) -> Optional[Path]:
+        """마지막 백업과 내용이 다르면 write로 한 벌 뜬다. 뜬 파일을 돌려준다.
+
+        write는 받은 경로에 백업을 쓰고 성공 여부를 돌려준다. 다른 스레드에서
+        불러도 되지만, 같은 폴더에 대해 한 번에 하나씩 부른다.
+        """
+        short = content_digest[:DIGEST_LENGTH]
+        files = self._scan()
+        if short == self._last_digest:
+            return None
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = self.directory / f"{self.prefix}_{ts}_{short}{self.suffix}"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not write(target):
+                target.unlink(missing_ok=True)
+                return None
+        except OSError:
+            return None
+        files.append(target)
+        self._last_digest = short
+        self._prune(files)
+        return target
+
+    def _scan(self) -> List[Path]:
+        """처음 한 번 폴더를 훑어 이 접두어의 백업을 이름(=시각) 순으로 모은다.
+
+        예전 이름(해시 없음)과 예전 확장자(.bak.json)도 함께 센다. 그래야 예전
+        백업도 keep_backups 안에서 차례가 되면 지워진다.
+        """
+        if self._files is None:
+            try:
+                found = sorted((p for p in self.directory.glob(f"{self.prefix}_*.bak.*")
+                                if self._name_re.match(p.name)), key=lambda p: p.name)
+            except OSError:
+                found = []
+            self._files = found
+            match = self._name_re.match(found[-1].name) if found else None
+            self._last_digest = match.group(1) if match else None
+        return self._files
+
+    def _prune(self, files: List[Path]):
+        while len(files) > self.keep:
+            try:
+                files.pop(0).unlink(missing_ok=True)
+            except OSError:
+                pass
@@ -0,0 +1,196 @@
+"""JSON 저장소 옆에 붙는 변경 일지(journal). 바뀐 것만 한 줄씩 덧붙인다.
+
+즐겨찾기(favorites.json)와 대기열(queue.json)은 바뀔 때마다 파일 전체를 다시
+썼다. 대기열은 DownloadManager._update_queue_counter가 불릴 때마다 — 하나 넣을
+때, 시작할 때, 끝날 때, 받은 정도가 바뀔 때마다 — 통째로 쓰였고, 즐겨찾기는
+확인 하나가 끝날 때마다(touch_last_check) 통째로 쓰고 백업까지 떴다. 즐겨찾기가
+300개면 한 바퀴 확인에 파일 전체를 300번 쓴다.
+
+여기서는 **바뀐 것 하나를 JSON 한 줄로 일지 끝에 덧붙인다.** 쓰는 양이 저장소
+크기가 아니라 바뀐 양에 비례한다. 읽을 때는 원래 파일(스냅숏)을 읽고 일지를
+차례대로 다시 적용하면 같은 상태가 된다.
+
+**일지가 COMPACT_BYTES를 넘으면 다른 스레드에서 스냅숏으로 접는다.** 접는 동안
+들어오는 변경은 새 일지에 쌓이도록, 접기 전에 지금 일지를 `.folding`으로 이름을
+바꿔 떼어 둔다. 스냅숏을 다 쓴 뒤에야 떼어 둔 일지를 지운다. 그 사이에 앱이
+꺼지면(또는 떼어 둔 일지를 지우지 못하면) 다음 실행은 새 스냅숏 위에 떼어 둔 일지를
+한 번 더 적용하는데, 적는 변경이 모두 '이 주소를 이 값으로'·'이 주소를 빼라'·'주소
+차례를 이대로' 꼴이라 두 번 적용해도 결과가 같다. 차례가 걸린 변경(새 주소를 붙이는
+것)은 반드시 차례 줄을 뒤따르게 적어야 이것이 성립한다(QueueStore._diff).
+
+스냅숏 파일의 모양은 예전 그대로다. 일지를 모르는 예전 판으로 되돌아가도 마지막
+접은 때까지의 상태는 읽힌다. 사용자가 백업해 둘 파일도 예전과 같다.
+
+한 줄은 한 번의 write로 쓴다. 쓰는 도중에 프로세스가 사라져 끝이 잘린 줄이
+남으면 읽을 때 그 줄만 버린다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, IO, Iterable, List, Optional
+
+JOURNAL_SUFFIX = ".journal"
+FOLDING_SUFFIX = ".folding"
+
+COMPACT_BYTES = 256 * 1024
+"""일지를 스냅숏으로 접는 크기. 대기열 받은 정도 한 줄이 200바이트 남짓이라 천 번쯤
+바뀌면 접는다. 크게 잡을수록 켤 때 다시 적용할 줄이 늘어난다."""
+
+
+class StoreJournal:
+    """스냅숏 파일 하나에 딸린 일지. 저장소가 하나씩 들고 쓴다."""
+
+    def __init__(self, snapshot_path: str, compact_bytes: int = COMPACT_BYTES):
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path + JOURNAL_SUFFIX
+        self.folding_path = self.path + FOLDING_SUFFIX
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._size = 0
+        self._folding: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def read(self) -> List[Dict[str, Any]]:
+        """다시 적용할 변경을 적힌 차례대로. 떼어 둔 일지가 남아 있으면 그것부터."""
+        ops: List[Dict[str, Any]] = []
+        for path in (self.folding_path, self.path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except ValueError:
+                            continue
+                        if isinstance(op, dict):
+                            ops.append(op)
+            except FileNotFoundError:
+                continue
+            except (OSError, UnicodeDecodeError):
+                continue
+        try:
+            self._size = os.path.getsize(self.path)
+        except OSError:
+            self._size = 0
+        return ops
+
+    def append(self, ops: Iterable[Dict[str, Any]]) -> bool:
+        """변경을 일지 끝에 덧붙인다. 성공 여부를 돌려준다."""
+        text = "".join(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for op in ops)
+        if not text:
+            return True
+        with self._lock:
+            try:
+                if self._file is None:
+                    if not _ends_with_newline(self.path):
+                        text = "\n" + text
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(text)
+                self._file.flush()
+            except OSError:
+                self._close_file()
+                return False
+            self._size += len(text.encode("utf-8"))
+        return True
+
+    def needs_compaction(self) -> bool:
+        """일지가 커졌고, 앞서 시작한 접기가 끝났으면 True."""
+        return (self._size >= self.compact_bytes
+                and (self._folding is None or self._folding.done()))
+
+    def compact(self, write_snapshot: Callable[[], bool]) -> None:
+        """다른 스레드에서 스냅숏으로 접는다.
+
+        write_snapshot은 부르는 쪽이 **지금 상태를 복사해 둔 채로** 넘긴다. 다른
+        스레드에서 불리므로 그동안 바뀌는 원본을 보면 안 된다.
+        """
+        if not self._detach():
+            return
+        self._folding = self._executor.submit(self._fold, write_snapshot)
+
+    def compact_now(self, write_snapshot: Callable[[], bool]) -> bool:
+        """그 자리에서 접는다. 앞서 시작한 접기가 있으면 끝나기를 기다린다."""
+        if self._folding is not None:
+            self._folding.result()
+        if not self._detach():
+            return False
+        return self._fold(write_snapshot)
+
+    def _detach(self) -> bool:
+        """지금 일지를 떼어 둔다. 앞서 떼어 둔 것이 남아 있으면 그 뒤에 잇는다.
+
+        남아 있다는 것은 지난 접기가 스냅숏을 쓰지 못했거나 그 사이에 앱이
+        꺼졌다는 뜻이다. 켤 때 둘 다 적용했으므로 이번 스냅숏이 둘을 모두 담는다.
+        이어 붙이는 것은 차례(떼어 둔 것이 먼저)를 지키려는 것이다.
+        """
+        with self._lock:
+            self._close_file()
+            try:
+                if not os.path.exists(self.path):
+                    pass
+                elif not os.path.exists(self.folding_path):
+                    os.replace(self.path, self.folding_path)
+                else:
+                    with open(self.path, "rb") as src, open(self.folding_path, "ab") as dst:
+                        if not _ends_with_newline(self.folding_path):
+                            dst.write(b"\n")
+                        dst.write(src.read())
+                    os.remove(self.path)
+            except OSError:
+                return False
+            self._size = 0
+        return True
+
+    def _fold(self, write_snapshot: Callable[[], bool]) -> bool:
+        if not write_snapshot():
+            return False
+        try:
+            os.remove(self.folding_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        return True
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+def _ends_with_newline(path: str) -> bool:
+    """비었거나 줄바꿈으로 끝나면 True. 끝이 잘린 줄 뒤에 새 줄이 붙지 않게 본다."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except OSError:
+        return True
+
+
+def write_json_atomic(path: str, data: Any) -> bool:
+    """임시 파일에 썼다가 바꿔치기한다. 반쯤 쓰인 스냅숏이 남지 않는다."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        except OSError:
+            pass
+        return False
@@ -0,0 +1,184 @@
+"""다운로드 대기열. 차례를 지키면서 넣고 빼고 옮기는 일을 모두 상수 시간에 한다.
+
+예전에는 파이썬 리스트 두 개(_task_queue, _held)였다. `in`·`remove`·`pop(0)`이
+모두 길이에 비례하는데, is_queued는 미리 묻기마다, overall_progress는 진행률이
+올 때마다 항목 수만큼 불린다. 대기열이 2,000개면 진행률 한 번에 수백만 번을
+훑었다. 즐겨찾기 스무 개를 한꺼번에 넣거나 지난 실행의 대기열을 되살리면 바로
+그 크기가 된다.
+
+**차례는 우선순위 묶음 → 넣은 순서다.** 묶음은 셋이다.
+
+- PRIORITY_RESTORED: 지난 실행에서 되살려 `대기열 시작`을 누른 것. 이미 오래
+  기다렸으므로 가장 앞이다(예전 start_held_tasks가 맨 앞에 붙이던 것과 같다).
+- PRIORITY_USER: 사용자가 직접 넣은 것.
+- PRIORITY_FAVORITES: 즐겨찾기 확인이 찾아 넣은 것. 켜 둔 채 저절로 들어온
+  것이라, 사용자가 지금 받으려고 넣은 주소를 그 뒤로 밀지 않는다.
+
+옮기기(move_to_front·move_after)는 끌어 놓은 자리를 그대로 따르고, 옮긴 항목은
+옆자리의 묶음으로 들어간다. 묶음을 지키느라 끌어 놓은 자리를 무시하면 사용자가
+보는 차례와 실제 차례가 갈린다.
+
+한 줄로 이은 목록(앞·뒤 링크를 사전에 둔다)이라 중간에서 빼고 끼워도 다른
+항목을 옮기지 않는다. 묶음마다 첫 항목과 끝 항목을 따로 쥐고 있어, 묶음 끝에
+붙이는 것도 줄을 훑지 않는다.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional
+
+PRIORITY_RESTORED = 0
+PRIORITY_USER = 1
+PRIORITY_FAVORITES = 2
+PRIORITIES = (PRIORITY_RESTORED, PRIORITY_USER, PRIORITY_FAVORITES)
+"""작을수록 앞이다."""
+
+
+class TaskQueue:
+    """주소(url)를 담는 우선순위 대기열. 같은 주소는 한 번만 든다."""
+
+    def __init__(self):
+        self._prev: Dict[str, Optional[str]] = {}
+        self._next: Dict[str, Optional[str]] = {}
+        self._priority: Dict[str, int] = {}
+        self._head: Optional[str] = None
+        self._tail: Optional[str] = None
+        self._first: Dict[int, str] = {}
+        self._last: Dict[int, str] = {}
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._priority
+
+    def __len__(self) -> int:
+        return len(self._priority)
+
+    def __bool__(self) -> bool:
+        return self._head is not None
+
+    def __iter__(self) -> Iterator[str]:
+        url = self._head
+        while url is not None:
+            following = self._next[url]
+            yield url
+            url = following
+
+    def priority_of(self, url: str) -> Optional[int]:
+        return self._priority.get(url)
+
+    def peek(self) -> Optional[str]:
+        return self._head
+
+    # --- 줄 잇기/끊기 ---
+
+    def _link_after(self, url: str, anchor: Optional[str], priority: int):
+        """anchor 바로 뒤(None이면 맨 앞)에 끼운다. 묶음의 첫·끝 표시도 고친다."""
+        following = self._next[anchor] if anchor is not None else self._head
+        self._prev[url] = anchor
+        self._next[url] = following
+        if anchor is not None:
+            self._next[anchor] = url
+        else:
+            self._head = url
+        if following is not None:
+            self._prev[following] = url
+        else:
+            self._tail = url
+        self._priority[url] = priority
+        if anchor is None or self._priority[anchor] != priority:
+            self._first[priority] = url
+        if following is None or self._priority[following] != priority:
+            self._last[priority] = url
+
+    def _unlink(self, url: str) -> int:
+        """줄에서 뺀다. 있던 묶음을 돌려준다."""
+        priority = self._priority.pop(url)
+        before = self._prev.pop(url)
+        after = self._next.pop(url)
+        if before is not None:
+            self._next[before] = after
+        else:
+            self._head = after
+        if after is not None:
+            self._prev[after] = before
+        else:
+            self._tail = before
+        if self._first.get(priority) == url:
+            if after is not None and self._priority[after] == priority:
+                self._first[priority] = after
+            else:
+                del self._first[priority]
+        if self._last.get(priority) == url:
+            if before is not None and self._priority[before] == priority:
+                self._last[priority] = before
+            else:
+                del self._last[priority]
+        return priority
+
+    def _lane_anchor(self, priority: int) -> Optional[str]:
+        """이 묶음 끝에 붙일 때 바로 앞에 올 항목. 묶음이 비었으면 앞 묶음의 끝."""
+        for p in range(priority, PRIORITY_RESTORED - 1, -1):
+            if p in self._last:
+                return self._last[p]
+        return None
+
+    # --- 넣고 빼기 ---
+
+    def push(self, url: str, priority: int = PRIORITY_USER) -> bool:
+        """묶음 끝에 넣는다. 이미 있으면 그대로 두고 False."""
+        if url in self._priority:
+            return False
+        self._prev[url] = self._next[url] = None
+        self._link_after(url, self._lane_anchor(priority), priority)
+        return True
+
+    def pop(self) -> Optional[str]:
+        """맨 앞 것을 꺼낸다. 비었으면 None."""
+        url = self._head
+        if url is not None:
+            self._unlink(url)
+        return url
+
+    def remove(self, url: str) -> bool:
+        if url not in self._priority:
+            return False
+        self._unlink(url)
+        return True
+
+    def clear(self):
+        self.__init__()
+
+    def urls(self) -> List[str]:
+        return list(self)
+
+    # --- 차례 바꾸기 ---
+
+    def move_to_front(self, url: str) -> bool:
+        """맨 앞으로 옮긴다. 맨 앞 묶음이 더 높으면 그 묶음으로 올라간다."""
+        if url not in self._priority or self._head == url:
+            return url in self._priority
+        priority = self._unlink(url)
+        if self._head is not None:
+            priority = min(priority, self._priority[self._head])
+        self._prev[url] = self._next[url] = None
+        self._link_after(url, None, priority)
+        return True
+
+    def move_after(self, url: str, anchor: str) -> bool:
+        """anchor 바로 뒤로 옮긴다. anchor의 묶음을 따른다."""
+        if url not in self._priority or anchor not in self._priority or url == anchor:
+            return False
+        self._unlink(url)
+        self._prev[url] = self._next[url] = None
+        self._link_after(url, anchor, self._priority[anchor])
+        return True
+
+    def set_priority(self, url: str, priority: int) -> bool:
+        """묶음을 바꾼다. 새 묶음의 끝으로 간다. 같은 묶음이면 그대로 둔다."""
+        if url not in self._priority or priority not in PRIORITIES:
+            return False
+        if self._priority[url] == priority:
+            return True
+        self._unlink(url)
+        self._prev[url] = self._next[url] = None
+        self._link_after(url, self._lane_anchor(priority), priority)
+        return True
@@ -24,7 +24,8 @@ class ConversionThread(QThread):
 
     def __init__(self, url: str, input_path: str, ffmpeg_path: str,
                  target_format: Optional[str], target_codec: Optional[str],
-                 delete_original: bool, hw_encoder_setting: str, parent=None):
+                 delete_original: bool, hw_encoder_setting: str, threads: int = 0,
+                 parent=None):
         super().__init__(parent)
         self.url = url
         self.input_path = Path(input_path)
@@ -33,6 +34,13 @@ class ConversionThread(QThread):
         self.target_codec = target_codec
         self.delete_original = delete_original
         self.hw_encoder_setting = hw_encoder_setting
+        self.threads = threads
+        """ffmpeg에 걸 스레드 수(conversion_scheduler). 0이면 걸지 않는다.
+
+        다시 만들 때만 건다. 그대로 옮기거나(-c copy) mp3로 뽑는 일은 코어를
+        거의 쓰지 않아 나눌 것이 없다. 입력 앞과 출력 앞 두 곳에 거는 것은
+        디코더와 인코더가 저마다 코어 수만큼 스레드를 세우기 때문이다.
+        """
         self.process = None
         self._stop_flag = False
         self._process_lock = threading.Lock()
@@ -263,11 +271,16 @@ class ConversionThread(QThread):
             self.log.emit("[오류] 변환 목표(포맷 또는 코덱)가 지정되지 않았습니다.")
             self.finished.emit(False, self.url, ""); return
 
-        command = [self.ffmpeg_path, '-i', str(self.input_path), '-y']
+        command = [self.ffmpeg_path]
+        if self.target_codec and self.threads:
+            command.extend(['-threads', str(self.threads)])
+        command.extend(['-i', str(self.input_path), '-y'])
 
         try:
             if self.target_codec:
                 command.extend(self._reencode_args(output_path))
+                if self.threads:
+                    command.extend(['-threads', str(self.threads)])
             elif self.target_format == 'mp3':
                 command.extend(['-vn', '-c:a', 'libmp3lame', '-q:a', '2'])
             elif self.target_format in ['avi', 'mov']:
@@ -1,10 +1,11 @@
-import os, re, json, signal, subprocess
+import os, re, json, signal, subprocess, tempfile, time
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from PyQt6.QtCore import QThread, pyqtSignal
 from src.utils import (get_startupinfo, FILENAME_TITLE_MAX_LENGTH,
                        NO_AUDIO_STATUS, resolve_ffprobe_path)
-from src.threads import ytdlp_run
+from src import metadata_cache
+from src.threads import ytdlp_pool, ytdlp_run
 
 MAX_PATH_LEN = 250
 """저장 경로 전체에 허용하는 최대 길이.
@@ -61,6 +62,38 @@ def shorten_long_path(full_dir: str, path_without_ext: str, ext: str,
     return full_path, f"{path_without_ext}.{ext}"
 
 
+PROGRESS_PREFIX = "__TVER__"
+"""진행률 줄 앞에 붙는 표시. 이것으로 시작하는 줄은 JSON 한 덩어리다."""
+
+PROGRESS_TEMPLATE = ("download:" + PROGRESS_PREFIX +
+                     "%(progress.{status,downloaded_bytes,total_bytes,total_bytes_estimate,"
+                     "speed,eta,fragment_index,fragment_count})j")
+"""yt-dlp가 진행률을 찍는 틀(`--progress-template`).
+
+기본 진행률 줄(`[download]  42.0% of ~ 1.20GiB at 2.50MiB/s ETA 03:12 (frag
+40/330)`)은 사람이 읽으라고 만든 글이라, 정규식으로 되짚으면 바이트 수는 반올림된
+`1.20GiB`밖에 남지 않고 값이 없을 때의 표기(`Unknown`, `~`)도 따로 가려야 했다.
+이 틀로 받으면 yt-dlp가 들고 있는 숫자가 그대로 온다. 값이 없는 칸은 빠진다.
+"""
+
+_RATE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
+
+def _format_rate(bytes_per_sec: float) -> str:
+    """초당 바이트를 yt-dlp가 찍던 모양(`2.50MiB/s`)으로. 화면과 로그가 예전 그대로 보이게."""
+    value = float(bytes_per_sec); unit = 0
+    while value >= 1024 and unit < len(_RATE_UNITS) - 1:
+        value /= 1024; unit += 1
+    return f"{value:.2f}{_RATE_UNITS[unit]}/s"
+
+
+def _format_eta(seconds: float) -> str:
+    """남은 초를 yt-dlp가 찍던 모양(`03:12`, 한 시간 넘으면 `1:03:12`)으로."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
 class DownloadThread(QThread):
     progress = pyqtSignal(str, dict)
     finished = pyqtSignal(str, bool, str, dict)
@@ -91,6 +124,13 @@ class DownloadThread(QThread):
     찼다가 소리를 받으면서 0으로 떨어지므로, 안전한 쪽인 2로 둔다.
     """
 
+    MOVE_FILES_RE = re.compile(r'\[MoveFiles\] Moving file "(.+)" to "(.+)"')
+    """작업 폴더에서 다 된 파일을 저장 폴더로 옮길 때 yt-dlp가 내는 줄.
+
+    이어받기를 켜면 병합은 작업 폴더 안에서 일어나, Merger 줄이 알려 주는 경로는
+    곧 사라질 자리다. 끝에 확인할 파일은 옮겨진 쪽이다.
+    """
+
     COMPONENT_NAMES = ("비디오", "오디오")
     """조각을 둘로 나눠 받을 때 화면에 보일 이름. 하나로 받으면 붙이지 않는다."""
 
@@ -108,12 +148,21 @@ class DownloadThread(QThread):
     그래서 yt-dlp가 스스로 알려 주는 이 줄을 쓴다.
     """
 
+    INFO_JSON_MAX_AGE = 30 * 60
+    """받아 둔 영상 정보로 곧장 받기 시작해도 되는 나이(초).
+
+    영상 정보에 든 스트림 주소에는 TVer가 붙인 기한이 있다. 그 기한을 정보만
+    보고는 알 수 없어서, 오래된 것은 믿지 않고 처음부터 다시 묻는다. 기한이
+    이보다 짧았던 경우는 _execute_download가 받기 전에 떨어진 것을 보고 다시 돈다.
+    """
+
     def __init__(self, url: str, download_folder: str, ytdlp_exe_path: str, ffmpeg_exe_path: str,
                  output_template: str, quality_format: str,
                  download_subtitles: bool, embed_subtitles: bool, subtitle_format: str,
                  ignore_ssl_errors: bool = False, embed_thumbnail: bool = False,
                  preloaded_metadata: Optional[Dict[str, Any]] = None,
                  concurrent_fragments: int = 1,
+                 scratch_dir: str = "",
                  parent=None):
         super().__init__(parent)
         self.url = url; self.download_folder = download_folder
@@ -130,10 +179,14 @@ class DownloadThread(QThread):
         self.ignore_ssl_errors = ignore_ssl_errors
         self.embed_thumbnail = embed_thumbnail
         self.concurrent_fragments = concurrent_fragments
+        self.scratch_dir = scratch_dir
+        """이어받기용 작업 폴더(partial_store). 비어 있으면 예전처럼 처음부터 받는다."""
 
         self.process: Optional[subprocess.Popen] = None
         self._stop_flag = False; self._current_component: str = ""; self._final_filepath: str = ""
         self._parts = self.DEFAULT_PARTS; self._part_index = -1; self._aside = False
+        self._done_bytes = 0
+        """앞서 다 받은 조각들의 바이트 합. 영상을 다 받고 소리로 넘어가도 바이트 수가 0으로 돌아가지 않게 한다."""
         self._sidecar_paths: set = set()
         self._thumbnail_embed_failed = False
         self._metadata: Dict = {}
@@ -216,20 +269,22 @@ class DownloadThread(QThread):
 
         self.progress.emit(self.url, {"title": self._metadata.get("title", "제목 없음"), "thumbnail": self._metadata.get("thumbnail")})
         self._final_filepath = self._build_final_filepath(self._metadata)
-        command = self._build_command(self._final_filepath)
-        popen_kwargs: Dict[str, Any] = {}
-        if os.name == 'nt': popen_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
-        else: popen_kwargs['start_new_session'] = True
+        built_path = self._final_filepath
+        info_json = self._write_info_json()
 
         self.progress.emit(self.url, {"status": "다운로드 중", "log": "yt-dlp 프로세스 시작..."})
-        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore", **popen_kwargs)
-
-        if self.process and self.process.stdout:
-            for line in iter(self.process.stdout.readline, ""):
-                if self._stop_flag: self.progress.emit(self.url, {"status": "취소됨"}); return False
-                self._parse_line(line)
-        if self._stop_flag: return False
-        rc = self.process.wait(timeout=5) if self.process else 1
+        try:
+            rc = self._run_command(self._build_command(self._final_filepath, info_json))
+        finally:
+            if info_json:
+                try: os.remove(info_json)
+                except OSError: pass
+        if rc is None: self.progress.emit(self.url, {"status": "취소됨"}); return False
+        if info_json and rc != 0 and self._part_index < 0:
+            self.progress.emit(self.url, {"log": "[알림] 받아 둔 영상 정보로 시작하지 못해 정보를 다시 확인합니다."})
+            self._final_filepath = built_path; self._reset_parse_state()
+            rc = self._run_command(self._build_command(self._final_filepath))
+            if rc is None: self.progress.emit(self.url, {"status": "취소됨"}); return False
 
         if not os.path.exists(self._final_filepath):
              self.progress.emit(self.url, {"log": f"[오류] 최종 파일이 지정된 경로에 없습니다: {self._final_filepath}"})
@@ -257,6 +312,83 @@ class DownloadThread(QThread):
         self.progress.emit(self.url, {"status": final_status, "percent": 100, "final_filepath": self._final_filepath})
         return success
 
+    def _write_info_json(self) -> str:
+        """받아 둔 영상 정보를 임시 파일에 써서 그 경로를 돌려준다. 못 쓰면 빈 글.
+
+        yt-dlp는 주소를 받으면 영상 정보를 처음부터 다시 읽는다. 미리 묻기가 방금
+        똑같은 것을 읽어 왔는데도 그렇다. 짧은 회차는 그 읽기가 받는 시간의
+        상당 부분이고, TVer API를 두 번 부르는 셈이다. `--load-info-json`으로
+        넘기면 읽기를 건너뛰고 형식 고르기부터 한다.
+
+        형식 목록(formats)이 없는 정보(다른 경로로 얻은 요약)나 INFO_JSON_MAX_AGE를
+        넘긴 정보는 쓰지 않는다. 나이는 yt-dlp가 정보에 적는 `epoch`(읽은 시각)로 잰다.
+        """
+        metadata = self._metadata
+        epoch = metadata.get("epoch")
+        if not metadata.get("formats") or not isinstance(epoch, (int, float)):
+            return ""
+        if time.time() - epoch > self.INFO_JSON_MAX_AGE:
+            return ""
+        try:
+            fd, path = tempfile.mkstemp(prefix="tver-", suffix=".info.json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+        except (OSError, TypeError, ValueError):
+            return ""
+        return path
+
+    def _run_command(self, command: List[str]) -> Optional[int]:
+        """yt-dlp를 돌려 종료 코드를 돌려준다. 그만두라고 했으면 None.
+
+        상주 작업자로 먼저 돌고(_run_in_worker), 거기서 안 되면 exe를 띄운다.
+        """
+        rc = self._run_in_worker(command)
+        if self._stop_flag: return None
+        if rc is not None: return rc
+        popen_kwargs: Dict[str, Any] = {}
+        if os.name == 'nt': popen_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        else: popen_kwargs['start_new_session'] = True
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore", **popen_kwargs)
+
+        if self.process and self.process.stdout:
+            for line in iter(self.process.stdout.readline, ""):
+                if self._stop_flag: return None
+                self._parse_line(line)
+        if self._stop_flag: return None
+        return self.process.wait(timeout=5) if self.process else 1
+
+    def _reset_parse_state(self):
+        """출력을 읽으며 쌓은 것을 처음으로 돌린다. 같은 항목을 처음부터 다시 돌 때 쓴다."""
+        self._parts = self.DEFAULT_PARTS; self._part_index = -1; self._aside = False
+        self._done_bytes = 0
+        self._sidecar_paths = set(); self._current_component = ""
+        self._thumbnail_embed_failed = False
+
+    def _run_in_worker(self, command: List[str]) -> Optional[int]:
+        """상주 작업자로 받아 본다. 종료 코드를 돌려주고, exe로 다시 돌아야 하면 None.
+
+        작업자가 찍는 줄은 exe의 stdout·stderr를 합쳐 읽던 것과 같은 줄이라
+        _parse_line을 그대로 쓴다.
+
+        **본편을 받기 시작하기 전에 실패했으면 exe로 다시 돈다.** 그때의 실패는
+        대개 앱에 묶인 yt_dlp가 nightly exe보다 낡아 TVer를 못 읽는 경우다. 받기
+        시작한 뒤의 실패는 exe로 돌려도 같은 자리에서 다시 떨어지므로 그대로 둔다.
+        작업자가 통째로 사라졌을 때만은 어디까지 왔든 exe로 처음부터 다시 받는다 —
+        --force-overwrites라 쓰다 만 파일 위에 새로 쓴다.
+        """
+        built_path = self._final_filepath
+        result = ytdlp_pool.shared().run(command[1:], should_stop=lambda: self._stop_flag,
+                                          on_line=lambda _stream, text: self._parse_line(text))
+        if result is not None and (result.ok or result.aborted or self._part_index >= 0):
+            return result.returncode if not result.aborted else 1
+        if self._stop_flag:
+            return 1
+        if result is not None:
+            self.progress.emit(self.url, {"log": "[알림] 내장 yt-dlp로 받지 못해 yt-dlp.exe로 다시 시도합니다."})
+        self._final_filepath = built_path
+        self._reset_parse_state()
+        return None
+
     def _begin_destination(self, path: str):
         """Destination 한 줄을 받아, 지금부터 받는 것이 몇 번째 조각인지 정한다.
 
@@ -374,20 +506,30 @@ class DownloadThread(QThread):
 
         통신이 밀리는 순간에 걸리면 다시 건다(ytdlp_run). 여기서 한 번에 포기하면
         다운로드가 시작조차 못 하고 오류 카드로 남는다.
+
+        미리 묻기가 끝나지 않았어도 전에 물어 둔 답이 디스크 캐시(metadata_cache)에
+        있으면 그것을 쓴다. 새로 물었으면 남겨 둔다.
         """
+        cached = metadata_cache.shared().get(metadata_cache.EPISODE, self.url)
+        if isinstance(cached, dict):
+            return cached
         cmd = [self.ytdlp_exe_path, "-J", "--skip-download", *ytdlp_run.network_options()]
         if self.ignore_ssl_errors:
             cmd.append("--no-check-certificate")
         cmd.append(self.url)
         ok, out, err = ytdlp_run.run(cmd, self.METADATA_TIMEOUT, "영상 정보 확인",
-                                     lambda msg: self.progress.emit(self.url, {"log": msg}))
+                                     lambda msg: self.progress.emit(self.url, {"log": msg}),
+                                     draw_budget=False)
         if not ok:
             self.progress.emit(self.url, {"log": f"[오류] 영상 정보 확인 실패: {(err or '').strip()}"})
             return None
         try:
-            return json.loads(out)
+            metadata = json.loads(out)
         except json.JSONDecodeError:
             return None
+        if isinstance(metadata, dict):
+            metadata_cache.shared().put(metadata_cache.EPISODE, self.url, metadata)
+        return metadata
 
     def _build_final_filepath(self, metadata: Dict[str, Any]) -> str:
         template, ext = self.output_template.rsplit('.', 1)
@@ -428,7 +570,7 @@ class DownloadThread(QThread):
 
         return full_path
 
-    def _build_command(self, final_filepath: str) -> List[str]:
+    def _build_command(self, final_filepath: str, info_json: str = "") -> List[str]:
         """yt-dlp 명령을 조립한다.
 
         자막 옵션은 임베드와 별도 저장이 서로 배타적이다. --embed-subs만 주면
@@ -439,6 +581,8 @@ class DownloadThread(QThread):
         --embed-thumbnail도 같은 규칙을 따른다. 단독으로 주면 썸네일을 받아 넣고
         파일은 지우므로, --write-thumbnail을 함께 붙이지 않는다.
 
+        -N은 연결 주머니에서 받은 몫이다(DownloadManager._start_download).
+
         **-N은 1보다 클 때만 붙인다.** 1은 yt-dlp 기본값이라 붙여도 달라지는 것이
         없는데, 명령줄에만 남아 로그를 읽을 때 '무언가 켜 두었나' 하고 헷갈린다.
 
@@ -446,14 +590,21 @@ class DownloadThread(QThread):
         따로 알리지 않고 형식 하나당 Destination 한 줄과 합산 진행률만 내놓기
         때문이다(-N 4로 실측: `Destination` 두 줄에 각각 0->100%가 한 번씩,
         되돌아가는 값 없음). 조각 수를 세는 _begin_destination은 손댈 것이 없다.
+
+        진행률은 PROGRESS_TEMPLATE으로 JSON으로 받는다(_parse_progress). 그 밖의
+        줄(Destination·Merger·오류)은 예전 모양 그대로라 _parse_line이 읽는다.
+
+        info_json을 주면 주소 대신 그 파일에서 시작한다(_write_info_json).
         """
+        source = ["--load-info-json", info_json] if info_json else [self.url]
         command: List[str] = [
-            self.ytdlp_exe_path, self.url,
+            self.ytdlp_exe_path, *source,
             "--ffmpeg-location", self.ffmpeg_path_dir,
-            "-o", final_filepath,
-            "--retries", "10", "--fragment-retries", "10", "--force-overwrites", "--no-keep-fragments",
+            *self._output_options(final_filepath),
+            "--retries", "10", "--fragment-retries", "10", "--no-keep-fragments",
             "--windows-filenames", "--no-cache-dir", "--abort-on-error",
             "--add-header", "Accept-Language:ja-JP", "--progress", "--encoding", "utf-8", "--newline",
+            "--progress-template", PROGRESS_TEMPLATE,
             "-f", self.quality_format,
             "--merge-output-format", "mp4",
         ]
@@ -482,9 +633,43 @@ class DownloadThread(QThread):
 
         return command
 
+    def _output_options(self, final_filepath: str) -> List[str]:
+        """어디에 쓸지와 있던 것을 어떻게 할지.
+
+        작업 폴더가 있으면 받는 중인 것은 거기(`-P temp:`), 다 된 것은 저장 폴더
+        (`-P home:`)에 둔다. 이때 **-o는 저장 폴더 기준의 상대 경로여야 한다.**
+        절대 경로를 주면 yt-dlp가 temp를 무시하고 그 자리에 바로 쓴다.
+
+        **작업 폴더에 남은 것이 있을 때만 --force-overwrites를 뺀다.** 그 옵션은
+        시작하면서 `.part`와 `.ytdl`까지 지워 이어받을 것을 없앤다. 반대로 새로
+        받는 경우에는 예전처럼 붙여 둔다 — 사용자가 `다시 다운로드`를 골랐는데
+        저장 폴더에 같은 이름이 있다고 건너뛰면, 깨진 파일을 다시 받으려던 사람이
+        아무것도 얻지 못한다.
+        """
+        if not self.scratch_dir:
+            return ["-o", final_filepath, "--force-overwrites"]
+        home = os.path.abspath(self.download_folder)
+        scratch = Path(self.scratch_dir)
+        resuming = scratch.is_dir() and any(scratch.iterdir())
+        scratch.mkdir(parents=True, exist_ok=True)
+        options = ["-P", f"home:{home}", "-P", f"temp:{scratch}",
+                   "-o", os.path.relpath(final_filepath, home)]
+        if resuming:
+            self.progress.emit(self.url, {"log": "[알림] 받다 만 부분이 있어 이어서 받습니다."})
+            return options + ["--continue", "--no-force-overwrites"]
+        return options + ["--force-overwrites"]
+
     def _parse_line(self, line: str):
+        """yt-dlp 출력 한 줄을 읽는다.
+
+        줄 대부분은 진행률이라, 앞머리 한 번만 보고 _parse_progress로 넘긴다.
+        아래의 키워드·정규식 검사는 진행률이 아닌 줄에만 돈다. 예전에는 초당
+        수십 줄인 진행률 줄마다 이 검사를 모두 거쳤다.
+        """
         line = (line or "").strip()
         if not line: return
+        if line.startswith(PROGRESS_PREFIX):
+            self._parse_progress(line[len(PROGRESS_PREFIX):]); return
         payload: Dict[str, Any] = {}
         log_keywords = ["Merging formats into", "Embedding subtitles", "[error]", "ERROR:"]
         if any(keyword in line for keyword in log_keywords): payload["log"] = line
@@ -494,10 +679,17 @@ class DownloadThread(QThread):
             if "error" in lowered or "unable" in lowered or "not support" in lowered:
                 self._thumbnail_embed_failed = True
 
+        if "retrying" in lowered and ytdlp_run.is_retriable(line):
+            payload["retrying"] = True
+
         m_merger = re.search(r"\[Merger\] Merging formats into \"(.+)\"", line)
         if m_merger:
             self._final_filepath = m_merger.group(1)
 
+        m_moved = self.MOVE_FILES_RE.search(line)
+        if m_moved and m_moved.group(1) == self._final_filepath:
+            self._final_filepath = m_moved.group(2)
+
         m_sidecar = self.SIDECAR_WRITE_RE.match(line)
         if m_sidecar:
             self._sidecar_paths.add(m_sidecar.group(1).strip())
@@ -505,7 +697,7 @@ class DownloadThread(QThread):
         m_formats = self.FORMAT_COUNT_RE.search(line)
         if m_formats:
             self._parts = max(1, len(m_formats.group(1).split("+")))
-            self._part_index = -1; self._aside = False
+            self._part_index = -1; self._aside = False; self._done_bytes = 0
 
         if "[download] Destination:" in line:
             destination = line.split("Destination:", 1)[1].strip()
@@ -513,16 +705,56 @@ class DownloadThread(QThread):
                 self._final_filepath = destination
             self._begin_destination(destination)
 
-        m_progress = re.search(r"\[download\]\s+([0-9.]+)% of.*?at (.*?/s)\s+ETA\s+(.*)", line)
-        if m_progress:
-            eta = m_progress.group(3).split("(")[0].strip()
-            payload.update({"status": "다운로드 중", "speed": m_progress.group(2),
-                            "eta": eta, "component": self._current_component})
-            overall = self._overall_percent(float(m_progress.group(1)))
-            if overall is not None:
-                payload["percent"] = overall
-
         if "Merging formats" in line: payload["status"] = "후처리 중 (병합)"
         elif "Embedding subtitles" in line: payload["status"] = "후처리 중 (자막)"
 
         if payload: self.progress.emit(self.url, payload)
+
+    def _parse_progress(self, raw: str):
+        """PROGRESS_TEMPLATE 한 줄(앞머리를 뗀 JSON)을 progress로 옮긴다.
+
+        percent는 바이트로 셈한다. 총량을 모르면(HLS는 받는 동안 어림값만 있다)
+        조각 순번으로 셈한다 — yt-dlp가 화면에 찍는 퍼센트와 같은 순서다.
+
+        downloaded_bytes·total_bytes는 **항목 전체 기준**이다. 앞서 다 받은 조각의
+        바이트를 더해 두어서 소리로 넘어가도 줄지 않는다. 다만 아직 시작하지 않은
+        조각의 크기는 모르므로 total_bytes는 지금까지 안 만큼이다.
+        """
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+        payload: Dict[str, Any] = {"status": "다운로드 중", "component": self._current_component}
+        speed = data.get("speed"); eta = data.get("eta")
+        if speed:
+            payload["speed"] = _format_rate(speed); payload["speed_bps"] = speed
+        if eta is not None:
+            payload["eta"] = _format_eta(eta)
+
+        finished = data.get("status") == "finished"
+        done = data.get("downloaded_bytes") or 0
+        total = data.get("total_bytes") or data.get("total_bytes_estimate")
+        index = data.get("fragment_index"); count = data.get("fragment_count")
+        if finished:
+            raw_percent: Optional[float] = 100.0
+        elif total:
+            raw_percent = 100.0 * done / total
+        elif index and count:
+            raw_percent = 100.0 * index / count
+        else:
+            raw_percent = None
+
+        overall = self._overall_percent(raw_percent) if raw_percent is not None else None
+        if overall is not None:
+            payload["percent"] = overall
+        if not self._aside and self._part_index >= 0:
+            if index and count:
+                payload["fragment"] = f"{index}/{count}"
+            payload["downloaded_bytes"] = int(self._done_bytes + done)
+            if total:
+                payload["total_bytes"] = int(self._done_bytes + max(total, done))
+            if finished:
+                self._done_bytes += int(total or done)
+        self.progress.emit(self.url, payload)
@@ -9,6 +9,14 @@
 항목은 받을 때 다시 묻지 않는다. 미리 묻기가 통신을 늘리는 것이 아니라
 **앞당길 뿐이도록** 하는 것이 이 짜임의 요점이다.
 
+**주소 여러 개를 한 프로세스로 묻는다.** 즐겨찾기 자동 추가나 한꺼번에 넣기로
+스무~쉰 편이 한 번에 들어오는데, 주소마다 yt-dlp를 띄우면 띄우는 일과 추출기를
+읽는 일이 질의 자체보다 오래 걸린다. 묶어서 넘기면 그것을 한 번만 치른다.
+
+**디스크 캐시(metadata_cache)에 있는 것은 묻지 않는다.** 되살린 대기열처럼 전에
+물어본 주소는 그 자리에서 답하고, 나머지만 yt-dlp에 넘긴다. 새로 얻은 답은
+캐시에 남긴다 — 쓰는 일이 디스크를 건드리므로 UI 스레드가 아닌 여기서 한다.
+
 실패는 조용히 넘긴다. 여기서 못 가져와도 받을 때 DownloadThread가 제 몫으로
 다시 물어보므로, 다운로드 자체는 예전과 똑같이 굴러간다.
 """
@@ -16,10 +24,11 @@
 import json
 import subprocess
 import threading
-from typing import Optional
+from typing import List, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from src import metadata_cache
 from src.threads import ytdlp_run
 
 
@@ -35,12 +44,19 @@ class MetadataThread(QThread):
     들쭉날쭉해진다.
     """
 
-    def __init__(self, url: str, ytdlp_exe_path: str,
+    TIMEOUT_PER_EXTRA_URL = 20
+    """주소를 여럿 묶어 물을 때 하나 늘 때마다 더 주는 시간.
+
+    한 프로세스가 주소를 차례로 읽으므로 묶음이 클수록 오래 걸린다. 그렇다고
+    TIMEOUT을 주소 수만큼 곱하면 멈춘 프로세스를 몇 분씩 붙들고 있게 된다."""
+
+    def __init__(self, urls: List[str], ytdlp_exe_path: str,
                  ignore_ssl_errors: bool = False, parent=None):
         super().__init__(parent)
-        self.url = url
+        self.urls = list(urls)
         self.ytdlp_exe_path = ytdlp_exe_path
         self.ignore_ssl_errors = ignore_ssl_errors
+        self._remaining = set(self.urls)
         self._process: Optional[subprocess.Popen] = None
         self._stop_flag = False
         self._process_lock = threading.Lock()
@@ -76,25 +92,63 @@ class MetadataThread(QThread):
             pass
 
     def run(self):
-        cmd = [self.ytdlp_exe_path, "-J", "--skip-download", *ytdlp_run.network_options()]
+        """주소를 한 프로세스에 모두 넘기고, 한 줄씩 오는 대로 알린다.
+
+        `-j`는 주소마다 정보를 한 줄로 찍는다. 묶음 끝까지 기다리지 않고 읽는
+        대로 loaded를 내서, 먼저 끝난 것의 제목이 먼저 뜬다. `--ignore-errors`를
+        붙이는 것은 하나가 없는 영상이어도 나머지를 계속 읽게 하려는 것이다.
+
+        어느 주소의 답인지는 `original_url`(넘긴 주소 그대로)로 가른다. 순서에
+        기대지 않는 것은 실패한 주소가 줄을 남기지 않아서다. 끝까지 답이 오지
+        않은 주소는 failed로 알린다.
+        """
+        cache = metadata_cache.shared()
+        for url in self.urls:
+            cached = cache.get(metadata_cache.EPISODE, url)
+            if isinstance(cached, dict) and url in self._remaining:
+                self._remaining.discard(url)
+                self.loaded.emit(url, cached)
+        missing = [url for url in self.urls if url in self._remaining]
+        if not missing or self._stop_flag:
+            for url in missing:
+                self.failed.emit(url, ytdlp_run.ABORTED)
+            return
+        cmd = [self.ytdlp_exe_path, "-j", "--skip-download", "--ignore-errors",
+               *ytdlp_run.network_options()]
         if self.ignore_ssl_errors:
             cmd.append("--no-check-certificate")
-        cmd.append(self.url)
-        ok, out, err = ytdlp_run.run(cmd, self.TIMEOUT, "영상 정보 미리 확인",
-                                     on_spawn=self._on_spawn,
-                                     should_stop=lambda: self._stop_flag)
+        cmd += missing
+        timeout = self.TIMEOUT + self.TIMEOUT_PER_EXTRA_URL * (len(missing) - 1)
+        ok, err = ytdlp_run.stream(cmd, timeout, "영상 정보 미리 확인", self._on_line,
+                                   on_spawn=self._on_spawn,
+                                   should_stop=lambda: self._stop_flag)
         if self._stop_flag:
-            self.failed.emit(self.url, ytdlp_run.ABORTED)
-            return
-        if not ok:
-            self.failed.emit(self.url, (err or "").strip())
+            reason = ytdlp_run.ABORTED
+        elif not ok:
+            reason = (err or "").strip() or "영상 정보를 가져오지 못했습니다."
+        else:
+            reason = "영상 정보가 오지 않았습니다."
+        for url in self.urls:
+            if url in self._remaining:
+                self.failed.emit(url, reason)
+
+    def _on_line(self, line: str):
+        """`-j`가 찍은 한 줄을 어느 주소의 답인지 가려 알린다."""
+        if not line.startswith("{"):
             return
         try:
-            metadata = json.loads(out)
+            metadata = json.loads(line)
         except json.JSONDecodeError:
-            self.failed.emit(self.url, "영상 정보를 읽지 못했습니다.")
             return
         if not isinstance(metadata, dict):
-            self.failed.emit(self.url, "영상 정보 형식이 예상과 다릅니다.")
             return
-        self.loaded.emit(self.url, metadata)
+        url = next((candidate for candidate in (metadata.get("original_url"),
+                                                 metadata.get("webpage_url"))
+                    if candidate in self._remaining), None)
+        if url is None and len(self.urls) == 1 and self._remaining:
+            url = self.urls[0]
+        if url is None:
+            return
+        self._remaining.discard(url)
+        metadata_cache.shared().put(metadata_cache.EPISODE, url, metadata)
+        self.loaded.emit(url, metadata)
@@ -1,14 +1,49 @@
 import json
-from typing import List, Dict
+import re
+import subprocess
+import threading
+import time
+from typing import List, Dict, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from src import metadata_cache, tver_api
 from src.threads import ytdlp_run
 
 class SeriesParseThread(QThread):
-    """시리즈 URL을 받아 하위 에피소드 정보(딕셔너리) 리스트를 반환하는 스레드."""
+    """시리즈 URL을 받아 하위 에피소드 정보(딕셔너리) 리스트를 반환하는 스레드.
+
+    찾은 회차 목록은 제외 키워드를 거르기 **전의 것으로** 디스크 캐시(metadata_cache)에
+    남긴다. 키워드를 바꾼 뒤 다시 분석해도 캐시가 예전 키워드로 걸러진 목록을
+    내주지 않게 하려는 것이다. 거르기는 캐시에서 꺼낸 뒤에 한다.
+
+    **제외 키워드에 걸린 회차는 되도록 열지 않는다.** 예고·다이제스트가 본편보다
+    많은 시리즈가 흔한데, 회차를 하나하나 연 다음에 버리면 분석 시간 대부분이
+    버릴 것에 간다. 제목을 미리 아는 곳에서 먼저 거른다 — 목록 API는 제목이 함께
+    오고, 새 회차만 여는 길은 목록 훑기의 제목으로 거른 뒤 연다. yt-dlp로 전체를
+    여는 길은 `--match-filters`로 넘겨, yt-dlp가 열기 전에 제목을 알면 그 자리에서
+    건너뛰게 한다. 그 길에서 남긴 목록은 이미 걸러진 것이라, 캐시에 어떤 키워드로
+    걸렀는지(prefiltered)를 함께 적고 키워드가 줄었으면 그 캐시를 쓰지 않는다.
+
+    회차 목록은 먼저 TVer 목록 API로 직접 받는다(_run_native). 거기서 못 받으면
+    예전처럼 yt-dlp로 돈다.
+
+    **찾은 회차는 끝나기 전에도 entries로 조금씩 낸다.** 1차 분석은 `-J`로 시리즈
+    전체를 한 문서로 받았는데, 긴 시리즈는 수 MB라 마지막 회차를 열 때까지 아무것도
+    보여 줄 수 없었다. 이제 `-j`로 회차마다 한 줄씩 받아 읽는 대로 알린다. 목록
+    API는 시즌마다 알린다. finished는 예전처럼 끝에 한 번, 전체 목록으로 낸다.
+
+    known(SeriesIndexStore가 적어 둔 지난번 회차)을 주면 회차를 모두 열지 않고
+    새 회차만 연다(_run_incremental). 끝나면 거르기 전의 회차 목록을 indexed에
+    남겨, 부르는 쪽이 다음 확인을 위해 적어 둘 수 있게 한다.
+
+    stop()으로 세운 분석도 finished를 낸다(빈 목록). 부르는 쪽은 stopped를 보고
+    결과가 아니라 양보였음을 안다(SeriesParser._preempt).
+    """
     log = pyqtSignal(str)
     finished = pyqtSignal(str, list)
+    entries = pyqtSignal(str, list)
+    """(시리즈 제목, 찾은 회차 일부). 분석이 끝나기 전에 찾는 대로 낸다. 거른 뒤의 것이다."""
 
     TITLE_ONLY_TIMEOUT = 60
     PARSE_TIMEOUT = 300
@@ -19,12 +54,59 @@ class SeriesParseThread(QThread):
     """
 
     def __init__(self, series_url: str, ytdlp_exe_path: str, exclude_keywords: List[str],
-                 title_only: bool = False, parent=None):
+                 title_only: bool = False,
+                 known: Optional[Dict[str, Dict[str, str]]] = None, parent=None):
         super().__init__(parent)
         self.series_url = series_url
         self.ytdlp_exe_path = ytdlp_exe_path
         self.exclude_keywords = [k.lower() for k in exclude_keywords if k.strip()]
         self.title_only = title_only
+        self.known = known or {}
+        self.indexed: List[Dict[str, str]] = []
+        """거르기 전의 회차 목록. 분석이 실패했으면 비어 있다."""
+        self.prefiltered: List[str] = []
+        """indexed를 만들 때 미리 거른 키워드. 비어 있으면 걸러지지 않은 목록이다."""
+        self.skipped = 0
+        """제외 키워드에 걸려 열지 않은 회차 수."""
+        self.filtered = 0
+        """yt-dlp가 `--match-filters`로 걸러 목록에 오지 않은 회차 수(_stream_entries)."""
+        self.saved_seconds = 0.0
+        """그 회차들을 열었다면 들었을 시간의 어림. 이번에 연 회차의 평균으로 잰다."""
+        self._process: Optional[subprocess.Popen] = None
+        self._stop_flag = False
+        self._process_lock = threading.Lock()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_flag
+
+    def stop(self):
+        """분석을 그만둔다. MetadataThread.stop과 같은 순서로 자물쇠를 쓴다."""
+        with self._process_lock:
+            self._stop_flag = True
+            proc = self._process
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+    def _on_spawn(self, proc: subprocess.Popen):
+        with self._process_lock:
+            self._process = proc
+            stopping = self._stop_flag
+        if not stopping:
+            return
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+    def _run(self, command: List[str], timeout: int, label: str):
+        """ytdlp_run.run에 이 스레드의 중단 수단을 붙여 부른다."""
+        return ytdlp_run.run(command, timeout, label, self.log.emit,
+                             on_spawn=self._on_spawn, should_stop=lambda: self._stop_flag)
 
     def _is_excluded(self, title: str) -> bool:
         if not self.exclude_keywords:
@@ -35,6 +117,27 @@ class SeriesParseThread(QThread):
                 return True
         return False
 
+    def _exclude(self, episodes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return [episode for episode in episodes if not self._is_excluded(episode.get("title", ""))]
+
+    def _match_filter(self) -> List[str]:
+        """제외 키워드를 yt-dlp `--match-filters` 인자로 옮긴다. 키워드가 없으면 빈 목록.
+
+        _is_excluded와 같은 뜻(대소문자 없이, 제목 안 어디든)이 되도록 키워드를
+        정규식으로 이스케이프해 `|`로 잇는다. `?`는 제목이 없는 회차를 통과시킨다 —
+        제목을 모르는 것까지 버리면 예전에 보이던 회차가 사라진다.
+        """
+        if not self.exclude_keywords:
+            return []
+        pattern = "|".join(re.escape(keyword) for keyword in self.exclude_keywords)
+        pattern = pattern.replace("'", "\\'")
+        return ["--match-filters", f"title!~=?'(?i)(?:{pattern})'"]
+
+    def _cache_usable(self, cached: dict) -> bool:
+        """캐시가 지금 키워드로 쓸 만한가. 미리 거른 키워드가 지금 키워드 안에 다 있어야 한다."""
+        prefiltered = cached.get("prefiltered") or []
+        return isinstance(prefiltered, list) and set(prefiltered) <= set(self.exclude_keywords)
+
     def _parse_entries(self, entries: list) -> List[Dict[str, str]]:
         results: List[Dict[str, str]] = []
         for meta in entries:
@@ -42,7 +145,7 @@ class SeriesParseThread(QThread):
             url = meta.get("webpage_url") or meta.get("url")
             title = meta.get("title", "제목 없음")
             thumbnail_url = meta.get("thumbnail")
-            if url and title and not self._is_excluded(title):
+            if url and title:
                 results.append({
                     "url": url.strip(),
                     "title": title.strip(),
@@ -50,20 +153,78 @@ class SeriesParseThread(QThread):
                 })
         return results
 
-    def _parse_json_output(self, out: str) -> List[Dict[str, str]]:
-        try:
-            data = json.loads(out)
-            if isinstance(data, dict) and "entries" in data:
-                return self._parse_entries(data.get("entries") or [])
-            else:
-                return self._parse_entries([data])
-        except json.JSONDecodeError:
-            entries = []
-            for line in (out or "").splitlines():
-                try:
-                    entries.append(json.loads(line))
-                except (json.JSONDecodeError, KeyError): continue
-            return self._parse_entries(entries)
+    def _remember_episodes(self, entries: list):
+        """1차 분석이 회차마다 받아 온 정보를 회차 캐시에도 남긴다.
+
+        `-J`는 회차 하나하나를 열어 본 답을 담고 있어, 고른 회차를 대기열에 넣을 때
+        미리 묻기가 같은 것을 다시 묻지 않아도 된다.
+        """
+        cache = metadata_cache.shared()
+        for meta in entries:
+            if isinstance(meta, dict) and meta.get("webpage_url") and meta.get("formats"):
+                cache.put(metadata_cache.EPISODE, meta["webpage_url"], meta)
+
+    def _announce(self, series_title: str, episodes: List[Dict[str, str]]):
+        """찾은 회차를 걸러 entries로 낸다. 거르고 남은 것이 없으면 내지 않는다."""
+        shown = self._exclude(episodes)
+        if shown and not self._stop_flag:
+            self.entries.emit(series_title, shown)
+
+    def _stream_entries(self) -> tuple:
+        """`-j`로 회차를 한 줄씩 받으며 알린다. (성공, 시리즈 제목, 오류 문구, 회차 목록).
+
+        `--ignore-errors`라 한 회차를 못 열어도 나머지는 이어 읽는다. 그때는 성공이
+        False여도 회차 목록이 차 있다. 아무것도 받지 못한 통신 실패만 ytdlp_run.run과
+        같은 지수 백오프로 다시 건다.
+
+        `--match-filters`로 걸러진 회차는 줄이 오지 않아 셀 수 없다. 대신 회차 줄마다
+        실린 `n_entries`(그 재생 목록에서 꺼낸 항목 수, 거르기 전)와 받은 줄 수의
+        차이로 센다(filtered). 시즌마다 재생 목록이 따로일 수 있어 playlist_id마다
+        잰다. 못 연 회차도 줄이 오지 않으므로 오류 없이 끝났을 때만 센다.
+        """
+        command = [self.ytdlp_exe_path, "-j", "--skip-download", "--ignore-errors",
+                   *self._match_filter(), *ytdlp_run.network_options(), self.series_url]
+        self.prefiltered = list(self.exclude_keywords)
+        series_title = ""
+        episodes: List[Dict[str, str]] = []
+        listed: Dict[str, int] = {}
+        received: Dict[str, int] = {}
+
+        def on_line(line: str):
+            nonlocal series_title
+            if not line.startswith("{"):
+                return
+            try:
+                meta = json.loads(line)
+            except json.JSONDecodeError:
+                return
+            if not isinstance(meta, dict):
+                return
+            series_title = series_title or meta.get("playlist_title") or meta.get("playlist") or ""
+            playlist = str(meta.get("playlist_id") or "")
+            if isinstance(meta.get("n_entries"), int):
+                listed[playlist] = max(listed.get(playlist, 0), meta["n_entries"])
+            received[playlist] = received.get(playlist, 0) + 1
+            self._remember_episodes([meta])
+            found = self._parse_entries([meta])
+            episodes.extend(found)
+            self._announce(series_title, found)
+
+        ok, err = False, ""
+        for attempt in range(1, ytdlp_run.MAX_ATTEMPTS + 1):
+            ok, err = ytdlp_run.stream(command, self.PARSE_TIMEOUT, "시리즈 1차 분석", on_line,
+                                       on_spawn=self._on_spawn, should_stop=lambda: self._stop_flag)
+            if ok or episodes or self._stop_flag or attempt >= ytdlp_run.MAX_ATTEMPTS \
+                    or not ytdlp_run.is_retriable(err):
+                break
+            delay = ytdlp_run.RETRY_BASE_DELAY * (2 ** (attempt - 1))
+            self.log.emit(f" ... 통신이 원활하지 않습니다. {delay}초 후 다시 시도합니다"
+                          f" ({attempt + 1}/{ytdlp_run.MAX_ATTEMPTS}).")
+            time.sleep(delay)
+        if ok and self.exclude_keywords:
+            self.filtered = sum(max(0, count - received.get(playlist, 0))
+                                for playlist, count in listed.items())
+        return ok, series_title, err, episodes
 
     def _parse_flat_output(self, out: str) -> List[Dict[str, str]]:
         results: List[Dict[str, str]] = []
@@ -71,8 +232,7 @@ class SeriesParseThread(QThread):
         for line in lines:
             try:
                 url, title = line.split("\t", 1)
-                if not self._is_excluded(title or ""):
-                    results.append({"url": url.strip(), "title": title.strip(), "thumbnail_url": ""})
+                results.append({"url": url.strip(), "title": title.strip(), "thumbnail_url": ""})
             except ValueError: continue
         return results
 
@@ -84,10 +244,18 @@ class SeriesParseThread(QThread):
         넣은 시리즈는 제목만 있으면 되고, 회차 목록은 '신규 영상 확인'을 누르거나
         다음 실행 때 어차피 다시 훑는다.
         """
+        cached = metadata_cache.shared().get(metadata_cache.SERIES, self.series_url)
+        if isinstance(cached, dict) and cached.get("title"):
+            self.finished.emit(cached["title"], [])
+            return
         self.log.emit(f"[시리즈] 제목 확인 중: {self.series_url}")
+        native = self._list_native()
+        if native is not None:
+            self.finished.emit(native[0], [])
+            return
         command = [self.ytdlp_exe_path, "--flat-playlist", "--playlist-items", "1", "-J", "--skip-download",
                    *ytdlp_run.network_options(), self.series_url]
-        ok, out, err = ytdlp_run.run(command, self.TITLE_ONLY_TIMEOUT, "시리즈 제목 확인", self.log.emit)
+        ok, out, err = self._run(command, self.TITLE_ONLY_TIMEOUT, "시리즈 제목 확인")
         if not ok:
             self.log.emit(f"[오류] 시리즈 제목 확인 실패:\n{(err or '').strip()}")
             self.finished.emit("", [])
@@ -100,46 +268,206 @@ class SeriesParseThread(QThread):
             series_title = ""
         self.finished.emit(series_title, [])
 
+    def _list_native(self) -> Optional[tuple]:
+        """TVer 목록 API로 (시리즈 제목, 회차 목록)을 받는다. 못 받았으면 None.
+
+        yt-dlp를 띄우지 않아 몇십 ms면 끝난다. 실패는 로그에 한 줄 남기고 None을
+        돌려, 부르는 쪽이 예전 yt-dlp 길로 가게 한다.
+        """
+        if not tver_api.series_id(self.series_url):
+            return None
+        try:
+            return tver_api.shared().list_series(
+                self.series_url, should_stop=lambda: self._stop_flag,
+                on_episodes=None if self.title_only else self._announce)
+        except tver_api.TVerApiError as e:
+            if not self._stop_flag:
+                self.log.emit(f"[알림] TVer 목록을 바로 받지 못해 yt-dlp로 확인합니다: {e}")
+            return None
+
+    def _run_native(self) -> bool:
+        """목록 API로 받은 회차로 끝낸다. 못 받았으면 False."""
+        native = self._list_native()
+        if self._stop_flag:
+            self.finished.emit("", [])
+            return True
+        if native is None:
+            return False
+        self._finish(*native)
+        return True
+
+    FLAT_FIELDS = "%(url)s\t%(playlist_title)s\t%(title)s"
+    """회차 목록만 훑을 때 한 줄에 찍는 것. 시리즈 제목도 함께 받는다."""
+
+    def _run_incremental(self) -> bool:
+        """회차 목록만 훑고, known에 없는 회차만 연다. 못 했으면 False.
+
+        목록 훑기(`--flat-playlist`)는 회차를 열지 않아 몇 초면 끝난다. 새 회차는
+        `-j`로 한 번에 연다. 아는 회차의 제목·표지 그림은 known에서 꺼낸다.
+
+        목록을 못 받았거나 비어 있으면 False를 돌려 예전처럼 전부 열게 한다.
+        TVer가 바뀌어 목록 훑기만 안 되는 날에도 확인은 돌아야 한다.
+        """
+        self.log.emit(f"[시리즈] 새 회차 확인 중: {self.series_url}")
+        command = [self.ytdlp_exe_path, "--flat-playlist", "--print", self.FLAT_FIELDS,
+                   "--skip-download", *ytdlp_run.network_options(), self.series_url]
+        ok, out, err = self._run(command, self.PARSE_TIMEOUT, "시리즈 회차 목록 확인")
+        if self._stop_flag:
+            self.finished.emit("", [])
+            return True
+        if not ok:
+            self.log.emit(f"[알림] 회차 목록만 훑지 못해 전체를 분석합니다: {(err or '').strip()}")
+            return False
+        listing: List[tuple] = []
+        series_title = ""
+        for line in (out or "").splitlines():
+            parts = line.split("\t", 2)
+            if len(parts) != 3 or not parts[0].strip():
+                continue
+            url, playlist_title, title = (part.strip() for part in parts)
+            if not series_title and playlist_title != "NA":
+                series_title = playlist_title
+            listing.append((url, title))
+        if not listing:
+            return False
+
+        fresh = [(url, title) for url, title in listing if url not in self.known]
+        new_urls = [url for url, title in fresh
+                    if not (title and title != "NA" and self._is_excluded(title))]
+        self.skipped = len(fresh) - len(new_urls)
+        self.log.emit(f"[시리즈] 회차 {len(listing)}개 중 새 회차 {len(new_urls)}개만 확인합니다.")
+        started = time.monotonic()
+        resolved = self._resolve(new_urls) if new_urls else {}
+        if self.skipped and resolved:
+            self.saved_seconds = (time.monotonic() - started) / len(new_urls) * self.skipped
+        if self._stop_flag:
+            self.finished.emit("", [])
+            return True
+        episodes = []
+        for url, title in listing:
+            meta = resolved.get(url) or self.known.get(url) or {}
+            episodes.append({"url": url,
+                             "title": meta.get("title") or title or "제목 없음",
+                             "thumbnail_url": meta.get("thumbnail_url", "")})
+        self._finish(series_title, episodes)
+        return True
+
+    def _resolve(self, urls: List[str]) -> Dict[str, Dict[str, str]]:
+        """회차 여럿을 열어 제목·표지 그림을 얻는다. 못 연 회차는 빠진다.
+
+        회차 캐시(metadata_cache)에 있는 것은 열지 않는다. 나머지는 yt-dlp 한 번에
+        `-j`로 넘긴다. 새로 연 것은 회차 캐시에도 남겨, 대기열에 넣었을 때 미리
+        묻기가 다시 열지 않게 한다.
+
+        ytdlp_run.stream으로 돈다. 하나라도 못 열면 yt-dlp가 1로 끝나는데, run()은
+        그것을 실패로 보고 exe로 묶음 전체를 다시 연다.
+        """
+        cache = metadata_cache.shared()
+        found: Dict[str, Dict[str, str]] = {}
+        missing = []
+        for url in urls:
+            meta = cache.get(metadata_cache.EPISODE, url)
+            if isinstance(meta, dict):
+                found[url] = {"title": meta.get("title") or "", "thumbnail_url": meta.get("thumbnail") or ""}
+            else:
+                missing.append(url)
+        if not missing:
+            return found
+        command = [self.ytdlp_exe_path, "-j", "--skip-download", "--ignore-errors",
+                   *ytdlp_run.network_options(), *missing]
+        lines: List[str] = []
+        ok, err = ytdlp_run.stream(command, self.PARSE_TIMEOUT, "새 회차 확인", lines.append,
+                                   on_spawn=self._on_spawn, should_stop=lambda: self._stop_flag)
+        if not ok and not lines:
+            self.log.emit(f"[알림] 새 회차 정보를 받지 못했습니다: {(err or '').strip()}")
+        wanted = set(missing)
+        for line in lines:
+            try:
+                meta = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(meta, dict):
+                continue
+            url = next((u for u in (meta.get("original_url"), meta.get("webpage_url")) if u in wanted), None)
+            if url is None:
+                continue
+            cache.put(metadata_cache.EPISODE, url, meta)
+            found[url] = {"title": meta.get("title") or "", "thumbnail_url": meta.get("thumbnail") or ""}
+        return found
+
+    def _finish(self, series_title: str, episodes: List[Dict[str, str]]):
+        """거르기 전 목록을 남기고, 걸러서 알린다.
+
+        제외 키워드로 뺀 회차 수도 로그에 남긴다. 목록 API·캐시로 받은 것은 원래
+        열지 않으므로 뺀 수만, 새 회차만 여는 길은 열지 않아 아낀 시간도 함께 적는다.
+        yt-dlp가 `--match-filters`로 걸러 episodes에 없는 회차(filtered)도 뺀 수에 든다.
+        """
+        self.indexed = episodes
+        if episodes:
+            metadata_cache.shared().put(metadata_cache.SERIES, self.series_url,
+                                        {"title": series_title, "episodes": episodes,
+                                         "prefiltered": self.prefiltered})
+        shown = self._exclude(episodes)
+        excluded = len(episodes) - len(shown) + self.filtered
+        if self.saved_seconds >= 1:
+            self.log.emit(f"[시리즈] 제외 키워드로 {self.skipped}개는 열지 않았습니다"
+                          f" (약 {self.saved_seconds:.0f}초 절약).")
+        elif excluded:
+            self.log.emit(f"[시리즈] 제외 키워드로 {excluded}개를 뺐습니다.")
+        episodes = shown
+        self.log.emit(f"최종 {len(episodes)}개 에피소드 정보 추출 완료.")
+        self.finished.emit(series_title, episodes)
+
     def run(self):
         try:
             if self.title_only:
                 self._run_title_only()
                 return
+            cached = metadata_cache.shared().get(metadata_cache.SERIES, self.series_url)
+            if (isinstance(cached, dict) and isinstance(cached.get("episodes"), list)
+                    and self._cache_usable(cached)):
+                self.log.emit(f"[시리즈] 방금 분석한 결과를 다시 씁니다: {self.series_url}")
+                self.indexed = [e for e in cached["episodes"] if isinstance(e, dict)]
+                episodes = self._exclude(self.indexed)
+                self.log.emit(f"최종 {len(episodes)}개 에피소드 정보 추출 완료.")
+                self.finished.emit(cached.get("title") or "", episodes)
+                return
+            if self._run_native():
+                return
+            if self.known and self._run_incremental():
+                return
             self.log.emit(f"[시리즈] 분석 중 (1/2): {self.series_url}")
-            command1 = [self.ytdlp_exe_path, "-J", "--skip-download",
-                        *ytdlp_run.network_options(), self.series_url]
-            ok1, out1, err1 = ytdlp_run.run(command1, self.PARSE_TIMEOUT, "시리즈 1차 분석", self.log.emit)
-
-            series_title = ""
-            episodes = []
-
-            if ok1:
-                try:
-                    data = json.loads(out1)
-                    series_title = data.get("playlist_title") or data.get("title", "")
-                except json.JSONDecodeError:
-                    pass
-                episodes = self._parse_json_output(out1)
-            else:
-                self.log.emit(f"[오류] 시리즈 1차 분석 실패:\n{(err1 or '').strip()}");
+            ok1, series_title, err1, episodes = self._stream_entries()
+            if self._stop_flag:
+                self.finished.emit("", []); return
+            if not ok1 and not episodes:
+                self.log.emit(f"[오류] 시리즈 1차 분석 실패:\n{(err1 or '').strip()}")
                 self.finished.emit("", []); return
 
-            if not episodes:
-                self.log.emit("[시리즈] 1차 분석 결과 없음. 2차 분석 시도...")
+            if not episodes or not ok1:
+                if episodes:
+                    self.log.emit("[시리즈] 열지 못한 회차가 있어 2차 분석으로 목록을 채웁니다...")
+                else:
+                    self.log.emit("[시리즈] 1차 분석 결과 없음. 2차 분석 시도...")
                 command2 = [self.ytdlp_exe_path, "--flat-playlist",
                             "--print", "%(url)s\t%(title)s", "--skip-download",
                             *ytdlp_run.network_options(), self.series_url]
-                ok2, out2, err2 = ytdlp_run.run(command2, self.PARSE_TIMEOUT, "시리즈 2차 분석", self.log.emit)
+                ok2, out2, err2 = self._run(command2, self.PARSE_TIMEOUT, "시리즈 2차 분석")
 
                 if not ok2:
+                    if self._stop_flag:
+                        self.finished.emit("", []); return
                     self.log.emit(f"[오류] 시리즈 2차 분석 실패:\n{(err2 or '').strip()}");
-                    self.finished.emit(series_title, []); return
-
-                episodes = self._parse_flat_output(out2)
-                if not episodes and err2: self.log.emit(f"[진단] 2차 분석 결과 없음. 오류 스트림: {(err2 or '없음').strip()}")
+                    if not episodes:
+                        self.finished.emit(series_title, []); return
+                else:
+                    seen = {episode["url"] for episode in episodes}
+                    extra = [e for e in self._parse_flat_output(out2) if e["url"] not in seen]
+                    self._announce(series_title, extra)
+                    episodes += extra
+                    if not episodes and err2: self.log.emit(f"[진단] 2차 분석 결과 없음. 오류 스트림: {(err2 or '없음').strip()}")
 
-            self.log.emit(f"최종 {len(episodes)}개 에피소드 정보 추출 완료.")
-            self.finished.emit(series_title, episodes)
+            self._finish(series_title, episodes)
         except Exception as e:
             self.log.emit(f"[오류] 시리즈 분석 중 예외: {e}");
             self.finished.emit("", [])
@@ -0,0 +1,375 @@
+"""상주 yt-dlp 작업자(src/ytdlp_worker.py)를 몇 개 띄워 두고 빌려 주는 곳.
+
+**일감마다 yt-dlp.exe를 새로 띄우던 것을 대신한다.** 미리 묻기·시리즈 분석·
+다운로드가 모두 ytdlp_run이나 DownloadThread를 거쳐 프로세스를 하나씩 세웠는데,
+묶인 실행 파일은 세우는 데만 1~2초가 든다. 작업자는 그 준비를 한 번만 하고
+같은 프로세스로 일감을 이어 받는다.
+
+**여기서 못 하면 None을 돌려주고, 부르는 쪽이 예전처럼 exe를 띄운다.** 작업자는
+앱에 묶인 yt_dlp 모듈을 쓰는데, 그것이 없거나(소스로 돌리며 설치하지 않은 경우)
+작업자가 도중에 죽으면 이 길은 쓸 수 없다. 그때 다운로드까지 실패로 만들면
+빨라지려던 것이 고장의 원인이 된다.
+
+**빌려 줄 수 있는 작업자 수에 상한을 둔다**(MAX_WORKERS). 작업자 하나는 yt-dlp를
+읽어 둔 파이썬 프로세스라, 동시 다운로드 20개를 모두 작업자로 돌리면 그만큼
+메모리를 잡는다. 넘치는 일감은 exe로 돈다 — 느려질 뿐 멈추지는 않는다.
+
+부르는 쪽은 모두 작업 스레드다. 빌리고 돌려주는 일이 여러 스레드에서 겹치므로
+자물쇠로 묶는다.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils import get_startupinfo
+from src.ytdlp_worker import worker_command, worker_cwd
+
+LineHandler = Callable[[str, str], None]
+"""(stream, text). stream은 "out" 또는 "err"."""
+
+POLL_INTERVAL = 0.2
+"""일감을 기다리며 그만두라는 요청을 살피는 간격(초).
+
+yt-dlp.exe는 프로세스를 죽이면 읽던 파이프가 곧바로 풀렸다. 작업자는 빌려 준
+프로세스를 함부로 죽이지 않으므로, 이만큼마다 깨어나 물어본다."""
+
+
+class PoolResult:
+    """작업자로 돌린 일감 하나의 결과."""
+
+    def __init__(self, returncode: Optional[int], out: str = "", err: str = "",
+                 aborted: bool = False, timed_out: bool = False):
+        self.returncode = returncode
+        self.out = out
+        self.err = err
+        self.aborted = aborted
+        self.timed_out = timed_out
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.aborted and not self.timed_out
+
+
+class _Worker:
+    """작업자 프로세스 하나와 그 출력을 읽는 스레드.
+
+    출력은 읽는 스레드가 줄마다 큐에 넣는다. 일감을 맡긴 쪽은 큐를 기다리며
+    시간 제한과 중단 요청을 함께 살핀다. 파이프를 직접 readline()으로 붙잡으면
+    둘 다 볼 수 없다.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, command: List[str], cwd: str):
+        popen_kwargs: Dict = {}
+        if os.name == "nt":
+            popen_kwargs["creationflags"] = (subprocess.CREATE_NO_WINDOW
+                                             | subprocess.CREATE_NEW_PROCESS_GROUP)
+            popen_kwargs["startupinfo"] = get_startupinfo()
+        else:
+            popen_kwargs["start_new_session"] = True
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, cwd=cwd, **popen_kwargs)
+        self.events: "queue.Queue[Dict]" = queue.Queue()
+        self.version = ""
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        stdout = self.proc.stdout
+        try:
+            for raw in iter(stdout.readline, b""):
+                try:
+                    message = json.loads(raw.decode("utf-8", "ignore"))
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(message, dict):
+                    self.events.put(message)
+        except (OSError, ValueError):
+            pass
+        self.events.put({"event": "eof"})
+
+    def handshake(self, timeout: float) -> Tuple[bool, str]:
+        """첫 인사를 기다린다. (쓸 수 있는지, 못 쓰면 그 이유)."""
+        try:
+            message = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return False, f"작업자가 {timeout:.0f}초 안에 준비되지 않았습니다."
+        if message.get("event") != "hello":
+            return False, "작업자가 준비되기 전에 끝났습니다."
+        if not message.get("ok"):
+            return False, str(message.get("error") or "yt_dlp 모듈을 읽지 못했습니다.")
+        self.version = str(message.get("version") or "")
+        return True, ""
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def submit(self, args: List[str]) -> int:
+        job_id = next(self._ids)
+        data = (json.dumps({"id": job_id, "args": args}, ensure_ascii=False) + "\n").encode("utf-8")
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+        return job_id
+
+    def kill(self):
+        """작업자를 통째로 끝낸다. yt-dlp가 띄운 ffmpeg까지 함께.
+
+        DownloadThread._kill_process_tree와 같은 순서다. 작업자만 죽이면 병합 중이던
+        ffmpeg가 고아로 남아 쓰다 만 파일을 붙잡는다.
+        """
+        p = self.proc
+        if p.poll() is not None:
+            return
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/PID", str(p.pid), "/T", "/F"], check=False,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=subprocess.CREATE_NO_WINDOW)
+            else:
+                os.killpg(os.getpgid(p.pid), signal.SIGKILL)
+        except (ProcessLookupError, OSError, AttributeError):
+            pass
+        try:
+            p.kill()
+            p.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+
+class YtdlpPool:
+    """상주 작업자를 빌려 주고 돌려받는다."""
+
+    MAX_WORKERS = 6
+    """동시에 살아 있을 수 있는 작업자 수. 넘치면 부르는 쪽이 exe로 돈다."""
+
+    WARM_WORKERS = 2
+    """일감이 없어도 띄워 둘 작업자 수.
+
+    미리 묻기 하나와 다운로드 하나가 겹치는 것이 가장 흔한 경우라 둘이다. 그보다
+    많이 남겨 두면 아무것도 받지 않는 동안에도 메모리를 잡고 있다."""
+
+    HANDSHAKE_TIMEOUT = 30.0
+    """작업자가 yt_dlp를 읽어 들이기까지 기다리는 시간(초).
+
+    처음 한 번은 백신 검사까지 겹쳐 몇 초씩 걸리기도 한다. 그래도 이보다 오래
+    걸리면 그냥 exe를 띄우는 편이 낫다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._busy: set = set()
+        self._enabled = True
+        self._closed = False
+        self._unavailable = ""
+        self.version = ""
+
+    def set_enabled(self, enabled: bool):
+        """설정에서 끄면 새로 빌려 주지 않는다. 쉬고 있던 작업자도 거둔다."""
+        with self._lock:
+            self._enabled = bool(enabled)
+            idle = [] if self._enabled else self._idle
+            if not self._enabled:
+                self._idle = []
+        for worker in idle:
+            worker.kill()
+
+    def available(self) -> bool:
+        with self._lock:
+            return self._enabled and not self._closed and not self._unavailable
+
+    @property
+    def unavailable_reason(self) -> str:
+        """이 길을 접은 이유. 접지 않았으면 빈 글."""
+        return self._unavailable
+
+    def prewarm(self):
+        """쉬는 작업자를 WARM_WORKERS만큼 미리 띄운다. 기다리지 않고 바로 돌아온다.
+
+        준비가 끝난 직후에 부른다. 첫 일감이 올 때 세우기 시작하면 첫 미리 묻기가
+        예전만큼 기다린다.
+        """
+        if not self.available():
+            return
+
+        def warm():
+            while True:
+                with self._lock:
+                    if (len(self._idle) >= self.WARM_WORKERS or not self._enabled
+                            or self._closed or self._unavailable
+                            or len(self._idle) + len(self._busy) >= self.MAX_WORKERS):
+                        return
+                worker = self._spawn()
+                if worker is None:
+                    return
+                self.release(worker)
+
+        threading.Thread(target=warm, daemon=True).start()
+
+    def _spawn(self) -> Optional[_Worker]:
+        """작업자 하나를 세우고 인사를 받는다. 못 세우면 이 길을 접는다.
+
+        yt_dlp가 없다는 답은 다시 물어도 같다. 일감마다 세우다 실패하기를 되풀이하면
+        exe 하나 띄우는 것보다 더 느려지므로, 한 번 실패하면 이번 실행 동안 쓰지 않는다.
+        """
+        try:
+            worker = _Worker(worker_command(), worker_cwd())
+        except OSError as e:
+            self._give_up(f"작업자를 띄우지 못했습니다: {e}")
+            return None
+        ok, reason = worker.handshake(self.HANDSHAKE_TIMEOUT)
+        if not ok:
+            worker.kill()
+            self._give_up(reason)
+            return None
+        self.version = worker.version
+        return worker
+
+    def _give_up(self, reason: str):
+        with self._lock:
+            self._unavailable = reason
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+    def acquire(self) -> Optional[_Worker]:
+        """쉬는 작업자를 하나 빌린다. 없으면 새로 세운다. 빌려 줄 수 없으면 None."""
+        with self._lock:
+            if not self._enabled or self._closed or self._unavailable:
+                return None
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    self._busy.add(worker)
+                    return worker
+            if len(self._busy) >= self.MAX_WORKERS:
+                return None
+            placeholder = object()
+            self._busy.add(placeholder)
+        try:
+            worker = self._spawn()
+        finally:
+            with self._lock:
+                self._busy.discard(placeholder)
+        if worker is None:
+            return None
+        with self._lock:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._busy.add(worker)
+        if closed:
+            worker.kill()
+            return None
+        return worker
+
+    def release(self, worker: _Worker):
+        """다 쓴 작업자를 돌려받는다. 쉬는 것이 넉넉하면 끝낸다."""
+        with self._lock:
+            self._busy.discard(worker)
+            keep = (worker.alive() and self._enabled and not self._closed
+                    and len(self._idle) < self.WARM_WORKERS)
+            if keep:
+                self._idle.append(worker)
+        if not keep:
+            worker.kill()
+
+    def discard(self, worker: _Worker):
+        """중간에 끊어 더 쓸 수 없는 작업자를 거둔다."""
+        with self._lock:
+            self._busy.discard(worker)
+        worker.kill()
+
+    def shutdown(self):
+        """앱을 끝낼 때 부른다. 쉬는 것이든 일하는 것이든 모두 끝낸다.
+
+        일하던 작업자를 맡은 스레드는 출력이 끊기는 것을 보고 실패로 빠져나온다.
+        """
+        with self._lock:
+            self._closed = True
+            workers = self._idle + [w for w in self._busy if isinstance(w, _Worker)]
+            self._idle = []
+            self._busy = set()
+        for worker in workers:
+            worker.kill()
+
+    def run(self, args: List[str], timeout: Optional[float] = None,
+            should_stop: Optional[Callable[[], bool]] = None,
+            on_line: Optional[LineHandler] = None) -> Optional[PoolResult]:
+        """yt-dlp 인자(실행 파일 이름은 빼고)를 작업자에게 맡기고 끝날 때까지 기다린다.
+
+        작업자를 빌리지 못했거나 작업자가 도중에 사라졌으면 None. 부르는 쪽은 그때
+        exe로 다시 돈다. 도중에 사라진 경우 yt-dlp가 무엇을 했는지는 알 수 없지만,
+        exe 쪽도 처음부터 다시 하는 것이라 결과는 같다.
+
+        on_line을 넘기면 줄을 그때그때 넘기고 쌓아 두지 않는다. 다운로드처럼 몇 시간
+        동안 진행률을 찍는 일감에서 그것을 모두 들고 있을 이유가 없다.
+
+        **시간을 넘기거나 그만두라고 하면 작업자를 끝낸다.** yt-dlp 안쪽에서 도는
+        일을 밖에서 멈출 방법이 그것뿐이다. 다음 일감은 새 작업자가 받는다.
+        """
+        worker = self.acquire()
+        if worker is None:
+            return None
+        try:
+            job_id = worker.submit(args)
+        except (OSError, ValueError):
+            self.discard(worker)
+            return None
+
+        out: List[str] = []
+        err: List[str] = []
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            if should_stop and should_stop():
+                self.discard(worker)
+                return PoolResult(None, aborted=True)
+            wait = POLL_INTERVAL
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    self.discard(worker)
+                    return PoolResult(None, timed_out=True)
+                wait = min(wait, left)
+            try:
+                message = worker.events.get(timeout=wait)
+            except queue.Empty:
+                continue
+            event = message.get("event")
+            if event == "eof":
+                self.discard(worker)
+                if should_stop and should_stop():
+                    return PoolResult(None, aborted=True)
+                return None
+            if message.get("id") != job_id:
+                continue
+            if event == "line":
+                stream = message.get("stream") or "out"
+                text = str(message.get("text") or "")
+                if on_line is not None:
+                    on_line(stream, text)
+                else:
+                    (err if stream == "err" else out).append(text)
+            elif event == "exit":
+                code = message.get("code")
+                self.release(worker)
+                return PoolResult(code if isinstance(code, int) else 1,
+                                  "\n".join(out), "\n".join(err))
+
+
+_shared = YtdlpPool()
+
+
+def shared() -> YtdlpPool:
+    """앱 전체가 함께 쓰는 작업자 묶음."""
+    return _shared
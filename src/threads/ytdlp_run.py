@@ -12,9 +12,12 @@
 from __future__ import annotations
 
 import subprocess
+import threading
 import time
 from typing import Callable, List, Optional, Tuple
 
+from src import connection_budget
+from src.threads import ytdlp_pool
 from src.utils import get_startupinfo
 
 SOCKET_TIMEOUT = "30"
@@ -100,7 +103,8 @@ ABORTED = "중단했습니다."
 def run(command: List[str], timeout: int, label: str,
         on_log: Optional[Callable[[str], None]] = None,
         on_spawn: Optional[Callable[[subprocess.Popen], None]] = None,
-        should_stop: Optional[Callable[[], bool]] = None) -> Tuple[bool, str, str]:
+        should_stop: Optional[Callable[[], bool]] = None,
+        draw_budget: bool = True) -> Tuple[bool, str, str]:
     """yt-dlp를 돌리고 (성공 여부, 표준 출력, 오류 문구)를 돌려준다.
 
     통신 문제로 보이면 지수 백오프로 다시 건다. 제한 시간을 넘긴 경우는 다시 걸지
@@ -114,31 +118,57 @@ def run(command: List[str], timeout: int, label: str,
     should_stop은 다음 차례로 넘어가기 전에 물어보는 것이라, 죽인 뒤 오류 문구가
     통신 문제처럼 보여 다시 걸리는 일과 백오프만큼 더 매달리는 일을 막는다.
     하나만 있으면 어느 쪽이든 종료가 몇 초씩 늘어진다.
+
+    **먼저 상주 작업자에게 맡기고(ytdlp_pool), 거기서 실패하면 같은 차례에 exe로
+    한 번 더 돈다.** 작업자는 앱에 묶인 yt_dlp라 매일 받는 nightly exe보다 늦을 수
+    있다. TVer가 바뀌어 묶인 쪽만 못 읽는 날에 그 실패를 그대로 돌려주면, 빨라지려고
+    넣은 것 때문에 예전에 되던 것이 안 된다.
+
+    **한 차례마다 연결 주머니(connection_budget)에서 한 칸을 빌린다.** 다운로드와
+    같은 상한 안에서 돌게 하려는 것이다. 백오프로 쉬는 동안은 돌려준다.
+    draw_budget=False는 이미 제 몫을 받은 다운로드가 자기 정보를 물을 때 쓴다 —
+    그 몫 안에서 묻는 것이라 따로 빌리면 두 번 세고, 주머니가 찼을 때는 자기
+    몫을 쥔 채 자리를 기다리다 서로 묶인다.
     """
     out = err = ""
     for attempt in range(1, MAX_ATTEMPTS + 1):
         if should_stop and should_stop():
             return False, "", ABORTED
+        budget = connection_budget.shared() if draw_budget else None
+        if budget is not None and not budget.acquire_query(should_stop):
+            return False, "", ABORTED
         try:
-            proc = subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                startupinfo=get_startupinfo(), text=True,
-                encoding="utf-8", errors="ignore"
-            )
-        except OSError as e:
-            return False, "", f"yt-dlp를 실행하지 못했습니다: {e}"
-        if on_spawn:
-            on_spawn(proc)
+            pooled = ytdlp_pool.shared().run(command[1:], timeout=timeout, should_stop=should_stop)
+            if pooled is not None:
+                if pooled.ok:
+                    return True, pooled.out, pooled.err
+                if pooled.aborted:
+                    return False, "", ABORTED
+                if pooled.timed_out:
+                    return False, "", f"{label}이(가) 제한 시간 {timeout}초를 넘겨 중단했습니다."
+            try:
+                proc = subprocess.Popen(
+                    command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    startupinfo=get_startupinfo(), text=True,
+                    encoding="utf-8", errors="ignore"
+                )
+            except OSError as e:
+                return False, "", f"yt-dlp를 실행하지 못했습니다: {e}"
+            if on_spawn:
+                on_spawn(proc)
 
-        try:
-            out, err = proc.communicate(timeout=timeout)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.communicate()
-            return False, "", f"{label}이(가) 제한 시간 {timeout}초를 넘겨 중단했습니다."
-
-        if proc.returncode == 0:
-            return True, out, err
+            try:
+                out, err = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                return False, "", f"{label}이(가) 제한 시간 {timeout}초를 넘겨 중단했습니다."
+
+            if proc.returncode == 0:
+                return True, out, err
+        finally:
+            if budget is not None:
+                budget.release_query()
         if should_stop and should_stop():
             return False, "", ABORTED
         if attempt >= MAX_ATTEMPTS or not is_retriable(err):
@@ -150,3 +180,78 @@ def run(command: List[str], timeout: int, label: str,
                    f" ({attempt + 1}/{MAX_ATTEMPTS}).")
         time.sleep(delay)
     return False, out, err
+
+
+def stream(command: List[str], timeout: int, label: str,
+           on_line: Callable[[str], None],
+           on_spawn: Optional[Callable[[subprocess.Popen], None]] = None,
+           should_stop: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
+    """yt-dlp를 돌리며 표준 출력을 한 줄씩 on_line에 넘긴다. (성공 여부, 오류 문구).
+
+    run()은 끝날 때까지 출력을 모았다가 한 번에 돌려준다. 주소 여러 개를 한
+    번에 물을 때(`-j`)는 먼저 끝난 것부터 쓸 수 있어야 해서 따로 둔다.
+
+    run()과 같은 순서로 돈다 — 연결 주머니에서 한 칸을 빌리고, 상주 작업자에게
+    먼저 맡기고, 거기서 안 되면 exe로 한 번 더. 다만 **작업자가 한 줄이라도
+    내놓았으면 exe로 다시 돌지 않는다.** 몇 개는 읽었다는 것은 묶인 yt_dlp가
+    TVer를 읽을 줄 안다는 뜻이고, 남은 실패는 exe로 돌려도 같다. 통신 오류로
+    다시 걸지도 않는다. 여기서 못 받은 것은 부르는 쪽이 제 길로 다시 묻는다.
+    """
+    if should_stop and should_stop():
+        return False, ABORTED
+    budget = connection_budget.shared()
+    if not budget.acquire_query(should_stop):
+        return False, ABORTED
+    err_lines: List[str] = []
+    delivered = False
+
+    def deliver(stream_name: str, text: str):
+        nonlocal delivered
+        if stream_name == "err":
+            err_lines.append(text)
+        else:
+            delivered = True
+            on_line(text)
+
+    try:
+        pooled = ytdlp_pool.shared().run(command[1:], timeout=timeout,
+                                         should_stop=should_stop, on_line=deliver)
+        if pooled is not None:
+            if pooled.aborted:
+                return False, ABORTED
+            if pooled.timed_out:
+                return False, f"{label}이(가) 제한 시간 {timeout}초를 넘겨 중단했습니다."
+            if pooled.ok or delivered:
+                return pooled.ok, "\n".join(err_lines)
+        err_lines.clear()
+        try:
+            proc = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                startupinfo=get_startupinfo(), text=True,
+                encoding="utf-8", errors="ignore"
+            )
+        except OSError as e:
+            return False, f"yt-dlp를 실행하지 못했습니다: {e}"
+        if on_spawn:
+            on_spawn(proc)
+        stderr_reader = threading.Thread(
+            target=lambda: err_lines.extend(line.rstrip("\n") for line in proc.stderr),
+            daemon=True)
+        stderr_reader.start()
+        expired = threading.Event()
+        watchdog = threading.Timer(timeout, lambda: (expired.set(), proc.kill()))
+        watchdog.start()
+        try:
+            for line in proc.stdout:
+                on_line(line.rstrip("\n"))
+            proc.wait()
+        finally:
+            watchdog.cancel()
+        stderr_reader.join(timeout=1)
+        if should_stop and should_stop():
+            return False, ABORTED
+        if expired.is_set():
+            return False, f"{label}이(가) 제한 시간 {timeout}초를 넘겨 중단했습니다."
+        return proc.returncode == 0, "\n".join(err_lines)
+    finally:
+        budget.release_query()
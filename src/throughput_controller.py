@@ -0,0 +1,207 @@
+"""받는 속도를 보고 동시 다운로드 수를 늘리고 줄인다.
+
+`max_concurrent_downloads`는 고정값이었다. VPN을 거쳐 받으면 알맞은 동시
+다운로드 수가 시간마다 달라진다 — 한가한 새벽에는 다섯 개를 돌려도 하나하나가
+제 속도를 내고, 저녁에는 둘만 돌려도 서로 회선을 뺏으며 TVer가 조각 요청을
+끊기 시작한다. 고정값은 어느 한쪽에서 늘 손해를 본다.
+
+여기서는 설정값을 **천장**으로 두고, 그 아래에서 실제로 돌릴 수(limit)를 정한다.
+
+- 창(WINDOW_MS)마다 진행 중인 다운로드의 속도를 모두 더한다. 속도는
+  DownloadThread가 진행률마다 보내는 speed_bps(초당 바이트)를 쓴다.
+- 자리를 하나 늘린 뒤 합계가 GAIN만큼 늘었으면 한 번 더 늘린다.
+- 늘렸는데 합계가 그대로면(평평해졌으면) 그 자리를 도로 뺀다. 그 자리는 회선을
+  더 쓰게 한 것이 아니라 있는 것을 나눠 가졌을 뿐이다.
+- 재시도할 만한 통신 오류(ytdlp_run.RETRIABLE_MARKERS)가 보이면 하나 뺀다.
+  TVer가 끊기 시작했다는 표시라, 속도 합계가 떨어지기를 기다리면 늦다.
+
+**늘리기는 자리가 다 찼을 때만 한다.** 대기열에 받을 것이 없어 limit보다 적게
+돌고 있으면, 합계가 늘지 않은 것이 회선 탓인지 일이 없어서인지 가릴 수 없다.
+
+**돌고 있는 것을 멈추지는 않는다.** 줄인 limit은 다음에 시작할 때부터 듣는다.
+받던 것을 끊으면 처음부터 다시 받아야 해서 줄이려던 부담이 오히려 커진다.
+
+UI 스레드에서만 쓴다. 속도는 progress 시그널로, 창 계산은 QTimer로 들어온다.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Dict, Optional, Tuple, Union
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+WINDOW_MS = 10_000
+"""속도를 모아 판단하는 간격.
+
+새로 띄운 다운로드가 메타데이터를 묻고 첫 조각을 받아 제 속도를 내기까지 몇
+초가 걸린다. 그보다 짧게 재면 방금 늘린 자리가 아직 0인 채로 셈에 들어가,
+'늘렸는데 평평하다'로 읽혀 곧바로 도로 빠진다."""
+
+GAIN = 0.10
+"""자리를 늘려서 얻었다고 볼 최소 증가분(비율). 이보다 적으면 평평하다고 본다.
+
+VPN 위의 속도는 가만히 있어도 몇 %씩 흔들린다. 문턱이 없으면 그 흔들림만으로
+늘렸다 줄였다를 되풀이한다."""
+
+START_LIMIT = 2
+"""처음 시작할 때의 limit. 천장이 이보다 낮으면 천장."""
+
+HOLD_WINDOWS = 6
+"""자리를 뺀 뒤 다시 늘려 보기까지 쉬는 창 수(1분).
+
+쉬지 않으면 '늘린다 → 평평하다 → 뺀다 → 늘린다'가 20초마다 돈다. 뺄 때마다
+도는 다운로드가 하나씩 덜 시작하므로, 그 흔들림이 고스란히 속도 손해다."""
+
+STALE_SECONDS = WINDOW_MS / 1000 * 1.5
+"""이보다 오래 진행률이 오지 않은 항목의 속도는 셈에서 뺀다.
+
+병합·후처리 중인 항목은 진행률을 내지 않는다. 마지막 속도가 그대로 남으면
+받지도 않는 것이 회선을 쓰는 것처럼 셈에 든다."""
+
+_SPEED_RE = re.compile(r"([0-9.]+)\s*([KMGT]?i?B)/s", re.IGNORECASE)
+_UNITS = {"b": 1, "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3, "tib": 1024 ** 4,
+          "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3, "tb": 1000 ** 4}
+
+
+def parse_speed(text: Union[str, float, None]) -> Optional[float]:
+    """yt-dlp가 찍는 속도 글(`2.50MiB/s`)을 초당 바이트로. 못 읽으면 None.
+
+    받기 시작한 직후에는 `Unknown B/s`가 온다. 0으로 세면 합계가 떨어진 것처럼
+    보여, 아직 아무 일도 없는데 자리를 뺀다. 이미 숫자(progress의 speed_bps)면
+    그대로 쓴다.
+    """
+    if isinstance(text, (int, float)):
+        return float(text) if text > 0 else None
+    m = _SPEED_RE.search(text or "")
+    if not m:
+        return None
+    factor = _UNITS.get(m.group(2).lower())
+    if factor is None:
+        return None
+    try:
+        return float(m.group(1)) * factor
+    except ValueError:
+        return None
+
+
+class ThroughputController(QObject):
+    """동시 다운로드 수를 천장 아래에서 움직인다."""
+
+    limit_changed = pyqtSignal(int, str)
+    """(새 limit, 바꾼 까닭). 로그에 남기고 대기열을 다시 돌리는 데 쓴다."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ceiling = 1
+        self._enabled = True
+        self._limit = START_LIMIT
+        self._configured = False
+        self._speeds: Dict[str, Tuple[float, float]] = {}
+        self._running = 0
+        self._congested = False
+        self._last_total: Optional[float] = None
+        self._probing = False
+        self._hold = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(WINDOW_MS)
+        self._timer.timeout.connect(self._evaluate)
+
+    def configure(self, ceiling: int, enabled: bool = True):
+        """설정의 동시 다운로드 수(천장)와 켜짐 여부를 받는다.
+
+        천장이 내려가면 limit도 따라 내려간다. 꺼 두면 limit은 늘 천장이다 —
+        예전과 똑같이 돈다.
+        """
+        self._ceiling = max(1, int(ceiling))
+        self._enabled = bool(enabled)
+        if not self._enabled:
+            self._timer.stop()
+            return
+        start = self._limit if self._configured else START_LIMIT
+        self._configured = True
+        self._limit = max(1, min(start, self._ceiling))
+        self._last_total = None
+        self._probing = False
+
+    def limit(self) -> int:
+        return self._limit if self._enabled else self._ceiling
+
+    def share_seats(self) -> int:
+        """연결 몫을 나눌 자리 수. limit에, 아직 늘려 볼 수 있으면 한 자리를 더한다.
+
+        몫은 시작할 때 정해져 바꿀 수 없다(connection_budget). limit만큼으로
+        나눠 두면 늘려 본 자리는 앞의 것들이 남긴 한두 칸으로 시작해, 회선에
+        여유가 있어도 합계가 늘지 않아 '평평하다'로 읽힌다. 그 자리의 몫을 미리
+        남겨 두어야 늘려 본 것이 다른 것들과 같은 몫으로 잰다.
+        """
+        limit = self.limit()
+        return limit + 1 if self._enabled and limit < self._ceiling else limit
+
+    def note_running(self, count: int):
+        """지금 돌고 있는 다운로드 수. 창 계산을 켜고 끄는 데도 쓴다."""
+        self._running = count
+        if not self._enabled:
+            return
+        if count and not self._timer.isActive():
+            self._last_total = None
+            self._probing = False
+            self._timer.start()
+        elif not count and self._timer.isActive():
+            self._timer.stop()
+            self._speeds.clear()
+
+    def note_speed(self, url: str, speed_text: Union[str, float]):
+        speed = parse_speed(speed_text)
+        if speed is not None:
+            self._speeds[url] = (speed, time.monotonic())
+
+    def note_network_error(self):
+        """재시도할 만한 통신 오류가 보였다. 다음 창에서 자리를 하나 뺀다."""
+        self._congested = True
+
+    def forget(self, url: str):
+        self._speeds.pop(url, None)
+
+    def _total(self) -> float:
+        now = time.monotonic()
+        return sum(speed for speed, seen in self._speeds.values() if now - seen <= STALE_SECONDS)
+
+    def _set_limit(self, limit: int, reason: str):
+        limit = max(1, min(self._ceiling, limit))
+        if limit == self._limit:
+            return
+        self._limit = limit
+        self.limit_changed.emit(limit, reason)
+
+    def _evaluate(self):
+        """창 하나를 마감하고 limit을 정한다.
+
+        늘려 본 자리를 채울 것이 없었으면(대기열이 비어 limit보다 적게 돌면)
+        판단하지 않는다. 그 창의 합계는 늘린 자리와 상관이 없다.
+        """
+        total = self._total()
+        previous, self._last_total = self._last_total, total
+        if self._congested:
+            self._congested = False
+            self._probing = False
+            self._hold = HOLD_WINDOWS
+            self._set_limit(self._limit - 1, "통신 오류가 보여")
+            return
+        if previous is None:
+            return
+        if self._probing:
+            self._probing = False
+            if self._running < self._limit:
+                return
+            if total < previous * (1 + GAIN):
+                self._hold = HOLD_WINDOWS
+                self._set_limit(self._limit - 1, "늘려도 속도가 그대로라")
+                return
+        elif self._hold:
+            self._hold -= 1
+            return
+        if self._running >= self._limit and self._limit < self._ceiling:
+            self._probing = True
+            self._set_limit(self._limit + 1, "회선에 여유가 있는지 보려고")
@@ -11,7 +11,7 @@
 트레이 영역을 다시 등록하는 셸 호출이라 함께 묶는다.
 
 값을 **계산하는 곳(refresh_status)과 반영하는 곳(_sync)을 나눈 이유**가 있다.
-개수는 queue_changed가, 진행률은 progress_updated가 물어 오는데 둘이 오는
+개수는 queue_changed가, 진행률은 progress_updated·progress_batch가 물어 오는데 둘이 오는
 시점이 달라서, 마지막 값을 들고 있다가 어느 쪽이 와도 같은 자리를 채운다.
 
 Qt가 창에 직접 보내는 changeEvent·closeEvent는 창에 남을 수밖에 없어, 창이
@@ -39,23 +39,31 @@ class TrayController:
 
     def __init__(self, window):
         self.window = window
-        self._queue_counts = (0, 0)
-        self._tray_state = (0, 0, None)
+        self._queue_counts = (0, 0, 0)
+        self._tray_state = (0, 0, 0, None)
         self._tray_shown = None
         self._timer = QTimer(window)
         self._timer.setInterval(self.TRAY_SYNC_INTERVAL_MS)
         self._timer.timeout.connect(self._sync)
 
-    def on_queue_changed(self, queued: int, active: int):
-        """대기·진행 개수가 바뀌면 화면 라벨과 트레이를 함께 맞춘다."""
-        self._queue_counts = (queued, active)
-        self.window.ui.queue_count_label.setText(f"{queued} 대기 / {active} 진행")
+    def on_queue_changed(self, queued: int, active: int, converting: int = 0):
+        """대기·진행·변환 개수가 바뀌면 화면 라벨과 트레이를 함께 맞춘다.
+
+        변환은 따로 센다. 받기를 마친 것이 변환 차례를 기다리는 동안 '진행'에
+        섞여 있으면, 받는 자리가 비었는데도 찬 것처럼 보인다. 변환이 없을 때는
+        예전처럼 두 칸만 보인다.
+        """
+        self._queue_counts = (queued, active, converting)
+        text = f"{queued} 대기 / {active} 진행"
+        if converting:
+            text += f" / {converting} 변환"
+        self.window.ui.queue_count_label.setText(text)
         self.refresh_status()
 
     def refresh_status(self):
         """트레이에 보여 줄 값을 다시 계산해 둔다. 실제 반영은 _sync가 한다.
 
-        개수는 queue_changed가, 진행률은 progress_updated가 물어 온다. 둘이 오는
+        개수는 queue_changed가, 진행률은 progress_updated·progress_batch가 물어 온다. 둘이 오는
         시점이 달라서 마지막 값을 들고 있다가 어느 쪽이 와도 같은 자리를 채운다.
 
         진행률은 실제로 도는 것이 있을 때만 넘긴다. 대기만 걸려 있는 동안 고리를
@@ -65,10 +73,11 @@ class TrayController:
         아이콘으로 돌아가는 일은 묶음당 한 번뿐이라 미룰 이유가 없고, 미루면
         다 끝난 뒤에도 고리가 최대 1초 더 남는다.
         """
-        queued, active = self._queue_counts
-        self._tray_state = (queued, active,
-                            self.window.download_manager.overall_progress() if active else None)
-        if active:
+        queued, active, converting = self._queue_counts
+        busy = active or converting
+        self._tray_state = (queued, active, converting,
+                            self.window.download_manager.overall_progress() if busy else None)
+        if busy:
             if not self._timer.isActive():
                 self._timer.start()
                 self._sync()
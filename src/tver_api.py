@@ -0,0 +1,244 @@
+"""TVer의 목록 API를 yt-dlp 없이 직접 부르는 작은 클라이언트.
+
+시리즈의 회차 목록을 얻으려고 yt-dlp를 띄우면, 프로세스를 띄우고 추출기를 싣고
+세션을 만드는 데만 몇 초가 든다(SeriesParseThread의 1·2차 분석, 목록 훑기).
+실제로 필요한 것은 회차마다 주소·제목·표지 그림 셋뿐이고, TVer 웹 페이지는 그것을
+JSON 세 번으로 받는다. 즐겨찾기 확인은 시리즈마다 이것을 되풀이하므로 확인 시간의
+대부분이 여기서 나온다.
+
+    POST platform-api  /v2/api/platform_users/browser/create        세션(한 번)
+    GET  service-api   /api/v1/callSeriesSeasons/{시리즈}           시즌 목록
+    GET  platform-api  /service/api/v1/callSeasonEpisodes/{시즌}    시즌의 회차
+
+yt-dlp의 TVer 추출기가 부르는 것과 같은 주소·같은 머리글이다. 돌려주는 모양도
+SeriesParseThread._parse_entries와 같다(url·title·thumbnail_url). 제목은 추출기처럼
+`시리즈명 회차명`으로 잇는다. 키워드 거르기와 선택 창이 예전과 같은 글자를 본다.
+
+**연결은 호스트마다 열어 둔 채 다시 쓴다**(keep-alive). 호스트가 둘뿐이라 즐겨찾기
+수백 개를 확인해도 TLS 핸드셰이크는 몇 번이면 끝난다. 다시 쓰던 연결이 서버
+쪽에서 닫혀 있으면 새로 열어 한 번만 다시 건다.
+
+**여기서 실패하면 부르는 쪽은 예전처럼 yt-dlp로 간다.** TVer가 API를 바꾸는 날에도
+nightly yt-dlp는 따라가지만 이 파일은 앱을 새로 내야 따라간다.
+
+`TVER_API_BASE` 환경 변수를 주면 세 호스트를 모두 그 주소로 돌린다. 세 경로가
+겹치지 않아 한 서버로 흉내 낼 수 있다(tools/tver_fixture_server.py).
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from src import connection_budget
+
+PLATFORM_API = "https://platform-api.tver.jp"
+SERVICE_API = "https://service-api.tver.jp"
+EPISODE_URL = "https://tver.jp/episodes/{}"
+THUMBNAIL_URL = "https://statics.tver.jp/images/content/thumbnail/episode/xlarge/{}.jpg"
+
+PLATFORM_HEADERS = {"x-tver-platform-type": "web", "Origin": "https://tver.jp",
+                    "Referer": "https://tver.jp/"}
+
+TIMEOUT = 10
+"""요청 하나의 제한 시간(초). 목록 JSON은 몇 KB라 정상이면 1초도 안 걸린다.
+
+길게 잡으면 막힌 날에 yt-dlp로 넘어가는 것만 늦어진다."""
+
+MAX_IDLE_PER_HOST = 4
+"""호스트마다 열어 둘 연결 수. SeriesParser.MAX_PARALLEL과 맞춘다."""
+
+SERIES_ID_RE = re.compile(r"tver\.jp/(?:[a-z]+/)?series/([0-9a-z]+)", re.IGNORECASE)
+
+
+class TVerApiError(Exception):
+    """목록을 받지 못했다. 부르는 쪽은 yt-dlp로 넘어간다."""
+
+
+def series_id(series_url: str) -> Optional[str]:
+    match = SERIES_ID_RE.search(series_url or "")
+    return match.group(1) if match else None
+
+
+def _override_base() -> str:
+    return os.environ.get("TVER_API_BASE", "").rstrip("/")
+
+
+class TVerListingClient:
+    """시리즈 주소로 회차 목록을 받는다. 여러 작업 스레드가 함께 쓴다."""
+
+    def __init__(self, timeout: float = TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._session: Optional[Dict[str, str]] = None
+
+    # --- 연결 ---
+
+    def _checkout(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                return idle.pop()
+        if scheme == "http":
+            return http.client.HTTPConnection(host, timeout=self.timeout)
+        return http.client.HTTPSConnection(host, timeout=self.timeout)
+
+    def _checkin(self, scheme: str, host: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """열어 둔 연결을 모두 닫는다."""
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+
+    def _request(self, method: str, url: str, body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Any:
+        """JSON을 받아 돌려준다. 다시 쓰던 연결이 끊겨 있으면 새 연결로 한 번 더."""
+        base = _override_base()
+        if base:
+            parts = urlsplit(url)
+            url = base + parts.path + (f"?{parts.query}" if parts.query else "")
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        send_headers = {"Accept": "application/json", "Connection": "keep-alive", **(headers or {})}
+        if body is not None:
+            send_headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        for attempt in range(2):
+            conn = self._checkout(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, target, body=body, headers=send_headers)
+                response = conn.getresponse()
+                payload = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError, http.client.CannotSendRequest) as e:
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise TVerApiError(f"연결이 끊겼습니다: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise TVerApiError(str(e) or type(e).__name__) from e
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(parts.scheme, parts.netloc, conn)
+            if response.status != 200:
+                raise TVerApiError(f"HTTP {response.status}: {parts.path}")
+            try:
+                return json.loads(payload.decode("utf-8"))
+            except (UnicodeDecodeError, ValueError) as e:
+                raise TVerApiError(f"JSON이 아닙니다: {parts.path}") from e
+        raise TVerApiError("요청하지 못했습니다.")
+
+    # --- TVer ---
+
+    def _platform_query(self, renew: bool = False) -> Dict[str, str]:
+        """세션(platform_uid·platform_token). 한 번 만들어 앱이 도는 동안 쓴다."""
+        with self._lock:
+            if self._session and not renew:
+                return dict(self._session)
+        data = self._request("POST", f"{PLATFORM_API}/v2/api/platform_users/browser/create",
+                             body=b"device_type=pc", headers=PLATFORM_HEADERS)
+        result = data.get("result") if isinstance(data, dict) else None
+        uid = result.get("platform_uid") if isinstance(result, dict) else None
+        token = result.get("platform_token") if isinstance(result, dict) else None
+        if not isinstance(uid, str) or not isinstance(token, str):
+            raise TVerApiError("세션을 만들지 못했습니다.")
+        session = {"platform_uid": uid, "platform_token": token}
+        with self._lock:
+            self._session = session
+        return dict(session)
+
+    @staticmethod
+    def _contents(data: Any, kind: str) -> List[Dict[str, Any]]:
+        result = data.get("result") if isinstance(data, dict) else None
+        contents = result.get("contents") if isinstance(result, dict) else None
+        if not isinstance(contents, list):
+            raise TVerApiError("목록 모양이 예상과 다릅니다.")
+        return [item["content"] for item in contents
+                if isinstance(item, dict) and item.get("type") == kind
+                and isinstance(item.get("content"), dict)]
+
+    def _season_episodes(self, season_id: str) -> List[Dict[str, Any]]:
+        for renew in (False, True):
+            query = urlencode(self._platform_query(renew=renew))
+            try:
+                data = self._request(
+                    "GET", f"{PLATFORM_API}/service/api/v1/callSeasonEpisodes/{season_id}?{query}",
+                    headers=PLATFORM_HEADERS)
+            except TVerApiError as e:
+                # 세션이 만료됐으면 401·403이 온다. 새로 만들어 한 번만 더.
+                if renew or not str(e).startswith(("HTTP 401", "HTTP 403")):
+                    raise
+                continue
+            return self._contents(data, "episode")
+        return []
+
+    def list_series(self, series_url: str,
+                    should_stop: Optional[Callable[[], bool]] = None,
+                    on_episodes: Optional[Callable[[str, List[Dict[str, str]]], None]] = None,
+                    ) -> Tuple[str, List[Dict[str, str]]]:
+        """(시리즈 제목, 회차 목록). 받지 못하면 TVerApiError.
+
+        on_episodes를 주면 시즌 하나를 받을 때마다 (시리즈 제목, 그 시즌의 새 회차)로
+        부른다. 도중에 실패해도 이미 알린 회차는 되돌리지 않는다.
+
+        회차는 시즌 차례, 시즌 안에서는 API가 준 차례 그대로다. 회차가 하나도 없는
+        것도 실패로 친다 — 방송 중인 시리즈가 빈 목록일 리 없고, API가 바뀌어
+        모양만 맞는 빈 답을 주는 날에 '새 회차 없음'으로 끝나면 안 된다.
+        """
+        sid = series_id(series_url)
+        if not sid:
+            raise TVerApiError(f"시리즈 주소가 아닙니다: {series_url}")
+        with connection_budget.shared().query(should_stop) as acquired:
+            if not acquired:
+                raise TVerApiError("중단했습니다.")
+            seasons = self._contents(
+                self._request("GET", f"{SERVICE_API}/api/v1/callSeriesSeasons/{sid}",
+                              headers=PLATFORM_HEADERS), "season")
+            series_title = ""
+            episodes: List[Dict[str, str]] = []
+            seen = set()
+            for season in seasons:
+                season_id = season.get("id")
+                if not isinstance(season_id, str):
+                    continue
+                start = len(episodes)
+                for content in self._season_episodes(season_id):
+                    episode_id = content.get("id")
+                    if not isinstance(episode_id, str) or episode_id in seen:
+                        continue
+                    seen.add(episode_id)
+                    series = (content.get("seriesTitle") or "").strip()
+                    series_title = series_title or series
+                    title = " ".join(part for part in (series, (content.get("title") or "").strip()) if part)
+                    episodes.append({"url": EPISODE_URL.format(episode_id),
+                                     "title": title or "제목 없음",
+                                     "thumbnail_url": THUMBNAIL_URL.format(episode_id)})
+                if on_episodes and len(episodes) > start:
+                    on_episodes(series_title, episodes[start:])
+        if not episodes:
+            raise TVerApiError("회차가 없습니다.")
+        return series_title, episodes
+
+
+_shared = TVerListingClient()
+
+
+def shared() -> TVerListingClient:
+    """앱 전체가 함께 쓰는 목록 클라이언트. 연결을 함께 다시 쓰려고 하나만 둔다."""
+    return _shared
@@ -13,6 +13,7 @@ from src.appicon import get_app_icon, app_icon_with_progress
 from src.titlelogo import LOGO_HEIGHT, build_logo
 from src.utils import localized_app_name
 from src.icons import get_icon
+from src.history_view import HistoryListView
 from src.qss import palette
 from src.widgets import (GridListWidget, FavoriteItemWidget, RoundedMenu,
                          EmptyStateOverlay, NoFocusDelegate)
@@ -161,6 +162,7 @@ class MainWindowUI:
             self._paint_icon(btn)
         for overlay in self._empty_states:
             overlay.apply_theme(theme)
+        self.history_list.apply_theme(theme)
         self.refresh_tab_icons()
 
     def update_theme_button(self, theme):
@@ -337,6 +339,8 @@ class MainWindowUI:
         self.download_list = QListWidget(objectName="DownloadList")
         self.download_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.download_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.download_list.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.download_list.setDefaultDropAction(Qt.DropAction.MoveAction)
         self.download_list.setSpacing(6)
         self._hide_focus_rect(self.download_list)
         self.download_empty = self._add_empty_state(
@@ -409,9 +413,8 @@ class MainWindowUI:
         top_controls.addWidget(self.history_sort_combo)
         top_controls.addWidget(self.history_search_input)
         layout.addLayout(top_controls)
-        self.history_list = QListWidget(objectName="HistoryList")
+        self.history_list = HistoryListView(self._theme, objectName="HistoryList")
         self.history_list.setSpacing(6)
-        self._hide_focus_rect(self.history_list)
         self.history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.history_empty = self._add_empty_state(
             self.history_list, "tab_history", "받은 영상이 아직 없습니다",
@@ -475,7 +478,7 @@ class MainWindowUI:
         """
         tray_icon = self.main_window.tray_icon; tray_icon.setIcon(get_app_icon())
         self._tray_name = f"{localized_app_name()} {app_version}"
-        self.update_tray_status(0, 0, None)
+        self.update_tray_status(0, 0, 0, None)
         tray_menu = RoundedMenu()
 
         restore_action = QAction(f"{localized_app_name()} 열기", self.main_window,
@@ -507,7 +510,7 @@ class MainWindowUI:
         self.sync_autostart_check()
         tray_icon.setContextMenu(tray_menu); tray_icon.show()
 
-    def update_tray_status(self, queued: int, active: int, percent=None):
+    def update_tray_status(self, queued: int, active: int, converting: int = 0, percent=None):
         """트레이 툴팁을 지금 상태로 바꾼다.
 
         커서를 올려야 보이는 자리라, 평소에는 앱 이름만 두고 받는 중일 때만 줄을
@@ -524,8 +527,10 @@ class MainWindowUI:
         고리가 다른 숫자를 말하면 어느 쪽을 믿어야 할지 알 수 없다.
         """
         lines = [self._tray_name]
-        if queued or active:
+        if queued or active or converting:
             head = f"{queued} 대기 / {active} 진행"
+            if converting:
+                head += f" / {converting} 변환"
             lines.append(f"{head} · {percent}%" if percent is not None else head)
         self.main_window.tray_icon.setToolTip("\n".join(lines))
         self.main_window.tray_icon.setIcon(app_icon_with_progress(percent))
@@ -31,39 +31,30 @@ def localized_app_name(language: QLocale.Language | None = None) -> str:
 
 
 CONFIG_FILE = "downloader_config.json"
+SOCKET_NAME = "TVerDownloader_IPC_Socket"
+"""한 번에 하나만 뜨도록 잡아 두는 로컬 소켓 이름. 창과 headless가 함께 쓴다.
+
+둘이 같은 queue.json·urlhistory.db를 읽고 쓰므로, 함께 뜨면 나중에 저장한
+쪽이 앞의 것을 덮어쓴다."""
 DEFAULT_PARALLEL = 5
 PARALLEL_MIN = 1
 PARALLEL_MAX = 20
 FILENAME_TITLE_MAX_LENGTH = 80
 
 MAX_TOTAL_CONNECTIONS = 20
-"""동시 다운로드 수 × 조각 수의 상한. TVer에 한꺼번에 걸리는 연결 수다.
-
-두 값은 각자 범위 안에 있어도 곱하면 얼마든지 커진다(20 × 16 = 320). 그러면
-지역 제한 차단에 걸리는데, **그 차단은 한번 걸리면 IP를 바꾸기 전까지 계속
-막히는 성질이라 값을 되돌려도 곧바로 낫지 않는다**(yt-dlp #13888). 되돌리기
-어려운 실패라서, 고르는 자리에서 아예 막는다(SettingsDialog._save_settings).
+"""TVer에 한꺼번에 거는 연결 수의 상한. 앱 전체가 이것을 나눠 쓴다(connection_budget).
 
-설정 파일을 손으로 고친 경우는 막지 않는다. 어느 쪽을 줄여야 할지 정할 근거가
-없어서다 — 사용자가 고른 값을 말없이 바꾸는 것보다 그대로 쓰는 편이 낫다.
-"""
+넘기면 지역 제한 차단에 걸리는데, **그 차단은 한번 걸리면 IP를 바꾸기 전까지 계속
+막히는 성질이라 값을 되돌려도 곧바로 낫지 않는다**(yt-dlp #13888).
 
-DEFAULT_FRAGMENTS = 4
-FRAGMENTS_MIN = 1
-FRAGMENTS_MAX = 16
-"""영상 하나에서 한꺼번에 받을 조각 수(yt-dlp의 -N).
+예전에는 영상마다 조각 수(-N)를 설정에서 골라 두고 '동시 다운로드 수 × 조각 수'가
+이 값을 넘지 않게 설정 창에서 막았다. 그 방식은 하나만 받을 때도 4개 연결로
+묶여 회선이 남았고, 정보 조회는 셈에 들지 않았다. 이제는 다운로드가 시작할 때
+남은 몫을 받아 -N으로 쓰므로 고를 값이 없다.
 
 TVer은 HLS라 영상이 수백 개 조각으로 나뉘어 있고, **yt-dlp 기본값은 1이라 그것을
 한 개씩 차례로 받는다.** 조각 하나하나는 작아서 왕복 시간이 그대로 대기 시간이
-되므로, 회선을 다 쓰지 못한 채 느려지는 원인이 여기다.
-
-**기본값을 4로 잡은 것은 동시 다운로드 수와 곱해지기 때문이다.** 이 값이 N이고
-동시 다운로드가 M이면 TVer에 걸리는 연결은 N×M이다. 기본값(M=5)에서 4면 20인데,
-여기서 더 늘리면 지역 제한 차단에 걸릴 위험이 커진다. 그 차단은 한번 걸리면 IP를
-바꾸기 전까지 계속 막히는 성질이라(yt-dlp #13888) 되돌리기가 어렵다.
-
-상한을 16으로 둔 것은 그 위로는 조각을 더 벌려도 회선이 아니라 서버 쪽에서
-막히기 시작해서다. 1로 두면 이 기능을 끈 것과 같다.
+되므로, 혼자 받는 영상에 몫을 크게 주는 것이 곧 속도다.
 """
 
 HARDWARE_ENCODERS = ("cpu", "nvidia")
@@ -236,7 +227,6 @@ def load_config() -> Dict[str, Any]:
         "theme": "light",
         "download_folder": "",
         "max_concurrent_downloads": DEFAULT_PARALLEL,
-        "concurrent_fragments": DEFAULT_FRAGMENTS,
         "filename_parts": {
             "series": True, "upload_date": True, "episode_number": True,
             "episode": True, "id": True,
@@ -245,6 +235,7 @@ def load_config() -> Dict[str, Any]:
         "quality": "bv*+ba/b",
         "preferred_codec": "original",
         "auto_check_favorites_on_start": True,
+        "favorites_poll_hours": 0,
         "auto_update_check": True,
         "always_on_top": False,
         "log_visible": True,
@@ -259,6 +250,10 @@ def load_config() -> Dict[str, Any]:
         "subtitle_format": "vtt",
         "ignore_ssl_errors": False,
         "close_action": "exit",
+        "ytdlp_worker_pool": True,
+        "adaptive_concurrency": True,
+        "resume_downloads": True,
+        "control_api_port": 0,
         "shortcuts": default_shortcuts(),
     }
     if os.path.exists(CONFIG_FILE):
@@ -332,19 +327,6 @@ def canonicalize_config_parallel(config: Dict[str, Any]) -> int:
     return DEFAULT_PARALLEL
 
 
-def canonicalize_config_fragments(config: Dict[str, Any]) -> int:
-    """설정 파일에서 온 조각 수를 쓸 수 있는 값으로 다듬는다.
-
-    canonicalize_config_parallel과 달리 옛 키 이름을 찾지 않는다. 3.4.0에서
-    처음 생긴 설정이라 다른 이름으로 저장된 적이 없다.
-    """
-    try:
-        value = int(float(config.get("concurrent_fragments", DEFAULT_FRAGMENTS)))
-    except (ValueError, TypeError):
-        return DEFAULT_FRAGMENTS
-    return max(FRAGMENTS_MIN, min(FRAGMENTS_MAX, value))
-
-
 def _choice_value(raw: Any) -> Optional[str]:
     """설정 파일에서 온 선택지 값을 견줄 수 있는 문자열로 만든다.
 
@@ -391,7 +373,7 @@ def retired_option_notes(config: Dict[str, Any]) -> List[str]:
     """이제 없는 값을 쓰고 있었다면 그 사실을 알릴 문장들을 만든다.
 
     **load_config에서 값을 갈아 끼우지 않는 이유가 이것이다.** 거기서 고쳐 두면
-    원래 무엇이었는지가 사라져 알릴 내용이 남지 않는다. 조각 수(-N)와 같은
+    원래 무엇이었는지가 사라져 알릴 내용이 남지 않는다. 동시 다운로드 수와 같은
     방식으로 읽는 자리에서 다듬고, 알리는 일은 창이 켜질 때 한 번만 한다.
 
     설정 파일에 되쓰지도 않는다. 사용자가 설정을 저장하는 순간 지금 값으로
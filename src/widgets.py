@@ -304,7 +304,7 @@ class EmptyStateOverlay(QWidget):
     """설명 줄의 최대 폭. 창을 넓히면 한 줄이 끝없이 길어져 읽는 눈이 되돌아온다.
     목록이 이보다 좁으면(최소 폭 창의 다운로드 칸) 그 폭에 맞춰 줄인다."""
 
-    def __init__(self, list_widget: QListWidget, icon_name: str,
+    def __init__(self, list_widget: QListView, icon_name: str,
                  title: str, description: str,
                  filtered_title: str = "", filtered_description: str = "",
                  theme: str = "light"):
@@ -390,7 +390,7 @@ class EmptyStateOverlay(QWidget):
     def refresh(self, *_):
         if not self._usable():
             return
-        visible = self._list.count() == 0
+        visible = self._list.model().rowCount() == 0
         if visible:
             self._fit()
             self.raise_()
@@ -625,7 +625,8 @@ def clear_item_widgets(view: QListWidget):
     대기열을 세면 62개(그중 22개가 이미 버린 카드의 것)에서 22개(버린 것 0)로
     줄었다.
 
-    기록 검색은 글자를 칠 때마다 다시 그려서 이 자리를 가장 자주 지난다.
+    즐겨찾기 검색은 글자를 칠 때마다 다시 그려서 이 자리를 가장 자주 지난다.
+    (기록 탭은 카드 위젯을 쓰지 않는다 — history_view.)
     """
     for row in range(view.count()):
         cleanup = getattr(view.itemWidget(view.item(row)), "cleanup", None)
@@ -1107,92 +1108,3 @@ class FavoriteItemWidget(QWidget):
                     pixmap, LIST_THUMB_W, LIST_THUMB_H, self.devicePixelRatioF()))
         except RuntimeError:
             pass
-
-
-class HistoryItemWidget(QWidget):
-    def __init__(self, url: str, meta: Dict[str, str], theme: str = "light", parent=None):
-        super().__init__(parent)
-        self.setObjectName("HistoryItem"); self.url = url; self.meta = meta
-        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-        THUMBNAIL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        self._colors = palette(theme)
-        root = QHBoxLayout(self)
-        root.setContentsMargins(0, 0, 12, 0)
-        root.setSpacing(0)
-        self.strip = BroadcastStrip(self)
-        root.addWidget(self.strip)
-        body = QHBoxLayout(); body.setContentsMargins(12, 10, 0, 10); body.setSpacing(12)
-        self.thumb_label = QLabel(objectName="Thumb", alignment=Qt.AlignmentFlag.AlignCenter); self.thumb_label.setFixedSize(LIST_THUMB_W, LIST_THUMB_H); body.addWidget(self.thumb_label)
-        info_layout = QVBoxLayout()
-        info_layout.setContentsMargins(0, 0, 0, 0); info_layout.setSpacing(4)
-        self.title_label = QLabel(self.meta.get("title", "(제목 없음)"), objectName="Title"); self.title_label.setWordWrap(True)
-        self.date_label = QLabel(self.meta.get("date", "")); self.date_label.setObjectName("PaneSubtitle")
-        self.url_label = QLabel(self.url); self.url_label.setObjectName("PaneSubtitle")
-        info_layout.addWidget(self.title_label); info_layout.addWidget(self.date_label)
-        info_layout.addWidget(self.url_label); info_layout.addStretch(1); body.addLayout(info_layout, 1)
-        root.addLayout(body, 1)
-        self.apply_theme(theme)
-        self._load_or_download_thumbnail()
-
-    def apply_theme(self, theme: str):
-        self._colors = palette(theme)
-        self.strip.set_state(QColor(self._colors["ctx_history"]), False)
-
-    def set_selected(self, selected: bool):
-        set_selected_style((self, self.title_label, self.date_label, self.url_label), selected)
-
-    def _load_or_download_thumbnail(self):
-        episode_thumb_url = self.meta.get("thumbnail_url")
-        if not episode_thumb_url: return
-        try:
-            episode_id = self.url.strip('/').split('/')[-1]
-            self._cache_path = THUMBNAIL_CACHE_DIR / f"{episode_id}.jpg"
-            cached = cached_thumbnail(self._cache_path)
-            if cached is not None:
-                self._set_thumbnail_pixmap(cached)
-            else:
-                self.downloader = start_thumbnail_download(episode_thumb_url, self._on_thumb_finished)
-        except Exception: pass
-
-    def cleanup(self):
-        """목록에서 빠지기 전에 썸네일 요청과 콜백을 끊는다.
-
-        받아 온 그림을 넣을 곳이 없어졌는데도 연결이 남아 있으면, 지워진 라벨을
-        건드렸다가 슬롯 안에서 예외가 난다. 그 예외는 PyQt6가 잡지 못한다.
-        """
-        discard_thumbnail_requests(self)
-        downloader = getattr(self, "downloader", None)
-        self.downloader = None
-        if downloader is None or sip.isdeleted(downloader):
-            return
-        try:
-            downloader.loaded.disconnect(self._on_thumb_finished)
-        except (TypeError, RuntimeError):
-            pass
-
-    def _on_thumb_finished(self, result: tuple):
-        """받아 온 것을 그림으로 읽어 보고, 읽히는 것만 캐시에 남긴다.
-
-        순서가 뒤였을 때가 문제였다. 사라진 영상의 표지 그림 자리에 서버가
-        오류 쪽지를 200으로 돌려주는 일이 있는데(VPN 중간 페이지도 그렇다),
-        그걸 그대로 적어 두면 다음부터는 파일이 있다는 이유로 다시 받지 않는다.
-        빈 카드가 굳고, 지울 수도 없는 쓰레기가 캐시 용량에 잡힌다.
-        """
-        try: url, data = result
-        except (TypeError, ValueError): return
-        if not data: return
-        pixmap = QPixmap()
-        if not pixmap.loadFromData(data):
-            return
-        try: self._cache_path.write_bytes(data)
-        except (OSError, AttributeError): pass
-        self._set_thumbnail_pixmap(pixmap)
-
-    def _set_thumbnail_pixmap(self, pixmap: QPixmap):
-        """썸네일을 안전하게 넣는다. 라벨이 이미 삭제됐을 수 있다."""
-        try:
-            if self.thumb_label and pixmap and not pixmap.isNull():
-                self.thumb_label.setPixmap(rounded_thumbnail(
-                    pixmap, LIST_THUMB_W, LIST_THUMB_H, self.devicePixelRatioF()))
-        except RuntimeError:
-            pass
@@ -0,0 +1,203 @@
+"""yt-dlp를 파이썬 모듈로 띄워 두고 일감을 받아 돌리는 상주 작업자.
+
+**yt-dlp.exe를 한 번 띄우는 데 1~2초가 든다.** PyInstaller로 묶인 실행 파일이라
+압축을 풀고 파이썬을 세우고 추출기를 읽어 들이는 일이 매번 처음부터 일어나고,
+통신은 그다음에야 시작된다. 대기열 200개와 즐겨찾기 20개를 확인하면 그것만
+수백 번이다. 여기서는 그 준비를 한 번만 하고, 같은 프로세스가 일감을 계속 받는다.
+
+**받는 일감은 yt-dlp 명령줄 그대로다.** 부르는 쪽이 yt-dlp.exe에 넘기던 인자를
+실행 파일 이름만 빼고 보내면, 여기서 yt_dlp.main()에 그대로 넘긴다. 옵션을 파이썬
+API 값으로 옮겨 적지 않는 것이 요점이다 — 옮겨 적으면 exe로 돌 때와 작업자로 돌
+때 결과가 갈리는 자리가 생기고, 어느 쪽으로 들어왔느냐에 따라 파일 이름이나
+진행률 줄이 달라진다.
+
+주고받는 것은 표준 입출력 위의 JSON 한 줄씩이다.
+
+- 들어오는 줄: ``{"id": 7, "args": ["-J", "--skip-download", "<url>"]}``
+- 나가는 줄: 처음 한 번 ``{"event": "hello", "ok": true, "version": "..."}``,
+  일감마다 yt-dlp가 찍는 줄을 ``{"id": 7, "event": "line", "stream": "out",
+  "text": "..."}``로 하나씩, 끝나면 ``{"id": 7, "event": "exit", "code": 0}``.
+
+**이 모듈은 PyQt6를 들이지 않는다.** 작업자를 세우는 비용을 줄이려고 만든
+것이라, 쓰지도 않을 Qt를 여기서 읽어 들이면 아끼려던 시간을 도로 쓴다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List
+
+WORKER_FLAG = "--ytdlp-worker"
+"""앱 실행 파일을 작업자로 띄울 때 붙이는 인자.
+
+묶인 실행 파일 안에는 `python -m`으로 부를 인터프리터가 따로 없다. 그래서 앱
+자신을 이 인자와 함께 한 번 더 띄우고, 시작 절차 맨 앞에서 이것을 보고 창을
+세우는 대신 여기로 들어온다(TVerDownloader.py)."""
+
+
+def worker_command() -> List[str]:
+    """작업자 하나를 띄우는 명령줄."""
+    if getattr(sys, "frozen", False):
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, "-m", "src.ytdlp_worker"]
+
+
+def worker_cwd() -> str:
+    """작업자를 띄울 폴더. 소스로 돌릴 때 `src` 꾸러미를 찾을 수 있는 자리다."""
+    if getattr(sys, "frozen", False):
+        return os.getcwd()
+    return str(Path(__file__).resolve().parent.parent)
+
+
+class _Channel:
+    """부모에게 가는 줄을 내보낸다. 여러 스레드가 써도 줄이 섞이지 않게 묶는다.
+
+    yt-dlp는 조각을 여러 개 받을 때(-N) 진행률을 다른 스레드에서 찍는다. 자물쇠
+    없이 쓰면 두 줄이 한 줄로 엉켜, 받는 쪽이 JSON을 읽지 못한다.
+    """
+
+    def __init__(self, out: BinaryIO):
+        self._out = out
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict) -> None:
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._out.write(data)
+            self._out.flush()
+
+
+class _LineStream:
+    """yt-dlp가 sys.stdout/sys.stderr라고 여기고 쓰는 자리.
+
+    받은 글을 줄로 끊어 한 줄씩 부모에게 보낸다. `\\r`도 줄바꿈으로 본다.
+    yt-dlp.exe를 text 모드로 띄웠을 때 파이썬이 그렇게 읽었으므로, 진행률을 읽는
+    쪽은 예전과 같은 줄을 받는다.
+
+    터미널이 아니라고 답한다(isatty). 그래야 yt-dlp가 색 코드와 커서 이동을
+    섞지 않는다.
+    """
+
+    encoding = "utf-8"
+    errors = "ignore"
+
+    def __init__(self, channel: _Channel, job_id, stream: str):
+        self._channel = channel
+        self._job_id = job_id
+        self._stream = stream
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def write(self, text) -> int:
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "ignore")
+        with self._lock:
+            self._buffer += text
+            parts = self._buffer.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            self._buffer = parts.pop()
+        for part in parts:
+            if part:
+                self._send(part)
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            rest, self._buffer = self._buffer, ""
+        if rest:
+            self._send(rest)
+
+    def _send(self, line: str) -> None:
+        self._channel.send({"id": self._job_id, "event": "line",
+                            "stream": self._stream, "text": line})
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+
+def _run_job(main: Callable, channel: _Channel, job: Dict) -> None:
+    """일감 하나를 돌리고 종료 코드까지 알린다.
+
+    yt-dlp.main()은 끝날 때 늘 SystemExit을 던진다. 그것을 종료 코드로 받아
+    exe가 돌려주던 값과 같은 것을 넘긴다. 문자열로 끝나는 경우(`ERROR: ...`)는
+    exe가 그 문구를 stderr에 찍고 1로 끝나던 것과 맞춘다.
+
+    그 밖의 예외는 이 작업자를 죽이지 않는다. 일감 하나가 터졌다고 다음 일감까지
+    준비 비용을 다시 치르게 하면 상주시킨 의미가 없다.
+    """
+    job_id = job.get("id")
+    args = job.get("args")
+    out = _LineStream(channel, job_id, "out")
+    err = _LineStream(channel, job_id, "err")
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err
+    code = 1
+    try:
+        if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+            err.write("ERROR: 일감 형식이 잘못되었습니다.\n")
+        else:
+            main(args)
+            code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            err.write(f"{e.code}\n")
+            code = 1
+    except BaseException:
+        err.write(traceback.format_exc())
+        code = 1
+    finally:
+        sys.stdout, sys.stderr = saved
+        out.flush()
+        err.flush()
+    channel.send({"id": job_id, "event": "exit", "code": code})
+
+
+def serve(source: BinaryIO, sink: BinaryIO) -> int:
+    """일감을 받아 돌린다. 입력이 닫히면(부모가 사라지면) 끝난다.
+
+    yt_dlp를 읽지 못하면 hello에 ok=false를 실어 보내고 바로 끝낸다. 부르는 쪽은
+    그것을 보고 작업자를 더 띄우지 않고 yt-dlp.exe로 돌아간다.
+    """
+    channel = _Channel(sink)
+    try:
+        import yt_dlp
+        from yt_dlp.version import __version__ as version
+    except Exception as e:
+        channel.send({"event": "hello", "ok": False, "error": f"{type(e).__name__}: {e}"})
+        return 1
+    channel.send({"event": "hello", "ok": True, "version": version})
+
+    for raw in source:
+        try:
+            job = json.loads(raw.decode("utf-8", "ignore"))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(job, dict):
+            _run_job(yt_dlp.main, channel, job)
+    return 0
+
+
+def main() -> int:
+    """표준 입출력을 바이트로 다시 열어 serve()에 넘긴다.
+
+    창 없는 실행 파일(console=False)에서는 sys.stdin/sys.stdout이 None으로 올 수
+    있다. 부모가 넘겨준 파이프는 파일 번호 0/1에 그대로 있으므로 그것을 직접 연다.
+    """
+    source = open(0, "rb", closefd=False)
+    sink = open(1, "wb", closefd=False)
+    return serve(source, sink)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
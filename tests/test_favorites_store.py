@@ -0,0 +1,74 @@
+"""FavoritesStore를 스냅숏 + 떼어 둔 일지(.folding) + 일지로 다시 읽어 지금 상태와 견준다.
+
+queue_store 쪽과 같은 자리를 본다. 접기가 스냅숏을 쓴 뒤 .folding을 지우지
+못하면 다음 실행은 그 일지를 자기보다 새 스냅숏 위에 다시 적용한다. 지운 시리즈가
+되살아나거나 바뀐 제목이 예전 것으로 돌아가면 안 된다.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src.favorites_store import FavoritesStore
+
+
+class FavoritesJournalRoundTripTest(unittest.TestCase):
+    SEEDS = 200
+    STEPS = 40
+
+    def _compact_leaving_folding(self, store, leave):
+        """접되, leave면 .folding을 지우지 못한 것처럼 남긴다."""
+        real_remove = os.remove
+
+        def remove(path):
+            if leave and path.endswith(".folding"):
+                raise OSError("locked")
+            return real_remove(path)
+        with mock.patch("src.store_journal.os.remove", side_effect=remove):
+            store._journal.compact_now(store._snapshot_writer())
+
+    def _reload(self, path, store):
+        store._journal._close_file()
+        fresh = FavoritesStore(path, keep_backups=0)
+        fresh.load()
+        return fresh
+
+    def test_replay_on_newer_snapshot_keeps_state(self):
+        for seed in range(self.SEEDS):
+            rnd = random.Random(seed)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "favorites.json")
+                store = FavoritesStore(path, keep_backups=0)
+                store.load()
+                titles = {}
+                for step in range(self.STEPS):
+                    roll = rnd.random()
+                    url = f"s{rnd.randint(0, 8)}"
+                    if roll < 0.4:
+                        store.add(url)
+                        titles.setdefault(url, "")
+                    elif roll < 0.6:
+                        store.remove(url)
+                        titles.pop(url, None)
+                    else:
+                        title = f"t{rnd.randint(0, 3)}"
+                        store.touch_last_check(url, title)
+                        titles[url] = title
+                    if rnd.random() < 0.2:
+                        self._compact_leaving_folding(store, leave=rnd.random() < 0.6)
+                    if rnd.random() < 0.15:
+                        expected = dict(store.sorted_entries())
+                        store = self._reload(path, store)
+                        self.assertEqual(dict(store.sorted_entries()), expected, f"seed {seed}, step {step}")
+                self.assertEqual({url: meta["title"] for url, meta in store.sorted_entries()}, titles,
+                                 f"seed {seed}")
+                expected = dict(store.sorted_entries())
+                store = self._reload(path, store)
+                self.assertEqual(dict(store.sorted_entries()), expected, f"seed {seed}")
+                store._journal._close_file()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""QueueStore를 스냅숏 + 떼어 둔 일지(.folding) + 일지로 다시 읽어 모델과 견준다.
+
+접기가 스냅숏을 쓴 뒤 .folding을 지우지 못하면(그 사이에 꺼졌거나, 다른 프로그램이
+파일을 잡고 있었거나) 다음 실행은 그 일지를 자기보다 새 스냅숏 위에 다시 적용한다.
+그래도 대기열의 내용과 차례가 그대로여야 한다.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src.queue_store import QueueStore
+
+
+def _item(url, percent=0):
+    return {"url": url, "title": url, "thumbnail": "", "percent": percent, "fragment": ""}
+
+
+class QueueJournalRoundTripTest(unittest.TestCase):
+    SEEDS = 400
+    STEPS = 40
+
+    def _compact_leaving_folding(self, store, leave):
+        """접되, leave면 .folding을 지우지 못한 것처럼 남긴다."""
+        real_remove = os.remove
+
+        def remove(path):
+            if leave and path.endswith(".folding"):
+                raise OSError("locked")
+            return real_remove(path)
+        with mock.patch("src.store_journal.os.remove", side_effect=remove):
+            store._journal.compact_now(store._snapshot_writer())
+
+    def _reload(self, path, store):
+        store._journal._close_file()
+        fresh = QueueStore(path)
+        fresh.load()
+        return fresh
+
+    def test_replay_on_newer_snapshot_keeps_order(self):
+        for seed in range(self.SEEDS):
+            rnd = random.Random(seed)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "queue.json")
+                store = QueueStore(path)
+                store.load()
+                model = []
+                for step in range(self.STEPS):
+                    roll = rnd.random()
+                    urls = [item["url"] for item in model]
+                    if roll < 0.35 or not model:
+                        url = f"u{rnd.randint(0, 8)}"
+                        if url not in urls:
+                            model.insert(rnd.randint(0, len(model)), _item(url))
+                    elif roll < 0.55:
+                        model.pop(rnd.randrange(len(model)))
+                    elif roll < 0.75:
+                        i = rnd.randrange(len(model))
+                        model[i] = _item(model[i]["url"], rnd.randint(0, 100))
+                    else:
+                        rnd.shuffle(model)
+                    store.replace(model)
+                    self.assertTrue(store.save())
+                    if rnd.random() < 0.2:
+                        self._compact_leaving_folding(store, leave=rnd.random() < 0.6)
+                    if rnd.random() < 0.15:
+                        store = self._reload(path, store)
+                        self.assertEqual(store.entries(), model, f"seed {seed}, step {step}")
+                store = self._reload(path, store)
+                self.assertEqual(store.entries(), model, f"seed {seed}")
+                store._journal._close_file()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""TVer 목록 API(src/tver_api.py)를 흉내 내는 로컬 서버. 인터넷·VPN 없이 시험할 때 쓴다.
+
+    python tools/tver_fixture_server.py --port 8765 --episodes 70
+    set TVER_API_BASE=http://127.0.0.1:8765        (PowerShell: $env:TVER_API_BASE=...)
+    python TVerDownloader.py
+
+어떤 시리즈 주소를 넣어도 그 ID로 시즌 두 개에 회차를 나눠 담아 돌려준다. 회차
+ID는 `{시리즈}e{번호}`라 실제 TVer 주소가 아니므로, 목록·즐겨찾기 확인까지만 시험할
+수 있고 받기는 실패한다.
+
+`--fail`을 주면 모든 요청에 500을 돌려준다. yt-dlp로 넘어가는 길을 볼 때 쓴다.
+`--expire-after N`은 세션을 N번 쓴 뒤 401을 돌려 세션을 다시 만드는 길을 본다.
+
+요청마다 한 줄을 찍는다. 맨 앞의 `conn=`이 같으면 같은 연결을 다시 쓴 것이다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEASONS_RE = re.compile(r"^/api/v1/callSeriesSeasons/([0-9a-z]+)$")
+EPISODES_RE = re.compile(r"^/service/api/v1/callSeasonEpisodes/([0-9a-z]+)s(\d)$")
+CREATE_PATH = "/v2/api/platform_users/browser/create"
+
+
+class FixtureState:
+    def __init__(self, episodes: int, fail: bool, expire_after: int):
+        self.episodes = episodes
+        self.fail = fail
+        self.expire_after = expire_after
+        self.tokens = {}
+
+
+def make_handler(state: FixtureState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            print(f"conn={id(self.connection) & 0xffff:04x} {fmt % args}", flush=True)
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if state.fail:
+                return self._send(500, {"error": "fixture failure"})
+            if urlsplit(self.path).path != CREATE_PATH:
+                return self._send(404, {})
+            uid, token = uuid.uuid4().hex, uuid.uuid4().hex
+            state.tokens[token] = 0
+            self._send(200, {"result": {"platform_uid": uid, "platform_token": token}})
+
+        def do_GET(self):
+            if state.fail:
+                return self._send(500, {"error": "fixture failure"})
+            parts = urlsplit(self.path)
+            match = SEASONS_RE.match(parts.path)
+            if match:
+                sid = match.group(1)
+                return self._send(200, {"result": {"contents": [
+                    {"type": "season", "content": {"id": f"{sid}s{n}", "title": f"シーズン{n}"}}
+                    for n in (1, 2)]}})
+            match = EPISODES_RE.match(parts.path)
+            if match:
+                token = (parse_qs(parts.query).get("platform_token") or [""])[0]
+                if token not in state.tokens:
+                    return self._send(401, {})
+                state.tokens[token] += 1
+                if state.expire_after and state.tokens[token] > state.expire_after:
+                    del state.tokens[token]
+                    return self._send(401, {})
+                sid, season = match.group(1), int(match.group(2))
+                half = state.episodes // 2
+                numbers = range(1, half + 1) if season == 1 else range(half + 1, state.episodes + 1)
+                return self._send(200, {"result": {"contents": [
+                    {"type": "episode", "content": {"id": f"{sid}e{n}", "title": f"#{n}",
+                                                    "seriesTitle": f"フィクスチャ {sid}"}}
+                    for n in numbers]}})
+            self._send(404, {})
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--episodes", type=int, default=70)
+    parser.add_argument("--fail", action="store_true")
+    parser.add_argument("--expire-after", type=int, default=0)
+    args = parser.parse_args()
+    state = FixtureState(args.episodes, args.fail, args.expire_after)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"TVER_API_BASE=http://127.0.0.1:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()